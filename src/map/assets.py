@@ -0,0 +1,234 @@
+from hashlib import sha256
+from pathlib import Path
+from typing import List, Sequence, Tuple
+from map.cache import AssetCache
+from map.sql import sql_table
+from map.types import Asset, AssetData, AssetInfo, AssetNotFoundException
+
+
+class AssetsMixin:  # MARK: AssetsMixin
+    """Assets of a map, such as element backgrounds.
+
+    Attributes:
+        asset_cache (AssetCache): Shared cache of asset bytes,
+            used to load element backgrounds on demand.
+        _owns_asset_cache (bool): If the cache belongs to this map and is cleared when closed.
+    """
+    asset_cache: AssetCache
+    _owns_asset_cache: bool
+
+    # Use a shared asset cache, or one of its own
+    def _init_assets(self, asset_cache: AssetCache | None):
+        """Set up the asset cache when the map is constructed.
+
+        Args:
+            asset_cache (AssetCache | None): Cache shared with another map of the same file,
+                or None for a cache of its own.
+        """
+        self.asset_cache = asset_cache if asset_cache is not None else AssetCache()
+        self._owns_asset_cache = asset_cache is None
+
+    # Create a new asset
+    def create_asset(self, name: str, value: AssetData) -> Asset:
+        """Create a new asset in the map database.
+        When an asset with identical bytes already exists, it is returned instead.
+
+        Args:
+            name (str): Name of the new asset.
+            value (AssetData): The raw bytes of the asset, or the file to read them from.
+
+        Returns:
+            Asset: The created, or the already existing, asset.
+        """
+        value = self._asset_buffer(value)
+        value_hash = sha256(value).hexdigest()
+        existing_raw, _ = self._query(
+            query=sql_table["get_asset_by_hash"], parameters=(value_hash,), limit=1)
+        if existing_raw:
+            [[asset_id, existing_name]] = existing_raw
+            return Asset(asset_id, existing_name, loader=self.get_asset_data, asset_hash=value_hash)
+
+        # Only new bytes are copied, once, to be cached
+        value = bytes(value)
+        _, asset_id = self._execute(
+            query=sql_table["create_asset"], parameters=(name, value, value_hash))
+        self.asset_cache.put(asset_id, value)
+        return Asset(asset_id, name, value, asset_hash=value_hash)
+
+    # Get the bytes of asset data in a form that can be hashed and stored
+    @staticmethod
+    def _asset_buffer(value: AssetData) -> bytes | bytearray | memoryview:
+        """Get asset data as a buffer, without copying bytes that are already in one.
+
+        Args:
+            value (AssetData): The raw bytes of the asset, or the file to read them from.
+
+        Returns:
+            bytes | bytearray | memoryview: The raw bytes.
+        """
+        if isinstance(value, Path):
+            return value.read_bytes()
+        if isinstance(value, list):
+            return bytes(value)
+        return value
+
+    # Get the bytes of an asset, used to load assets on demand
+    def get_asset_data(self, asset_id: int) -> bytes:
+        """Get the raw bytes of an asset, from the asset cache when possible.
+
+        Args:
+            asset_id (int): The id of the asset.
+
+        Raises:
+            AssetNotFoundException: The asset was not found.
+
+        Returns:
+            bytes: The raw bytes of the asset.
+        """
+        with self._lock:
+            data = self.asset_cache.get(asset_id)
+            if data is not None:
+                return data
+
+            data_raw, _ = self._query(
+                query=sql_table["get_asset_data"], parameters=(asset_id,), limit=1)
+            if not data_raw:
+                raise AssetNotFoundException(asset_id)
+            [[data]] = data_raw
+            self.asset_cache.put(asset_id, data)
+            return data
+
+    # Check if asset exists
+    def asset_exists(self, asset_id: int) -> bool:
+        """Check that an asset exists by id.
+
+        Args:
+            asset_id (int): The id of the asset to check.
+
+        Returns:
+            bool: True when the asset exists.
+        """
+        [[result]], _ = self._query(
+            query=sql_table["asset_exists"], parameters=(asset_id,))
+        return result == 1
+
+    def get_assets(self) -> List[Asset]:
+        """Get an assets stored in the map.
+
+        Returns:
+            List[Asset]: The assets.
+        """
+
+        assets, _ = self._query(
+            query=sql_table["get_assets"])
+        return list(Asset(asset_id, name, value, asset_hash=value_hash)
+                    for asset_id, name, value, value_hash in assets)
+
+    # List assets without their data
+    def list_assets(self) -> List[AssetInfo]:
+        """Get the metadata of the assets stored in the map, without loading their raw bytes.
+        Use get_asset_data to load the bytes of a specific asset.
+
+        Returns:
+            List[AssetInfo]: The metadata of the assets, ordered by id.
+        """
+        assets, _ = self._query(
+            query=sql_table["list_assets"])
+        return list(AssetInfo(asset_id, name, size, asset_hash=value_hash)
+                    for asset_id, name, size, value_hash in assets)
+
+    # Count the references to an asset
+    def asset_references(self, asset_id: int) -> int:
+        """Count how many elements use an asset.
+
+        Args:
+            asset_id (int): The id of the asset.
+
+        Returns:
+            int: Number of elements using the asset.
+        """
+        [[result]], _ = self._query(
+            query=sql_table["asset_references"], parameters=(asset_id,))
+        return result
+
+    # Remove an asset
+    def remove_asset(self, asset_id: int) -> bool:
+        """Remove an asset from the map database, if no element uses it anymore.
+
+        Args:
+            asset_id (int): The id of the asset to remove.
+
+        Raises:
+            AssetNotFoundException: The asset was not found.
+
+        Returns:
+            bool: True when the asset was removed, False when it is still in use.
+        """
+        if not self.asset_exists(asset_id):
+            raise AssetNotFoundException(asset_id)
+        return self._release_asset(asset_id)
+
+    # Remove an asset when it is not used anymore
+    def _release_asset(self, asset_id: int) -> bool:
+        """Remove an asset if no element references it.
+
+        Args:
+            asset_id (int): The id of the asset.
+
+        Returns:
+            bool: True when the asset was removed.
+        """
+        with self._lock:
+            if not self._connection:
+                raise ValueError("Map not open!")
+            cursor = self._connection.execute(
+                sql_table["release_asset"], (asset_id,))
+            if not self._transaction_depth:
+                self._connection.commit()
+            self.asset_cache.evict(asset_id)
+            return cursor.rowcount > 0
+
+    # Remove many assets when they are not used anymore
+    def _release_assets(self, asset_ids: Sequence[int]):
+        """Remove the assets no element references.
+
+        Args:
+            asset_ids (Sequence[int]): The ids of the assets.
+        """
+        self._execute_many(query=sql_table["release_asset"],
+                           parameters=[(asset_id,) for asset_id in asset_ids])
+        for asset_id in asset_ids:
+            self.asset_cache.evict(asset_id)
+
+    # Create many assets at once, used by the bulk element methods
+    def _create_assets(self, assets: Sequence[Tuple[str, AssetData]]) -> List[int]:
+        """Create many assets with a single statement. Must be called inside a transaction.
+
+        Args:
+            assets (Sequence[Tuple[str, AssetData]]): The name and raw bytes, or file,
+                of each new asset.
+
+        Returns:
+            List[int]: The ids of the created assets, in the same order.
+        """
+        if not assets:
+            return []
+
+        # Identical bytes are stored only once
+        assets = [(name, self._asset_buffer(value)) for name, value in assets]
+        hashes = [sha256(value).hexdigest() for _, value in assets]
+        asset_ids_by_hash = dict(self._query_in(
+            query=sql_table["get_assets_by_hash_in"], ids=list(set(hashes))))
+        new_assets = []
+        for (name, value), value_hash in zip(assets, hashes):
+            if value_hash not in asset_ids_by_hash:
+                asset_ids_by_hash[value_hash] = None
+                new_assets.append((name, value, value_hash))
+
+        # New rows get ids after the largest one, as long as we are inside a transaction
+        [[last_asset_id]], _ = self._query(
+            query=sql_table["get_last_asset_id"], limit=1)
+        self._execute_many(query=sql_table["create_asset"], parameters=new_assets)
+        for asset_id, (_, _, value_hash) in enumerate(new_assets, start=last_asset_id + 1):
+            asset_ids_by_hash[value_hash] = asset_id
+        return [asset_ids_by_hash[value_hash] for value_hash in hashes]
@@ -0,0 +1,88 @@
+from typing import Dict, Iterable, List, Tuple
+from map.sql import sql_table
+from map.types import MapBounds, MapChange, Rect
+
+
+# Fields that can move an object out of the known bounds
+BOUNDS_FIELDS = {"x", "y", "width", "height"}
+
+
+class BoundsMixin:  # MARK: BoundsMixin
+    """Bounding box of the objects of a map, kept up to date by the writes.
+
+    Attributes:
+        _bounds (MapBounds | None): Bounding box of the objects, kept up to date by the writes.
+            None when unknown.
+        _previous_rects (Dict[Tuple[str, int], Rect | None]): Areas of objects being moved
+            or removed, from before the write. None when the object was not loaded.
+    """
+    _bounds: MapBounds | None
+    _previous_rects: Dict[Tuple[str, int], Rect | None]
+
+    # Forget the bounds, they are queried again when needed
+    def _reset_bounds(self):
+        """Make the bounds unknown, called when the loaded objects are dropped.
+        """
+        self._bounds = None
+        self._previous_rects = {}
+
+    # Remember where objects were before moving or removing them
+    def _note_previous_rects(self, object_type: str, object_ids: Iterable[int]):
+        """Remember the areas of objects about to be moved or removed,
+        so the bounds can be kept up to date.
+
+        Args:
+            object_type (str): The type of the objects, "element" or "text".
+            object_ids (Iterable[int]): The ids of the objects.
+        """
+        if self._bounds is None:
+            return
+        for object_id in object_ids:
+            map_object = self._objects[object_type].get(object_id)
+            self._previous_rects[(object_type, object_id)] = (
+                MapBounds.rect_of(map_object) if map_object else None)
+
+    # Keep the bounding box up to date
+    def _track_bounds(self, changes: List[MapChange]):
+        """Update the known bounds with changes. Created and moved objects grow the bounds.
+        The bounds are unknown until queried again only when an object leaves an edge of them.
+
+        Args:
+            changes (List[MapChange]): The changes made.
+        """
+        for change in changes:
+            if change.kind == "updated" and not BOUNDS_FIELDS.intersection(change.fields):
+                continue
+            previous = None
+            if change.kind != "created":
+                previous = self._previous_rects.pop((change.object_type, change.object_id), None)
+            if self._bounds is None:
+                continue
+            map_object = self._objects[change.object_type].get(change.object_id)
+            current = MapBounds.rect_of(map_object) if map_object is not None else None
+            # Only shrinking needs a scan of the index
+            if change.kind != "created" and (previous is None or self._bounds.would_shrink(
+                    change.object_type, previous, current)):
+                self._bounds = None
+            elif map_object is not None:
+                self._bounds.include(map_object)
+
+    # Get the bounding box of the map
+    def bounds(self) -> MapBounds:
+        """Get the bounding box of the objects on the map, without loading the objects.
+
+        Returns:
+            MapBounds: The bounds of the elements and the text objects.
+        """
+        with self._lock:
+            if self._bounds is None:
+                [element_rect], _ = self._query(
+                    query=sql_table["get_element_bounds"], limit=1)
+                [text_rect], _ = self._query(
+                    query=sql_table["get_text_bounds"], limit=1)
+                self._bounds = MapBounds(
+                    tuple(int(value) for value in element_rect)
+                    if element_rect[0] is not None else None,
+                    tuple(text_rect) if text_rect[0] is not None else None)
+            # A copy, the known bounds are grown in place
+            return MapBounds(self._bounds.element_rect, self._bounds.text_rect)
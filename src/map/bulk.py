@@ -0,0 +1,282 @@
+from typing import Dict, List, Sequence
+from map.elements import ELEMENT_EDIT_FIELDS
+from map.sql import sql_table
+from map.texts import TEXT_EDIT_FIELDS
+from map.types import (
+    Element,
+    ElementEditable,
+    ElementNotFoundException,
+    MapChange,
+    MapText,
+    TextEditable,
+    TextNotFoundException
+)
+
+
+class BulkMixin:  # MARK: BulkMixin
+    """Writing many elements or text objects of a map in a single transaction.
+    """
+
+    # Create many elements on the map
+    def create_elements(self, element_editables: Sequence[ElementEditable]) -> List[Element]:
+        """Create many new elements on the map in a single transaction.
+
+        Args:
+            element_editables (Sequence[ElementEditable]): Details of the new elements' forms.
+
+        Returns:
+            List[Element]: The created elements, in the same order.
+        """
+        if not element_editables:
+            return []
+
+        with self.transaction():
+            self._resolve_collisions([(element_editable["x"], element_editable["y"])
+                                      for element_editable in element_editables])
+
+            # Create the background images first to get their ids
+            with_background = [element_editable for element_editable in element_editables
+                               if element_editable.get("background_image")]
+            asset_ids = iter(self._create_assets([
+                (element_editable["background_image"]["name"],
+                 element_editable["background_image"]["data"])
+                for element_editable in with_background
+            ]))
+
+            [[last_element_id]], _ = self._query(
+                query=sql_table["get_last_element_id"], limit=1)
+            self._execute_many(query=sql_table["create_element"], parameters=[
+                (element_editable["name"],
+                 element_editable["x"],
+                 element_editable["y"],
+                 element_editable["width"],
+                 element_editable["height"],
+                 next(asset_ids) if element_editable.get(
+                     "background_image") else None,
+                 element_editable["rotation"],
+                 element_editable["background_color"])
+                for element_editable in element_editables
+            ])
+
+            # Everything after the previous last id was just created
+            elements_raw, _ = self._query(query=sql_table["get_elements_after"],
+                                          parameters=(last_element_id,))
+            created_elements = [self._load_element(result) for result in elements_raw]
+            self._did_change([MapChange("created", "element", element.id)
+                              for element in created_elements])
+        return created_elements
+
+    # Edit many elements on the map
+    def edit_elements(self, element_editables: Sequence[ElementEditable]) -> List[Element]:
+        """Edit many elements on the map in a single transaction.
+        The elements are identified by their "id".
+
+        Args:
+            element_editables (Sequence[ElementEditable]): The new details of the elements' forms.
+
+        Raises:
+            ElementNotFoundException: One of the elements to edit was not found.
+
+        Returns:
+            List[Element]: The edited elements, in the same order.
+        """
+        if not element_editables:
+            return []
+
+        element_ids = [element_editable["id"]
+                       for element_editable in element_editables]
+        with self.transaction():
+            current_backgrounds = self._check_elements_exist(element_ids)
+            self._resolve_collisions([(element_editable["x"], element_editable["y"])
+                                      for element_editable in element_editables],
+                                     moving_ids=set(element_ids))
+
+            # Backgrounds without an id replace the current ones
+            replaced = [element_editable for element_editable in element_editables
+                        if not element_editable["background_image"] or
+                        "id" not in element_editable["background_image"]]
+            asset_ids = self._create_assets([
+                (element_editable["background_image"]["name"],
+                 element_editable["background_image"]["data"])
+                for element_editable in replaced if element_editable["background_image"]
+            ])
+
+            self._note_previous_rects("element", element_ids)
+            self._execute_many(query=sql_table["edit_element"],
+                               parameters=self._element_edit_parameters(element_editables,
+                                                                        asset_ids))
+            self._release_assets([current_backgrounds[element_editable["id"]]
+                                  for element_editable in replaced
+                                  if current_backgrounds[element_editable["id"]] is not None])
+
+            elements = {result[0]: self._load_element(result) for result in self._query_in(
+                query=sql_table["get_elements_in"], ids=element_ids)}
+            self._did_change([MapChange("updated", "element", element_id, ELEMENT_EDIT_FIELDS)
+                              for element_id in element_ids])
+        return [elements[element_id] for element_id in element_ids]
+
+    # Remove many elements
+    def remove_elements(self, element_ids: Sequence[int]):
+        """Remove many elements from the map in a single transaction.
+
+        Args:
+            element_ids (Sequence[int]): The ids of the elements to be removed.
+
+        Raises:
+            ElementNotFoundException: One of the elements was not found.
+        """
+        if not element_ids:
+            return
+        with self.transaction():
+            existing = self._check_elements_exist(element_ids)
+            self._note_previous_rects("element", element_ids)
+            self._execute_many(query=sql_table["remove_element"],
+                               parameters=[(element_id,) for element_id in element_ids])
+            self._release_assets([background_image for background_image in existing.values()
+                                  if background_image is not None])
+            self._forget("element", element_ids)
+            self._did_change([MapChange("removed", "element", element_id)
+                              for element_id in element_ids])
+
+    # Build the rows of an edit of many elements
+    def _element_edit_parameters(self, element_editables: Sequence[ElementEditable],
+                                 asset_ids: List[int]) -> List[tuple]:
+        """Get the parameters of the edit_element query for each edited element.
+
+        Args:
+            element_editables (Sequence[ElementEditable]): The new details of the elements' forms.
+            asset_ids (List[int]): The ids of the created assets, in the order of the elements
+                with a new background image.
+
+        Returns:
+            List[tuple]: The parameters of each element, in the same order.
+        """
+        new_asset_ids = iter(asset_ids)
+        parameters = []
+        for element_editable in element_editables:
+            background_image = element_editable["background_image"]
+            background_value = None
+            if background_image and "id" in background_image:
+                background_value = background_image["id"]
+            elif background_image:
+                background_value = next(new_asset_ids)
+            parameters.append(self._element_edit_row(element_editable, background_value,
+                                                     element_editable["id"]))
+        return parameters
+
+    # Make sure a list of elements exist
+    def _check_elements_exist(self, element_ids: Sequence[int]) -> Dict[int, int | None]:
+        """Check that all the given elements exist. Call inside the transaction that uses them,
+        so they cannot be removed in between.
+
+        Args:
+            element_ids (Sequence[int]): The ids of the elements.
+
+        Raises:
+            ElementNotFoundException: One of the elements was not found.
+
+        Returns:
+            Dict[int, int | None]: The id of the background image of each element, by element id.
+        """
+        backgrounds = dict(self._query_in(
+            query=sql_table["get_element_backgrounds_in"], ids=element_ids))
+        for element_id in element_ids:
+            if element_id not in backgrounds:
+                raise ElementNotFoundException(element_id)
+        return backgrounds
+
+    # Create many text objects
+    def create_texts(self, text_editables: Sequence[TextEditable]) -> List[MapText]:
+        """Create many text objects on the map in a single transaction.
+
+        Args:
+            text_editables (Sequence[TextEditable]): Details of the new text objects' forms.
+
+        Returns:
+            List[MapText]: The created text objects, in the same order.
+        """
+        if not text_editables:
+            return []
+
+        with self.transaction():
+            [[last_text_id]], _ = self._query(
+                query=sql_table["get_last_text_id"], limit=1)
+            self._execute_many(query=sql_table["create_text_full"], parameters=[
+                self._text_row(text_editable) for text_editable in text_editables])
+
+            # Everything after the previous last id was just created
+            texts_raw, _ = self._query(query=sql_table["get_text_after"],
+                                       parameters=(last_text_id,))
+            created_texts = [self._load_text(result) for result in texts_raw]
+            self._did_change([MapChange("created", "text", text.id)
+                              for text in created_texts])
+        return created_texts
+
+    # Edit many text objects
+    def edit_texts(self, text_editables: Sequence[TextEditable]) -> List[MapText]:
+        """Edit many text objects on the map in a single transaction.
+        The text objects are identified by their "id".
+
+        Args:
+            text_editables (Sequence[TextEditable]): The new details of the text objects' forms.
+
+        Raises:
+            TextNotFoundException: One of the text objects was not found.
+
+        Returns:
+            List[MapText]: The edited text objects, in the same order.
+        """
+        if not text_editables:
+            return []
+
+        text_ids = [text_editable["id"] for text_editable in text_editables]
+        with self.transaction():
+            self._check_texts_exist(text_ids)
+            self._note_previous_rects("text", text_ids)
+            self._execute_many(query=sql_table["edit_text"], parameters=[
+                (*self._text_row(text_editable), text_editable["id"])
+                for text_editable in text_editables])
+
+            texts = {result[0]: self._load_text(result) for result in self._query_in(
+                query=sql_table["get_text_in"], ids=text_ids)}
+            self._did_change([MapChange("updated", "text", text_id, TEXT_EDIT_FIELDS)
+                              for text_id in text_ids])
+        return [texts[text_id] for text_id in text_ids]
+
+    # Remove many text objects
+    def remove_texts(self, text_ids: Sequence[int]):
+        """Remove many text objects from the map in a single transaction.
+
+        Args:
+            text_ids (Sequence[int]): The ids of the text objects to be removed.
+
+        Raises:
+            TextNotFoundException: One of the text objects was not found.
+        """
+        if not text_ids:
+            return
+        with self.transaction():
+            self._check_texts_exist(text_ids)
+            self._note_previous_rects("text", text_ids)
+            self._execute_many(query=sql_table["remove_text"],
+                               parameters=[(text_id,) for text_id in text_ids])
+            self._forget("text", text_ids)
+            self._did_change([MapChange("removed", "text", text_id)
+                              for text_id in text_ids])
+
+    # Make sure a list of text objects exist
+    def _check_texts_exist(self, text_ids: Sequence[int]):
+        """Check that all the given text objects exist. Call inside the transaction that uses them,
+        so they cannot be removed in between.
+
+        Args:
+            text_ids (Sequence[int]): The ids of the text objects.
+
+        Raises:
+            TextNotFoundException: One of the text objects was not found.
+        """
+        existing = {result[0] for result in self._query_in(
+            query=sql_table["get_text_ids_in"], ids=text_ids)}
+        for text_id in text_ids:
+            if text_id not in existing:
+                raise TextNotFoundException(text_id)
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+DEFAULT_ASSET_CACHE_SIZE = 64 * 1024 * 1024  # 64 MiB
+
+
+class AssetCache:  # MARK: AssetCache
+    """Size-bounded least recently used cache of asset bytes by asset id.
+    Can be shared by maps used on different threads.
+
+    Attributes:
+        max_bytes (int): The maximum total size of the cached bytes.
+        size (int): The current total size of the cached bytes.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups not found in the cache.
+        _entries (OrderedDict[int, bytes]): The cached bytes, least recently used first.
+        _lock (Lock): Held while the entries are read or changed.
+    """
+    max_bytes: int
+    size: int
+    hits: int
+    misses: int
+    _entries: OrderedDict
+    _lock: Lock
+
+    def __init__(self, max_bytes: int = DEFAULT_ASSET_CACHE_SIZE):
+        """Constructor of the asset cache.
+
+        Args:
+            max_bytes (int, optional): The maximum total size of the cached bytes.
+                Defaults to 64 MiB.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, asset_id: int) -> bytes | None:
+        """Get the bytes of an asset from the cache.
+
+        Args:
+            asset_id (int): The id of the asset.
+
+        Returns:
+            bytes | None: The bytes or None when not cached.
+        """
+        with self._lock:
+            data = self._entries.get(asset_id)
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(asset_id)
+            return data
+
+    def put(self, asset_id: int, data: bytes):
+        """Add the bytes of an asset to the cache, evicting the least recently used ones when full.
+        Assets larger than the whole cache are not cached.
+
+        Args:
+            asset_id (int): The id of the asset.
+            data (bytes): The bytes of the asset.
+        """
+        with self._lock:
+            self._remove(asset_id)
+            if len(data) > self.max_bytes:
+                return
+            self._entries[asset_id] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def evict(self, asset_id: int):
+        """Remove an asset from the cache, if cached.
+
+        Args:
+            asset_id (int): The id of the asset.
+        """
+        with self._lock:
+            self._remove(asset_id)
+
+    def clear(self):
+        """Remove all the assets from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, asset_id: int):
+        # The lock must be held
+        data = self._entries.pop(asset_id, None)
+        if data is not None:
+            self.size -= len(data)
@@ -0,0 +1,379 @@
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple
+from map.bounds import BOUNDS_FIELDS
+from map.sql import sql_table
+from map.types import (
+    AssetEditable,
+    Element,
+    ElementEditable,
+    ElementNotFoundException,
+    CollisionPolicy,
+    ElementCollisionException,
+    MapChange
+)
+
+
+# Columns that can be changed with patch_element
+ELEMENT_PATCH_FIELDS = ("name", "x", "y", "width",
+                        "height", "rotation", "background_color")
+# Fields written by edit_element, reported in the map changes
+ELEMENT_EDIT_FIELDS = ELEMENT_PATCH_FIELDS + ("background_image",)
+
+
+class ElementsMixin:  # MARK: ElementsMixin
+    """Reading and writing single elements of a map.
+
+    Attributes:
+        collision_policy (CollisionPolicy): What happens when an element is placed on an occupied
+            cell. "stack" allows it, "reject" raises ElementCollisionException and "replace"
+            removes the occupants.
+    """
+    collision_policy: CollisionPolicy
+
+    # Get all the elements
+    def get_elements(self) -> List[Element]:
+        """Get all the elements on the map.
+
+        Returns:
+            List[Element]: List of elements on the map.
+        """
+        with self._lock:
+            if "element" not in self._fully_loaded:
+                elements_raw, _ = self._query(query=sql_table["get_elements"])
+                # Rebuild in database order, elements loaded earlier keep their instance
+                self._objects["element"] = {element.id: element for element in
+                                            [self._load_element(result) for result in elements_raw]}
+                self._fully_loaded.add("element")
+            return list(self._objects["element"].values())
+
+    # Get a single element
+    def get_element(self, element_id: int) -> Element | None:
+        """Get an element by id.
+
+        Args:
+            element_id (int): The id of the element.
+
+        Returns:
+            Element | None: The element or none, if not found.
+        """
+        with self._lock:
+            if element_id in self._objects["element"]:
+                return self._objects["element"][element_id]
+            element_raw, _ = self._query(
+                query=sql_table["get_element"], parameters=(element_id,))
+            return self._load_element(element_raw[0]) if element_raw else None
+
+    # Get the elements in an area
+    def get_elements_in_rect(self, x0: int, y0: int, x1: int, y1: int) -> List[Element]:
+        """Get the elements that cover at least one tile of an area, using the spatial index.
+
+        Args:
+            x0 (int): X coordinate of a corner of the area (1/256)
+            y0 (int): Y coordinate of a corner of the area (1/256)
+            x1 (int): X coordinate of the opposite corner of the area, inclusive (1/256)
+            y1 (int): Y coordinate of the opposite corner of the area, inclusive (1/256)
+
+        Returns:
+            List[Element]: List of elements in the area.
+        """
+        elements_raw, _ = self._query(query=sql_table["get_elements_in_rect"],
+                                      parameters=self._rect_parameters(x0, y0, x1, y1))
+        return [self._load_element(result) for result in elements_raw]
+
+    # Normalize an area for the spatial index queries
+    def _rect_parameters(self, x0: float, y0: float, x1: float, y1: float) -> dict:
+        """Get the parameters of an area for the spatial index queries.
+
+        Args:
+            x0 (float): X coordinate of a corner of the area.
+            y0 (float): Y coordinate of a corner of the area.
+            x1 (float): X coordinate of the opposite corner of the area.
+            y1 (float): Y coordinate of the opposite corner of the area.
+
+        Returns:
+            dict: The area with the smaller coordinates as x0 and y0.
+        """
+        return {"x0": min(x0, x1), "x1": max(x0, x1), "y0": min(y0, y1), "y1": max(y0, y1)}
+
+    # Create an element on the map
+    def create_element(self, element_editable: ElementEditable) -> Element:
+        """Create a new element on the map.
+
+        Args:
+            element_editable (ElementEditable): Details of the new element's form.
+
+        Returns:
+            Element: The created element.
+        """
+        with self.transaction():
+            self._resolve_collisions(
+                [(element_editable["x"], element_editable["y"])])
+
+            # If background is present, create asset
+            new_asset = None
+            if "background_image" in element_editable and element_editable["background_image"]:
+                new_asset = self.create_asset(element_editable["background_image"]["name"],
+                                              element_editable["background_image"]["data"])
+
+            _, element_id = self._execute(query=sql_table["create_element"],
+                                          parameters=(element_editable["name"],
+                                                      element_editable["x"],
+                                                      element_editable["y"],
+                                                      element_editable["width"],
+                                                      element_editable["height"],
+                                                      new_asset.id if new_asset else None,
+                                                      element_editable["rotation"],
+                                                      element_editable["background_color"]))
+            # Built from the written values, there is no need to read the row back
+            created_element = self._load_element((element_id,
+                                                  element_editable["name"],
+                                                  element_editable["x"],
+                                                  element_editable["y"],
+                                                  element_editable["width"],
+                                                  element_editable["height"],
+                                                  element_editable["rotation"],
+                                                  new_asset.id if new_asset else None,
+                                                  new_asset.name if new_asset else None,
+                                                  element_editable["background_color"],
+                                                  new_asset.hash if new_asset else None))
+            self._did_change((MapChange("created", "element", element_id),))
+        return created_element
+
+    # Get the topmost element on a cell
+    def element_at(self, x: int, y: int) -> Element | None:
+        """Get the element on a cell. When elements are stacked, the last created one is returned.
+
+        Args:
+            x (int): The X coordinate of the cell (1/256)
+            y (int): The Y coordinate of the cell (1/256)
+
+        Returns:
+            Element | None: The element or None, if the cell is empty.
+        """
+        element_raw, _ = self._query(
+            query=sql_table["get_element_at"], parameters=(x, y), limit=1)
+        return self._load_element(element_raw[0]) if element_raw else None
+
+    # Get the topmost elements on many cells
+    def elements_at(self, cells: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Element]:
+        """Get the elements on many cells at once.
+        When elements are stacked, the last created one is returned.
+
+        Args:
+            cells (Iterable[Tuple[int, int]]): The X and Y coordinates of the cells (1/256)
+
+        Returns:
+            Dict[Tuple[int, int], Element]: The elements by cell, empty cells are left out.
+        """
+        elements = {}
+        # Rows are ordered by id, so the last created element of a cell is kept
+        for result in self._query_in(query=sql_table["get_elements_at"],
+                                     ids=list(set(cells)), placeholder="(?, ?)"):
+            elements[(result[2], result[3])] = self._load_element(result)
+        return elements
+
+    # Apply the collision policy to cells elements are placed on
+    def _resolve_collisions(self, cells: Sequence[Tuple[int, int]],
+                            moving_ids: Set[int] = frozenset()):
+        """Apply the collision policy before elements are placed on cells.
+        Must be called inside a transaction.
+
+        Args:
+            cells (Sequence[Tuple[int, int]]): The cells elements are placed on.
+            moving_ids (Set[int], optional): Ids of elements being moved,
+                which do not collide with themselves.
+
+        Raises:
+            ElementCollisionException: A cell is occupied and the policy is "reject",
+                or the same cell is given many times with a policy other than "stack".
+        """
+        if self.collision_policy == "stack":
+            return
+
+        unique_cells = set()
+        for cell in cells:
+            if cell in unique_cells:
+                raise ElementCollisionException(*cell)
+            unique_cells.add(cell)
+
+        occupants = [occupant for occupant in self._query_in(query=sql_table["get_element_ids_at"],
+                                                             ids=list(unique_cells),
+                                                             placeholder="(?, ?)")
+                     if occupant[0] not in moving_ids]
+        if not occupants:
+            return
+        if self.collision_policy == "reject":
+            [_, x, y] = occupants[0]
+            raise ElementCollisionException(x, y)
+        self.remove_elements([occupant[0] for occupant in occupants])
+
+    # Check if a element with a given id exists
+    def element_exists(self, element_id: int) -> bool:
+        """Check if an element exists by id
+
+        Args:
+            element_id (int): The id to check
+
+        Returns:
+            bool: True when element exists.
+        """
+        with self._lock:
+            if element_id in self._objects["element"]:
+                return True
+            [[result]], _ = self._query(
+                query=sql_table["element_exists"], parameters=(element_id,))
+            return result == 1
+
+    # Edit an element on the map
+    def edit_element(self, element_id: int, element_editable: ElementEditable) -> Element:
+        """Edit an element on the map by id.
+
+        Args:
+            element_id (int): The id of the element to edit.
+            element_editable (ElementEditable): The new details of the elements form.
+
+        Raises:
+            ElementNotFoundException: The element to edit was not found.
+
+        Returns:
+            Element: The edited element
+        """
+        with self.transaction():
+            self._resolve_collisions(
+                [(element_editable["x"], element_editable["y"])], moving_ids={element_id})
+            background_value, current_background = self._edit_background(
+                element_id, element_editable["background_image"])
+
+            # Perform edit, the edited row is read back by the update itself
+            self._note_previous_rects("element", (element_id,))
+            element_raw = self._execute_returning(
+                query=sql_table["edit_element_returning"],
+                parameters=self._element_edit_row(element_editable, background_value, element_id))
+            if not element_raw:
+                raise ElementNotFoundException(element_id)
+
+            if current_background is not None:
+                self._release_asset(current_background)
+            edited_element = self._load_element(element_raw[0])
+            self._did_change(
+                (MapChange("updated", "element", element_id, ELEMENT_EDIT_FIELDS),))
+        return edited_element
+
+    # Get the parameters of the element edit queries
+    @staticmethod
+    def _element_edit_row(element_editable: ElementEditable, background_value: int | None,
+                          element_id: int) -> tuple:
+        """Get the parameters of the edit_element queries for an element.
+
+        Args:
+            element_editable (ElementEditable): The new details of the element's form.
+            background_value (int | None): The id of the background image asset.
+            element_id (int): The id of the element.
+
+        Returns:
+            tuple: The parameters, in the order of the query.
+        """
+        return (element_editable["name"],
+                element_editable["x"],
+                element_editable["y"],
+                element_editable["width"],
+                element_editable["height"],
+                element_editable["rotation"],
+                background_value,
+                element_editable["background_color"],
+                element_id)
+
+    # Get the background an edit writes, and the one it replaces
+    def _edit_background(self, element_id: int,
+                         background_image: AssetEditable | None) -> Tuple[int | None, int | None]:
+        """Resolve the background image of an element edit. Must be called inside a transaction.
+
+        Args:
+            element_id (int): The id of the element being edited.
+            background_image (AssetEditable | None): The background image of the edit,
+                an existing asset with an "id", a new one with "name" and "data",
+                or None to remove it.
+
+        Raises:
+            ElementNotFoundException: The element was not found.
+
+        Returns:
+            Tuple[int | None, int | None]: The id of the asset to write, and the id of the current
+                background when it is replaced or removed, so it can be released.
+        """
+        # Only a replaced or removed background needs the current one, so it can be removed
+        current_background = None
+        if background_image is None or "id" not in background_image:
+            current_raw, _ = self._query(
+                query=sql_table["get_element_background"], parameters=(element_id,))
+            if not current_raw:
+                raise ElementNotFoundException(element_id)
+            [[current_background]] = current_raw
+
+        # Create new asset if required
+        background_value = None
+        if background_image and "id" in background_image:
+            background_value = background_image["id"]
+        elif background_image:
+            background_value = self.create_asset(background_image["name"],
+                                                 background_image["data"]).id
+        return background_value, current_background
+
+    # Edit only some fields of an element
+    def patch_element(self, element_id: int, **fields: Any) -> Element:
+        """Edit only the given fields of an element on the map.
+        The background image cannot be patched.
+
+        Args:
+            element_id (int): The id of the element to edit.
+            **fields (Any): New values by field name, see ELEMENT_PATCH_FIELDS.
+
+        Raises:
+            ValueError: A field cannot be patched.
+            ElementNotFoundException: The element to edit was not found.
+
+        Returns:
+            Element: The edited element.
+        """
+        with self.transaction():
+            # Moves need both coordinates of the target cell for the collision policy
+            if self.collision_policy != "stack" and ("x" in fields or "y" in fields):
+                position_raw, _ = self._query(
+                    query=sql_table["get_element_position"], parameters=(element_id,))
+                if not position_raw:
+                    raise ElementNotFoundException(element_id)
+                [[x, y]] = position_raw
+                self._resolve_collisions([(fields.get("x", x), fields.get("y", y))],
+                                         moving_ids={element_id})
+
+            if BOUNDS_FIELDS.intersection(fields):
+                self._note_previous_rects("element", (element_id,))
+            element_raw = self._patch(
+                sql_table["patch_element"], ELEMENT_PATCH_FIELDS, element_id, fields)
+            if not element_raw:
+                raise ElementNotFoundException(element_id)
+            patched_element = self._load_element(element_raw[0])
+            self._did_change(
+                (MapChange("updated", "element", element_id, fields.keys()),))
+        return patched_element
+
+    # Remove an element
+    def remove_element(self, element_id: int):
+        """Remove an element from the map by id.
+
+        Args:
+            element_id (int): The id of the element to be removed.
+
+        Raises:
+            ElementNotFoundException: The element was not found.
+        """
+        with self.transaction():
+            self._note_previous_rects("element", (element_id,))
+            removed_raw = self._execute_returning(
+                query=sql_table["remove_element_returning"], parameters=(element_id,))
+            if not removed_raw:
+                raise ElementNotFoundException(element_id)
+            [[background_image]] = removed_raw
+            if background_image is not None:
+                self._release_asset(background_image)
+            self._forget("element", (element_id,))
+            self._did_change((MapChange("removed", "element", element_id),))
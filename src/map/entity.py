@@ -1,62 +1,87 @@
 from pathlib import Path
-from typing import List, Tuple, Any
-from types import FunctionType, MethodType
+from typing import Dict, Iterable, List, Sequence, Set, Tuple, Any
 from sqlite3 import Connection, connect, Cursor
+from threading import RLock
+from map.assets import AssetsMixin
+from map.bounds import BoundsMixin
+from map.bulk import BulkMixin
+from map.cache import AssetCache
+from map.elements import ElementsMixin
+from map.migrations import CURRENT_MAP_VERSION, OLDEST_MIGRATABLE_MAP_VERSION, MigrationsMixin
 from map.sql import sql_table
+from map.texts import TextsMixin
+from map.transactions import TransactionsMixin
 from map.types import (
     Element,
-    Asset,
-    ElementEditable,
-    ElementNotFoundException,
     MapMetadataMalformedException,
-    AssetNotFoundException,
     MapText,
-    TextEditable,
-    TextNotFoundException,
+    CollisionPolicy,
+    MapChange,
     MapOutdatedException
 )
 
 
-CURRENT_MAP_VERSION = 2
+SQL_VARIABLE_CHUNK = 500  # Max ids per "IN (...)" query, SQLite limits variables
 
 
-class Map:  # MARK: Map
+class Map(TransactionsMixin, BoundsMixin, ElementsMixin, TextsMixin, BulkMixin, AssetsMixin,
+          MigrationsMixin):  # MARK: Map
     """A single map and methods to control it.
+    The methods are grouped by topic into the mixins, which share the connection of the map.
 
     Attributes:
         name (str): The maps name.
         version (int): The map file version.
         map_file (Path): The Path instance of the map's location on disk.
         elements (List[Element]): List of elements on the map.
+        _objects (Dict[str, Dict[int, Element | MapText]]): Identity map of the loaded objects
+            by type and id.
+            Write methods update these objects in place, so an id always yields the same object.
+        _fully_loaded (Set[str]): Types of which every object of the map is in the identity map.
         _connection (Connection | None): SQLite3 connection of the map.
-        _on_change (MethodType | None): A method, when defined, called when the map is modified.
+        _lock (RLock): Held during transactions, statements and identity map reads,
+            so the map can be used from many threads. A MapWriter writes on a connection of its own.
     """
     name: str | None
     version: int | None
     map_file: Path
-    elements: List[Element]
+    _objects: Dict[str, Dict[int, Element | MapText]]
+    _fully_loaded: Set[str]
     _connection: Connection | None
-    _on_change: MethodType | None
+    _lock: RLock
 
-    def __init__(self, map_file: Path, connection: Connection | None = None):
+    def __init__(self, map_file: Path, connection: Connection | None = None,
+                 collision_policy: CollisionPolicy = "stack",
+                 asset_cache: AssetCache | None = None):
         """Constructor of the map class.
 
         Args:
             map_file (Path): The Path instance of the map on the disk.
             connection (Connection | None, optional): A connection to be re-used. Defaults to None.
+            collision_policy (CollisionPolicy, optional): Policy for occupied cells.
+                Defaults to "stack".
+            asset_cache (AssetCache | None, optional): Cache shared with another map of the same
+                file, not cleared when this map is closed. Defaults to None, a cache of its own.
         """
         self.map_file = map_file
         self.name = None
-        self.elements = []
+        self._clear_objects()
         self._connection = connection
-        self._on_change = None
+        self._lock = RLock()
+        self._init_transactions()
+        self._init_assets(asset_cache)
+        self.collision_policy = collision_policy
 
     def close(self):
         """Close the map when done with it.
         """
-        if self._connection:
-            self._connection.close()
-            self._connection = None
+        with self._lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+            if self._owns_asset_cache:
+                self.asset_cache.clear()
+            self._clear_objects()
 
     def delete(self):
         """Delete this map
@@ -64,13 +89,11 @@ class Map:  # MARK: Map
         self.close()
         self.map_file.unlink()
 
-    def register_on_change(self, listener: FunctionType):
-        """Register a method as the on_change method. Can be called many times.
-
-        Args:
-            listener (FunctionType): Method called when changes happen.
+    @property
+    def elements(self) -> List[Element]:
+        """List of elements on the map, served from memory after the first load.
         """
-        self._on_change = listener
+        return self.get_elements()
 
     # Utility for executing commands against the map
     def _execute(self, query: str, parameters: Tuple[Any] | dict) -> Tuple[Connection, Cursor]:
@@ -86,394 +109,294 @@ class Map:  # MARK: Map
         Returns:
             Tuple[Connection, Cursor]: Current map connection and the last inserted row id.
         """
-        if not self._connection:
-            raise ValueError("Map not open!")
-        cursor = self._connection.cursor()
-        cursor.execute(query, parameters)
-        self._connection.commit()
-        last_inserted_id = cursor.lastrowid
-        cursor.close()
-        return self._connection, last_inserted_id
-
-    # Utility for querying the map
-    def _query(self, query="", parameters: Tuple[Any] | dict = None, limit: int = -1) -> list[Any]:
-        """Issue a SQL query against the map database.
+        with self._lock:
+            if not self._connection:
+                raise ValueError("Map not open!")
+            cursor = self._connection.cursor()
+            cursor.execute(query, parameters)
+            # Inside a transaction the commit happens when the transaction exits
+            if not self._transaction_depth:
+                self._connection.commit()
+            last_inserted_id = cursor.lastrowid
+            cursor.close()
+            return self._connection, last_inserted_id
+
+    # Utility for executing commands that return rows against the map
+    def _execute_returning(self, query: str, parameters: Tuple[Any] | dict) -> list[Any]:
+        """Execute a SQL command with a RETURNING clause against the map database.
 
         Args:
-            query (_type_, optional): The query to execute.
-            parameters (Tuple[Any] | dict, optional): Parameters for the query. Defaults to None.
-            limit (int, optional): Number of rows to fetch. Defaults to -1.
+            query (str): The SQL to execute
+            parameters (Tuple[Any] | dict): Parameters for the SQL
 
         Raises:
-            ValueError: Map is not open.
+            ValueError: Map is not yet open.
 
         Returns:
-            list[Any]: List of rows in SQLite3 lib form.
-        """
-        if not self._connection:
-            raise ValueError("Map not open!")
-        cursor = self._connection.cursor()
-        cursor.execute(query, parameters if parameters else {})
-        results = cursor.fetchmany(limit)
-        last_inserted_id = cursor.lastrowid
-        cursor.close()
-        return results, last_inserted_id
-
-    # Call on_change listener
-    def _did_change(self):
-        """Called internally to trigger the on_change method, if defined.
-        """
-        if self._on_change:
-            self._on_change()
-
-    # Open the map file
-    def open(self):
-        """Open the map for reading and modifications.
-
-        Raises:
-            FileNotFoundError: The path of the map file is invalid
-            ValueError: The map is already open
-            MapMetadataMalformedException: The map's data is malformed and it cannot be opened
-            MapOutdatedException: The map is outdated, version too low or not present
+            list[Any]: The returned rows in SQLite3 lib form, empty when no rows were affected.
         """
-        # Make sure we can open the map
-        if not self.map_file or not self.map_file.exists():
-            raise FileNotFoundError(
-                "Map file missing or location uninitialized.")
-        if self._connection:
-            raise ValueError("Map already open.")
-
-        self._connection = connect(self.map_file)
-
-        # Check that meta contains required version
-        # Some old map files don't have it
-        [[column_count]], _ = self._query(
-            query=sql_table["get_meta_size"], limit=1)
-        if not column_count or column_count < 3:
-            raise MapOutdatedException(self.map_file.absolute())
-
-        # Read the name of the map
-        [meta], _ = self._query(query=sql_table["get_meta"], limit=1)
-        if not meta:
-            raise MapMetadataMalformedException(self.map_file.absolute())
-
-        # Detect outdated version
-        if meta[0] < CURRENT_MAP_VERSION:
-            raise MapOutdatedException(self.map_file.absolute())
-
-        self.name = meta[1]
-        self.version = meta[0]
-
-    # Set the map name
-    def set_name(self, name: str) -> str:
-        """Set the name of the map.
+        with self._lock:
+            if not self._connection:
+                raise ValueError("Map not open!")
+            cursor = self._connection.cursor()
+            cursor.execute(query, parameters)
+            # Rows must be read before the statement can be committed
+            results = cursor.fetchall()
+            if not self._transaction_depth:
+                self._connection.commit()
+            cursor.close()
+            return results
+
+    # Utility for updating only some columns of a row
+    def _patch(self, query: str, allowed_fields: Tuple[str], row_id: int,
+               fields: dict) -> list[Any]:
+        """Update the given columns of a single row.
 
         Args:
-            name (str): The new name.
+            query (str): The UPDATE ... RETURNING query, with "{}" in place of the assignments.
+            allowed_fields (Tuple[str]): The columns that may be updated.
+            row_id (int): The id of the row to update.
+            fields (dict): New values by column name.
 
-        Returns:
-            str: The name that was set.
-        """
-        self._execute(query=sql_table["set_name"], parameters=(name,))
-        self.name = name
-        return name
-
-    # MARK: Map elements
-    # Get all the elements
-    def get_elements(self) -> List[Element]:
-        """Get all the elements on the map.
+        Raises:
+            ValueError: A column is not allowed to be updated.
 
         Returns:
-            List[Element]: List of elements on the map.
+            list[Any]: The updated row in SQLite3 lib form, empty when the row does not exist.
         """
-        elements_raw, _ = self._query(query=sql_table["get_elements"])
-        return [Element(*result) for result in elements_raw]
-
-    # Get a single element
-    def get_element(self, element_id: int) -> Element | None:
-        """Get an element by id.
+        for field in fields:
+            if field not in allowed_fields:
+                raise ValueError(f"Field '{field}' cannot be patched.")
+        # Without changes the update still works as an existence check and read
+        assignments = ", ".join(f"{field} = :{field}" for field in fields) or "id = id"
+        return self._execute_returning(query=query.format(assignments),
+                                       parameters={**fields, "id": row_id})
+
+    # Utility for executing a command many times against the map
+    def _execute_many(self, query: str, parameters: Iterable[Tuple[Any] | dict]) -> Connection:
+        """Execute a SQL command against the map database once for every set of parameters.
 
         Args:
-            element_id (int): The id of the element.
-
-        Returns:
-            Element | None: The element or none, if not found.
-        """
-        element_raw, _ = self._query(
-            query=sql_table["get_element"], parameters=(element_id,))
-        return Element(*element_raw[0]) if element_raw else None
-
-    # Create an element on the map
-    def create_element(self, element_editable: ElementEditable) -> Element:
-        """Create a new element on the map.
+            query (str): The SQL to execute
+            parameters (Iterable[Tuple[Any] | dict]): Parameters for each execution of the SQL
 
-        Args:
-            element_editable (ElementEditable): Details of the new element's form.
+        Raises:
+            ValueError: Map is not yet open.
 
         Returns:
-            Element: The created element.
+            Connection: Current map connection.
         """
-        # If background is present, create asset
-        new_asset_id = None
-        if "background_image" in element_editable and element_editable["background_image"]:
-            new_asset = self.create_asset(element_editable["background_image"]["name"],
-                                          bytes(element_editable["background_image"]["data"]))
-            new_asset_id = new_asset.id
-
-        _, element_id = self._execute(query=sql_table["create_element"],
-                                      parameters=(element_editable["name"],
-                                                  element_editable["x"],
-                                                  element_editable["y"],
-                                                  element_editable["width"],
-                                                  element_editable["height"],
-                                                  new_asset_id,
-                                                  element_editable["rotation"],
-                                                  element_editable["background_color"]))
-        created_element = self.get_element(element_id)
-        self._did_change()
-        return created_element
-
-    # Check if a element with a given id exists
-    def element_exists(self, element_id: int) -> bool:
-        """Check if an element exists by id
+        with self._lock:
+            if not self._connection:
+                raise ValueError("Map not open!")
+            cursor = self._connection.cursor()
+            cursor.executemany(query, parameters)
+            if not self._transaction_depth:
+                self._connection.commit()
+            cursor.close()
+            return self._connection
+
+    # Utility for querying the map with a list of ids
+    def _query_in(self, query: str, ids: Sequence[Any], placeholder: str = "?") -> list[Any]:
+        """Issue a SQL query with an "IN ({})" placeholder for a list of ids.
+        The ids are split into chunks to stay below the SQLite variable limit.
 
         Args:
-            element_id (int): The id to check
+            query (str): The query to execute, with "{}" in place of the id placeholders.
+            ids (Sequence[Any]): The ids to query for.
+                Tuples when the placeholder has many variables.
+            placeholder (str, optional): The placeholder of a single id, such as "(?, ?)".
+                Defaults to "?".
 
         Returns:
-            bool: True when element exists.
+            list[Any]: List of rows in SQLite3 lib form.
         """
-        [[result]], _ = self._query(
-            query=sql_table["element_exists"], parameters=(element_id,))
-        return result == 1
+        results = []
+        variable_count = placeholder.count("?")
+        chunk_size = max(SQL_VARIABLE_CHUNK // variable_count, 1)
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            parameters = tuple(chunk) if variable_count == 1 else tuple(
+                value for values in chunk for value in values)
+            rows, _ = self._query(query=query.format(", ".join([placeholder] * len(chunk))),
+                                  parameters=parameters)
+            results.extend(rows)
+        return results
 
-    # Edit an element on the map
-    def edit_element(self, element_id: int, element_editable: ElementEditable) -> Element:
-        """Edit an element on the map by id.
+    # Utility for querying the map
+    def _query(self, query="", parameters: Tuple[Any] | dict = None, limit: int = -1) -> list[Any]:
+        """Issue a SQL query against the map database.
 
         Args:
-            element_id (int): The id of the element to edit.
-            element_editable (ElementEditable): The new details of the elements form.
+            query (_type_, optional): The query to execute.
+            parameters (Tuple[Any] | dict, optional): Parameters for the query. Defaults to None.
+            limit (int, optional): Number of rows to fetch. Defaults to -1.
 
         Raises:
-            ElementNotFoundException: The element to edit was not found.
+            ValueError: Map is not open.
 
         Returns:
-            Element: The edited element
-        """
-        # Make sure element exists, otherwise use of create_element is required
-        if not self.element_exists(element_id):
-            raise ElementNotFoundException(element_id)
-
-        # NOTE: This is not optimal
-        current_element = self.get_element(element_id)
-
-        # If no id is provided for the background image, remove current and create a new asset
-        if (element_editable["background_image"] is None or
-                "id" not in element_editable["background_image"]):
-            if current_element.background_image:
-                self.remove_asset(current_element.background_image.id)
-
-        # Create new asset if required
-        new_asset = None
-        if (element_editable["background_image"] and
-                "id" not in element_editable["background_image"]):
-            new_asset = self.create_asset(element_editable["background_image"]["name"], bytes(
-                element_editable["background_image"]["data"]))
-
-        # Perform edit
-        background_value = None
-        if new_asset:
-            background_value = new_asset.id
-        elif element_editable["background_image"] and "id" in element_editable["background_image"]:
-            background_value = element_editable["background_image"]["id"]
-
-        self._execute(query=sql_table["edit_element"],
-                      parameters=(element_editable["name"],
-                                  element_editable["x"],
-                                  element_editable["y"],
-                                  element_editable["width"],
-                                  element_editable["height"],
-                                  element_editable["rotation"],
-                                  background_value,
-                                  element_editable["background_color"],
-                                  element_id
-                                  ))
-        self._did_change()
-        # NOTE: Id can be changed, technically
-        return self.get_element(element_editable["id"])
-
-    # Remove an element
-    def remove_element(self, element_id: int):
-        """Remove an element from the map by id.
-
-        Args:
-            element_id (int): The id of the element to be removed.
-
-        Raises:
-            ElementNotFoundException: The element was not found.
+            list[Any]: List of rows in SQLite3 lib form.
         """
-        if not self.element_exists(element_id):
-            raise ElementNotFoundException(element_id)
-        self._execute(
-            query=sql_table["remove_element"], parameters=(element_id,))
-        self._did_change()
-
-    # Create a new asset
-    # MARK: Map assets
-    def create_asset(self, name: str, value: bytes) -> Asset:
-        """Create a new asset in the map database.
+        with self._lock:
+            if not self._connection:
+                raise ValueError("Map not open!")
+            cursor = self._connection.cursor()
+            cursor.execute(query, parameters if parameters else {})
+            results = cursor.fetchmany(limit)
+            last_inserted_id = cursor.lastrowid
+            cursor.close()
+            return results, last_inserted_id
+
+    # Identity map of the loaded objects
+    def _load_element(self, element_raw: Tuple[Any]) -> Element:
+        """Get the element of a database row from the identity map, updated in place with the row.
+        The element is added to the identity map when not loaded before.
 
         Args:
-            name (str): Name of the new asset.
-            value (bytes): The raw bytes of the asset.
+            element_raw (Tuple[Any]): The element in SQLite3 lib form.
 
         Returns:
-            Asset: The created asset.
+            Element: The element.
         """
-        _, asset_id = self._execute(
-            query=sql_table["create_asset"], parameters=(name, value))
-        return Asset(asset_id, name, value)
-
-    # Check if asset exists
-    def asset_exists(self, asset_id: int) -> bool:
-        """Check that an asset exists by id.
+        element = self._objects["element"].get(element_raw[0])
+        if element is None:
+            element = Element(*element_raw, asset_loader=self.get_asset_data)
+            self._objects["element"][element.id] = element
+        else:
+            element.update(*element_raw)
+        return element
+
+    def _load_text(self, text_raw: Tuple[Any]) -> MapText:
+        """Get the text object of a database row from the identity map,
+        updated in place with the row.
+        The text object is added to the identity map when not loaded before.
 
         Args:
-            asset_id (int): The id of the asset to check.
-
-        Returns:
-            bool: True when the asset exists.
-        """
-        [[result]], _ = self._query(
-            query=sql_table["asset_exists"], parameters=(asset_id,))
-        return result == 1
-
-    def get_assets(self) -> List[Asset]:
-        """Get an assets stored in the map.
+            text_raw (Tuple[Any]): The text object in SQLite3 lib form.
 
         Returns:
-            List[Asset]: The assets.
+            MapText: The text object.
         """
+        text = self._objects["text"].get(text_raw[0])
+        if text is None:
+            text = MapText(*text_raw)
+            self._objects["text"][text.id] = text
+        else:
+            text.update(*text_raw)
+        return text
 
-        assets, _ = self._query(
-            query=sql_table["get_assets"])
-        return list(Asset(*asset_raw) for asset_raw in assets)
-
-    # Remove an asset
-    def remove_asset(self, asset_id: int):
-        """Remove an asset from the map database.
+    def _forget(self, object_type: str, object_ids: Iterable[int]):
+        """Remove deleted objects from the identity map.
 
         Args:
-            asset_id (int): The id of the asset to remove.
-
-        Raises:
-            AssetNotFoundException: The asset was not found.
+            object_type (str): The type of the objects, "element" or "text".
+            object_ids (Iterable[int]): The ids of the objects.
         """
-        if not self.asset_exists(asset_id):
-            raise AssetNotFoundException(asset_id)
-        self._execute(query=sql_table["remove_asset"], parameters=(asset_id,))
+        for object_id in object_ids:
+            self._objects[object_type].pop(object_id, None)
 
-    # Create text object
-    # MARK: Map text
-    def create_text(self, name: str, text: str, x: int, y: int) -> MapText:
-        """Create a text object on the map
-
-        Args:
-            name (str): The name of the text object.
-            text (str): The text inside the text object.
-            x (int): X coordinate (true).
-            y (int): Y coordinate (true).
+    def unload_objects(self):
+        """Drop the loaded objects, they are read from the database again when used.
+        Objects already handed out are not updated anymore.
+        """
+        with self._lock:
+            self._clear_objects()
 
-        Returns:
-            MapText: The created text.
+    def _clear_objects(self):
+        """Empty the identity map, so the objects are loaded again from the database.
         """
-        _, text_id = self._execute(
-            query=sql_table["create_text"], parameters=(name, text, x, y))
-        self._did_change()
-        return MapText(text_id, name, text, "#000", 36, x, y, 0)
+        self._objects = {"element": {}, "text": {}}
+        self._fully_loaded = set()
+        self._reset_bounds()
 
-    # Get a single text object
-    def get_text(self, text_id: int) -> MapText | None:
-        """Get text object by id.
+    # Bring the loaded objects up to date with changes made through another connection
+    def apply_changes(self, changes: List[MapChange]):
+        """Update the loaded objects and the bounds with changes committed through another
+        connection to the same map file, such as that of a MapWriter. The loaded objects are read
+        again and updated in place, then the listeners of this map are called with the changes.
 
         Args:
-            text_id (int): The id of the text.
-
-        Returns:
-            MapText | None: The text object or None if not found.
+            changes (List[MapChange]): The committed changes, in order.
         """
-        text_raw, _ = self._query(
-            query=sql_table["get_text"], parameters=(text_id,))
-        return MapText(*text_raw[0]) if text_raw else None
+        with self._lock:
+            # Objects not loaded have nothing to update,
+            # created ones are loaded to keep the listing whole
+            reload_ids = {"element": {}, "text": {}}
+            for change in changes:
+                if change.kind != "created":
+                    self._note_previous_rects(change.object_type, (change.object_id,))
+                if change.kind == "removed":
+                    self._forget(change.object_type, (change.object_id,))
+                    reload_ids[change.object_type].pop(change.object_id, None)
+                elif (change.kind == "created"
+                      or change.object_id in self._objects[change.object_type]):
+                    reload_ids[change.object_type][change.object_id] = None
+
+            for object_type, query, load in (
+                    ("element", sql_table["get_elements_in"], self._load_element),
+                    ("text", sql_table["get_text_in"], self._load_text)):
+                ids = list(reload_ids[object_type])
+                found = {load(row).id for row in self._query_in(query=query, ids=ids)}
+                # Removed by a later commit, its change is still on the way
+                self._forget(object_type,
+                             [object_id for object_id in ids if object_id not in found])
+
+            self._did_change(changes)
 
-    # Get all text objects
-    def get_text_list(self):
-        """Get list of all text objects on the map.
+    # Open the map file
+    def open(self):
+        """Open the map for reading and modifications.
 
-        Returns:
-            List[MapText]: List of text objects.
+        Raises:
+            FileNotFoundError: The path of the map file is invalid
+            ValueError: The map is already open
+            MapMetadataMalformedException: The map's data is malformed and it cannot be opened
+            MapOutdatedException: The map is outdated, version too low or not present
         """
-        texts_raw, _ = self._query(query=sql_table["get_all_text"])
-        return [MapText(*result) for result in texts_raw]
+        # Make sure we can open the map
+        if not self.map_file or not self.map_file.exists():
+            raise FileNotFoundError(
+                "Map file missing or location uninitialized.")
+        if self._connection:
+            raise ValueError("Map already open.")
 
-    # Check if a certain text object exists
-    def text_exists(self, text_id: int) -> bool:
-        """Check that a text object exits on the map by id.
+        # The map may be used from other threads, the lock keeps the use serialized
+        self._connection = connect(self.map_file, check_same_thread=False)
 
-        Args:
-            text_id (int): The id of the text object.
+        # Check that meta contains required version
+        # Some old map files don't have it
+        [[column_count]], _ = self._query(
+            query=sql_table["get_meta_size"], limit=1)
+        if not column_count or column_count < 3:
+            raise MapOutdatedException(self.map_file.absolute())
 
-        Returns:
-            bool: True when the text object exists.
-        """
-        [[result]], _ = self._query(
-            query=sql_table["text_exists"], parameters=(text_id,))
-        return result == 1
+        # Read the name of the map
+        [meta], _ = self._query(query=sql_table["get_meta"], limit=1)
+        if not meta:
+            raise MapMetadataMalformedException(self.map_file.absolute())
 
-    # Edit text object
-    def edit_text(self, text_id: int, text_editable: TextEditable) -> MapText:
-        """Edit a text object on the map.
+        # Detect outdated version
+        if meta[0] < OLDEST_MIGRATABLE_MAP_VERSION:
+            raise MapOutdatedException(self.map_file.absolute())
 
-        Args:
-            text_id (int): The id of the text object to edit.
-            text_editable (TextEditable): The details of the text objects new form.
+        self.name = meta[1]
+        self.version = meta[0]
 
-        Raises:
-            TextNotFoundException: The text object was not found.
+        # Bring older, but supported, versions up to date
+        if self.version < CURRENT_MAP_VERSION:
+            self._migrate()
 
-        Returns:
-            MapText: The edited text object.
-        """
-        # Make sure text exists, if not, create must be used
-        if not self.text_exists(text_id):
-            raise TextNotFoundException(text_id)
-
-        # Perform edits
-        self._execute(query=sql_table["edit_text"],
-                      parameters=(text_editable["name"],
-                                  text_editable["value"],
-                                  text_editable["color"],
-                                  text_editable["font_size"],
-                                  text_editable["x"],
-                                  text_editable["y"],
-                                  text_editable["rotation"],
-                                  text_id))
-        self._did_change()
-        # NOTE: Id can be changed, technically
-        return self.get_element(text_editable["id"])
-
-    # Remove text
-    def remove_text(self, text_id: int):
-        """Remove a text object from the map.
+    # Set the map name
+    def set_name(self, name: str) -> str:
+        """Set the name of the map.
 
         Args:
-            text_id (int): The id of the text to be removed.
+            name (str): The new name.
 
-        Raises:
-            TextNotFoundException: The text object was not found.
+        Returns:
+            str: The name that was set.
         """
-        if not self.text_exists(text_id):
-            raise TextNotFoundException(text_id)
-        self._execute(query=sql_table["remove_text"], parameters=(text_id,))
-        self._did_change()
+        self._execute(query=sql_table["set_name"], parameters=(name,))
+        self.name = name
+        return name
@@ -0,0 +1,74 @@
+from hashlib import sha256
+from map.sql import sql_table
+
+
+CURRENT_MAP_VERSION = 5
+OLDEST_MIGRATABLE_MAP_VERSION = 2
+
+
+class MigrationsMixin:  # MARK: MigrationsMixin
+    """Migrations of older map files to the current map version.
+    """
+
+    # Migrate the map file to the current version
+    def _migrate(self):
+        """Migrate the open map to the current map version, one version at a time.
+        All the migrations are done in a single transaction.
+        """
+        migrations = {
+            2: self._migrate_to_v3,
+            3: self._migrate_to_v4,
+            4: self._migrate_to_v5
+        }
+        version = self.version
+        with self.transaction():
+            while version < CURRENT_MAP_VERSION:
+                migrations[version]()
+                version += 1
+                self._execute(query=sql_table["set_version"],
+                              parameters=(version,))
+        # Only a committed migration changes the version
+        self.version = version
+
+    def _migrate_to_v3(self):
+        """Version 3 stores identical assets only once, identified by a content hash.
+        """
+        self._execute(query=sql_table["migrate_v3_add_asset_hash"], parameters=())
+        asset_ids, _ = self._query(query=sql_table["migrate_v3_get_asset_ids"])
+        asset_ids_by_hash = {}
+        for [asset_id] in asset_ids:
+            [[value]], _ = self._query(query=sql_table["get_asset_data"],
+                                       parameters=(asset_id,), limit=1)
+            value_hash = sha256(value).hexdigest()
+            if value_hash in asset_ids_by_hash:
+                # Duplicate, point elements to the first copy
+                self._execute(query=sql_table["migrate_v3_move_references"],
+                              parameters=(asset_ids_by_hash[value_hash], asset_id))
+                self._execute(query=sql_table["remove_asset"],
+                              parameters=(asset_id,))
+            else:
+                asset_ids_by_hash[value_hash] = asset_id
+                self._execute(query=sql_table["migrate_v3_set_asset_hash"],
+                              parameters=(value_hash, asset_id))
+        self._execute(query=sql_table["migrate_v3_create_asset_hash_index"], parameters=())
+        self._execute(query=sql_table["migrate_v3_create_background_index"], parameters=())
+
+    def _migrate_to_v4(self):
+        """Version 4 adds R*Tree spatial indexes for elements and text.
+        """
+        for query in ("migrate_v4_create_elements_index",
+                      "migrate_v4_fill_elements_index",
+                      "migrate_v4_create_elements_insert_trigger",
+                      "migrate_v4_create_elements_update_trigger",
+                      "migrate_v4_create_elements_delete_trigger",
+                      "migrate_v4_create_text_index",
+                      "migrate_v4_fill_text_index",
+                      "migrate_v4_create_text_insert_trigger",
+                      "migrate_v4_create_text_update_trigger",
+                      "migrate_v4_create_text_delete_trigger"):
+            self._execute(query=sql_table[query], parameters=())
+
+    def _migrate_to_v5(self):
+        """Version 5 adds an index for the elements on a cell.
+        """
+        self._execute(query=sql_table["migrate_v5_create_cell_index"], parameters=())
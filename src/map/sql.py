@@ -6,6 +6,8 @@ sql_table = {
 
     "set_name": "UPDATE Meta SET name = ? WHERE id = 1",
 
+    "set_version": "UPDATE Meta SET version = ? WHERE id = 1",
+
     "get_elements": """
         SELECT
             Elements.id,
@@ -17,8 +19,8 @@ sql_table = {
             Elements.rotation,
             Elements.background_image AS background_image,
             Assets.name AS background_image_name,
-            Assets.value AS background_image_data,
-            Elements.background_color AS background_image_color
+            Elements.background_color AS background_image_color,
+            Assets.hash AS background_image_hash
         FROM Elements
         LEFT JOIN Assets ON Elements.background_image = Assets.id;
     """,
@@ -33,13 +35,128 @@ sql_table = {
             Elements.rotation,
             Elements.background_image AS background_image,
             Assets.name AS background_image_name,
-            Assets.value AS background_image_data,
-            Elements.background_color AS background_image_color
+            Elements.background_color AS background_image_color,
+            Assets.hash AS background_image_hash
         FROM Elements
         LEFT JOIN Assets ON Elements.background_image = Assets.id
         WHERE Elements.id = ?;
     """,
 
+    "get_elements_in": """
+        SELECT
+            Elements.id,
+            Elements.name,
+            Elements.x,
+            Elements.y,
+            Elements.width,
+            Elements.height,
+            Elements.rotation,
+            Elements.background_image AS background_image,
+            Assets.name AS background_image_name,
+            Elements.background_color AS background_image_color,
+            Assets.hash AS background_image_hash
+        FROM Elements
+        LEFT JOIN Assets ON Elements.background_image = Assets.id
+        WHERE Elements.id IN ({});
+    """,
+
+    "get_elements_after": """
+        SELECT
+            Elements.id,
+            Elements.name,
+            Elements.x,
+            Elements.y,
+            Elements.width,
+            Elements.height,
+            Elements.rotation,
+            Elements.background_image AS background_image,
+            Assets.name AS background_image_name,
+            Elements.background_color AS background_image_color,
+            Assets.hash AS background_image_hash
+        FROM Elements
+        LEFT JOIN Assets ON Elements.background_image = Assets.id
+        WHERE Elements.id > ?;
+    """,
+
+    "get_elements_in_rect": """
+        SELECT
+            Elements.id,
+            Elements.name,
+            Elements.x,
+            Elements.y,
+            Elements.width,
+            Elements.height,
+            Elements.rotation,
+            Elements.background_image AS background_image,
+            Assets.name AS background_image_name,
+            Elements.background_color AS background_image_color,
+            Assets.hash AS background_image_hash
+        FROM ElementsIndex
+        JOIN Elements ON Elements.id = ElementsIndex.id
+        LEFT JOIN Assets ON Elements.background_image = Assets.id
+        WHERE ElementsIndex.max_x >= :x0 AND ElementsIndex.min_x <= :x1
+            AND ElementsIndex.max_y >= :y0 AND ElementsIndex.min_y <= :y1;
+    """,
+
+    "get_element_at": """
+        SELECT
+            Elements.id,
+            Elements.name,
+            Elements.x,
+            Elements.y,
+            Elements.width,
+            Elements.height,
+            Elements.rotation,
+            Elements.background_image AS background_image,
+            Assets.name AS background_image_name,
+            Elements.background_color AS background_image_color,
+            Assets.hash AS background_image_hash
+        FROM Elements
+        LEFT JOIN Assets ON Elements.background_image = Assets.id
+        WHERE Elements.x = ? AND Elements.y = ?
+        ORDER BY Elements.id DESC
+        LIMIT 1;
+    """,
+
+    "get_elements_at": """
+        WITH Cells(x, y) AS (VALUES {})
+        SELECT
+            Elements.id,
+            Elements.name,
+            Elements.x,
+            Elements.y,
+            Elements.width,
+            Elements.height,
+            Elements.rotation,
+            Elements.background_image AS background_image,
+            Assets.name AS background_image_name,
+            Elements.background_color AS background_image_color,
+            Assets.hash AS background_image_hash
+        FROM Cells
+        CROSS JOIN Elements ON Elements.x = Cells.x AND Elements.y = Cells.y
+        LEFT JOIN Assets ON Elements.background_image = Assets.id
+        ORDER BY Elements.id;
+    """,
+
+    "get_element_ids_at": """
+        WITH Cells(x, y) AS (VALUES {})
+        SELECT Elements.id, Elements.x, Elements.y
+        FROM Cells
+        CROSS JOIN Elements ON Elements.x = Cells.x AND Elements.y = Cells.y
+    """,
+
+    "get_element_position": "SELECT x, y FROM Elements WHERE id = ?",
+
+    "get_element_bounds": """
+        SELECT MIN(min_x), MIN(min_y), MAX(max_x), MAX(max_y) FROM ElementsIndex
+    """,
+
+    "get_text_bounds": "SELECT MIN(min_x), MIN(min_y), MAX(max_x), MAX(max_y) FROM TextIndex",
+
+    "get_element_backgrounds_in": "SELECT id, background_image FROM Elements WHERE id IN ({})",
+
+    "get_last_element_id": "SELECT COALESCE(MAX(id), 0) FROM Elements",
+
     "create_element": """
         INSERT INTO Elements (
             name,
@@ -66,20 +183,115 @@ sql_table = {
         WHERE id = ?
     """,
 
+    "edit_element_returning": """
+        UPDATE Elements SET
+            name = ?,
+            x = ?,
+            y = ?,
+            width = ?,
+            height = ?,
+            rotation = ?,
+            background_image = ?,
+            background_color = ?
+        WHERE id = ?
+        RETURNING
+            id,
+            name,
+            x,
+            y,
+            width,
+            height,
+            rotation,
+            background_image,
+            (SELECT Assets.name FROM Assets WHERE Assets.id = Elements.background_image),
+            background_color,
+            (SELECT Assets.hash FROM Assets WHERE Assets.id = Elements.background_image)
+    """,
+
+    "patch_element": """
+        UPDATE Elements SET {}
+        WHERE id = :id
+        RETURNING
+            id,
+            name,
+            x,
+            y,
+            width,
+            height,
+            rotation,
+            background_image,
+            (SELECT Assets.name FROM Assets WHERE Assets.id = Elements.background_image),
+            background_color,
+            (SELECT Assets.hash FROM Assets WHERE Assets.id = Elements.background_image)
+    """,
+
+    "get_element_background": "SELECT background_image FROM Elements WHERE id = ?",
+
     "remove_element": "DELETE FROM Elements WHERE id = ?",
 
+    "remove_element_returning": "DELETE FROM Elements WHERE id = ? RETURNING background_image",
+
     "element_exists": "SELECT EXISTS (SELECT id FROM Elements WHERE id = ?)",
 
-    "get_assets": "SELECT id, name, value FROM Assets",
+    "get_assets": "SELECT id, name, value, hash FROM Assets",
+
+    "list_assets": "SELECT id, name, LENGTH(value), hash FROM Assets ORDER BY id",
+
+    "get_asset_data": "SELECT value FROM Assets WHERE id = ?",
+
+    "create_asset": "INSERT INTO Assets (name, value, hash) VALUES (?, ?, ?)",
+
+    "get_asset_by_hash": "SELECT id, name FROM Assets WHERE hash = ?",
+
+    "get_assets_by_hash_in": "SELECT hash, id FROM Assets WHERE hash IN ({})",
 
-    "create_asset": "INSERT INTO Assets (name, value) VALUES (?, ?)",
+    "asset_references": "SELECT COUNT(*) FROM Elements WHERE background_image = ?",
+
+    "get_last_asset_id": "SELECT COALESCE(MAX(id), 0) FROM Assets",
 
     "remove_asset": "DELETE FROM Assets WHERE id = ?",
 
+    "release_asset": """
+        DELETE FROM Assets
+        WHERE id = ?1 AND NOT EXISTS (SELECT 1 FROM Elements WHERE background_image = ?1)
+    """,
+
     "asset_exists": "SELECT EXISTS (SELECT id FROM Assets WHERE id = ?)",
 
     "create_text": "INSERT INTO Text (name, value, x, y) VALUES (?, ?, ?, ?)",
 
+    "create_text_full": """
+        INSERT INTO Text (
+            name,
+            value,
+            color,
+            font_size,
+            x,
+            y,
+            rotation
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """,
+
+    "get_last_text_id": "SELECT COALESCE(MAX(id), 0) FROM Text",
+
+    "get_text_in": """
+        SELECT id, name, value, color, font_size, x, y, rotation FROM Text WHERE id IN ({})
+    """,
+
+    "get_text_after": """
+        SELECT id, name, value, color, font_size, x, y, rotation FROM Text WHERE id > ?
+    """,
+
+    "get_text_in_rect": """
+        SELECT Text.id, name, value, color, font_size, x, y, rotation
+        FROM TextIndex
+        JOIN Text ON Text.id = TextIndex.id
+        WHERE TextIndex.max_x >= :x0 AND TextIndex.min_x <= :x1
+            AND TextIndex.max_y >= :y0 AND TextIndex.min_y <= :y1
+    """,
+
+    "get_text_ids_in": "SELECT id FROM Text WHERE id IN ({})",
+
     "get_all_text": "SELECT id, name, value, color, font_size, x, y, rotation FROM Text",
 
     "get_text": "SELECT id, name, value, color, font_size, x, y, rotation FROM Text WHERE id = ?",
@@ -96,7 +308,100 @@ sql_table = {
         WHERE id = ?
     """,
 
+    "edit_text_returning": """
+        UPDATE Text SET
+            name = ?,
+            value = ?,
+            color = ?,
+            font_size = ?,
+            x = ?,
+            y = ?,
+            rotation = ?
+        WHERE id = ?
+        RETURNING id, name, value, color, font_size, x, y, rotation
+    """,
+
+    "patch_text": """
+        UPDATE Text SET {}
+        WHERE id = :id
+        RETURNING id, name, value, color, font_size, x, y, rotation
+    """,
+
     "remove_text": "DELETE FROM Text WHERE id = ?",
 
-    "text_exists": "SELECT EXISTS (SELECT id FROM Text WHERE id = ?)"
+    "text_exists": "SELECT EXISTS (SELECT id FROM Text WHERE id = ?)",
+
+    # Migrations from older map versions
+    "migrate_v3_add_asset_hash": "ALTER TABLE Assets ADD COLUMN hash TEXT",
+
+    "migrate_v3_get_asset_ids": "SELECT id FROM Assets ORDER BY id",
+
+    "migrate_v3_set_asset_hash": "UPDATE Assets SET hash = ? WHERE id = ?",
+
+    "migrate_v3_move_references": """
+        UPDATE Elements SET background_image = ? WHERE background_image = ?
+    """,
+
+    "migrate_v3_create_asset_hash_index": "CREATE UNIQUE INDEX AssetsHash ON Assets(hash)",
+
+    "migrate_v3_create_background_index": """
+        CREATE INDEX ElementsBackgroundImage ON Elements(background_image)
+    """,
+
+    "migrate_v4_create_elements_index": """
+        CREATE VIRTUAL TABLE ElementsIndex USING rtree(id, min_x, max_x, min_y, max_y)
+    """,
+
+    "migrate_v4_fill_elements_index": """
+        INSERT INTO ElementsIndex SELECT id, x, x + width - 1, y, y + height - 1 FROM Elements
+    """,
+
+    "migrate_v4_create_elements_insert_trigger": """
+        CREATE TRIGGER ElementsIndexInsert AFTER INSERT ON Elements BEGIN
+            INSERT INTO ElementsIndex
+            VALUES (NEW.id, NEW.x, NEW.x + NEW.width - 1, NEW.y, NEW.y + NEW.height - 1);
+        END
+    """,
+
+    "migrate_v4_create_elements_update_trigger": """
+        CREATE TRIGGER ElementsIndexUpdate AFTER UPDATE OF x, y, width, height ON Elements BEGIN
+            UPDATE ElementsIndex SET
+                min_x = NEW.x, max_x = NEW.x + NEW.width - 1,
+                min_y = NEW.y, max_y = NEW.y + NEW.height - 1
+            WHERE id = NEW.id;
+        END
+    """,
+
+    "migrate_v4_create_elements_delete_trigger": """
+        CREATE TRIGGER ElementsIndexDelete AFTER DELETE ON Elements BEGIN
+            DELETE FROM ElementsIndex WHERE id = OLD.id;
+        END
+    """,
+
+    "migrate_v4_create_text_index": """
+        CREATE VIRTUAL TABLE TextIndex USING rtree(id, min_x, max_x, min_y, max_y)
+    """,
+
+    "migrate_v4_fill_text_index": "INSERT INTO TextIndex SELECT id, x, x, y, y FROM Text",
+
+    "migrate_v4_create_text_insert_trigger": """
+        CREATE TRIGGER TextIndexInsert AFTER INSERT ON Text BEGIN
+            INSERT INTO TextIndex VALUES (NEW.id, NEW.x, NEW.x, NEW.y, NEW.y);
+        END
+    """,
+
+    "migrate_v4_create_text_update_trigger": """
+        CREATE TRIGGER TextIndexUpdate AFTER UPDATE OF x, y ON Text BEGIN
+            UPDATE TextIndex SET min_x = NEW.x, max_x = NEW.x, min_y = NEW.y, max_y = NEW.y
+            WHERE id = NEW.id;
+        END
+    """,
+
+    "migrate_v4_create_text_delete_trigger": """
+        CREATE TRIGGER TextIndexDelete AFTER DELETE ON Text BEGIN
+            DELETE FROM TextIndex WHERE id = OLD.id;
+        END
+    """,
+
+    "migrate_v5_create_cell_index": "CREATE INDEX ElementsCell ON Elements(x, y)"
 }
@@ -0,0 +1,189 @@
+from typing import Any, List
+from map.bounds import BOUNDS_FIELDS
+from map.sql import sql_table
+from map.types import MapChange, MapText, TextEditable, TextNotFoundException
+
+
+# Columns that can be changed with patch_text
+TEXT_PATCH_FIELDS = ("name", "value", "color",
+                     "font_size", "x", "y", "rotation")
+# Fields written by edit_text, reported in the map changes
+TEXT_EDIT_FIELDS = TEXT_PATCH_FIELDS
+
+
+class TextsMixin:  # MARK: TextsMixin
+    """Reading and writing single text objects of a map.
+    """
+
+    # Create text object
+    def create_text(self, name: str, text: str, x: int, y: int) -> MapText:
+        """Create a text object on the map
+
+        Args:
+            name (str): The name of the text object.
+            text (str): The text inside the text object.
+            x (int): X coordinate (true).
+            y (int): Y coordinate (true).
+
+        Returns:
+            MapText: The created text.
+        """
+        _, text_id = self._execute(
+            query=sql_table["create_text"], parameters=(name, text, x, y))
+        created_text = self._load_text((text_id, name, text, "#000", 36, x, y, 0))
+        self._did_change((MapChange("created", "text", text_id),))
+        return created_text
+
+    # Get a single text object
+    def get_text(self, text_id: int) -> MapText | None:
+        """Get text object by id.
+
+        Args:
+            text_id (int): The id of the text.
+
+        Returns:
+            MapText | None: The text object or None if not found.
+        """
+        with self._lock:
+            if text_id in self._objects["text"]:
+                return self._objects["text"][text_id]
+            text_raw, _ = self._query(
+                query=sql_table["get_text"], parameters=(text_id,))
+            return self._load_text(text_raw[0]) if text_raw else None
+
+    # Get all text objects
+    def get_text_list(self):
+        """Get list of all text objects on the map.
+
+        Returns:
+            List[MapText]: List of text objects.
+        """
+        with self._lock:
+            if "text" not in self._fully_loaded:
+                texts_raw, _ = self._query(query=sql_table["get_all_text"])
+                # Rebuild in database order, text objects loaded earlier keep their instance
+                self._objects["text"] = {text.id: text for text in
+                                         [self._load_text(result) for result in texts_raw]}
+                self._fully_loaded.add("text")
+            return list(self._objects["text"].values())
+
+    # Get the text objects in an area
+    def get_text_in_rect(self, x0: float, y0: float, x1: float, y1: float) -> List[MapText]:
+        """Get the text objects positioned inside an area, using the spatial index.
+        Only the position of a text object is indexed,
+        so the area should include a margin for the text size.
+
+        Args:
+            x0 (float): X coordinate of a corner of the area (true)
+            y0 (float): Y coordinate of a corner of the area (true)
+            x1 (float): X coordinate of the opposite corner of the area (true)
+            y1 (float): Y coordinate of the opposite corner of the area (true)
+
+        Returns:
+            List[MapText]: List of text objects in the area.
+        """
+        texts_raw, _ = self._query(query=sql_table["get_text_in_rect"],
+                                   parameters=self._rect_parameters(x0, y0, x1, y1))
+        return [self._load_text(result) for result in texts_raw]
+
+    # Check if a certain text object exists
+    def text_exists(self, text_id: int) -> bool:
+        """Check that a text object exits on the map by id.
+
+        Args:
+            text_id (int): The id of the text object.
+
+        Returns:
+            bool: True when the text object exists.
+        """
+        with self._lock:
+            if text_id in self._objects["text"]:
+                return True
+            [[result]], _ = self._query(
+                query=sql_table["text_exists"], parameters=(text_id,))
+            return result == 1
+
+    # Edit text object
+    def edit_text(self, text_id: int, text_editable: TextEditable) -> MapText:
+        """Edit a text object on the map.
+
+        Args:
+            text_id (int): The id of the text object to edit.
+            text_editable (TextEditable): The details of the text objects new form.
+
+        Raises:
+            TextNotFoundException: The text object was not found.
+
+        Returns:
+            MapText: The edited text object.
+        """
+        # Perform edits, the edited row is read back by the update itself
+        self._note_previous_rects("text", (text_id,))
+        text_raw = self._execute_returning(query=sql_table["edit_text_returning"],
+                                           parameters=(*self._text_row(text_editable), text_id))
+        if not text_raw:
+            raise TextNotFoundException(text_id)
+        edited_text = self._load_text(text_raw[0])
+        self._did_change((MapChange("updated", "text", text_id, TEXT_EDIT_FIELDS),))
+        return edited_text
+
+    # Get the written columns of a text object
+    @staticmethod
+    def _text_row(text_editable: TextEditable) -> tuple:
+        """Get the parameters of the text create and edit queries, without the id.
+
+        Args:
+            text_editable (TextEditable): The details of the text object's form.
+
+        Returns:
+            tuple: The parameters, in the order of the queries.
+        """
+        return (text_editable["name"],
+                text_editable["value"],
+                text_editable["color"],
+                text_editable["font_size"],
+                text_editable["x"],
+                text_editable["y"],
+                text_editable["rotation"])
+
+    # Edit only some fields of a text object
+    def patch_text(self, text_id: int, **fields: Any) -> MapText:
+        """Edit only the given fields of a text object on the map.
+
+        Args:
+            text_id (int): The id of the text object to edit.
+            **fields (Any): New values by field name, see TEXT_PATCH_FIELDS.
+
+        Raises:
+            ValueError: A field cannot be patched.
+            TextNotFoundException: The text object was not found.
+
+        Returns:
+            MapText: The edited text object.
+        """
+        if BOUNDS_FIELDS.intersection(fields):
+            self._note_previous_rects("text", (text_id,))
+        text_raw = self._patch(
+            sql_table["patch_text"], TEXT_PATCH_FIELDS, text_id, fields)
+        if not text_raw:
+            raise TextNotFoundException(text_id)
+        patched_text = self._load_text(text_raw[0])
+        self._did_change((MapChange("updated", "text", text_id, fields.keys()),))
+        return patched_text
+
+    # Remove text
+    def remove_text(self, text_id: int):
+        """Remove a text object from the map.
+
+        Args:
+            text_id (int): The id of the text to be removed.
+
+        Raises:
+            TextNotFoundException: The text object was not found.
+        """
+        if not self.text_exists(text_id):
+            raise TextNotFoundException(text_id)
+        self._note_previous_rects("text", (text_id,))
+        self._execute(query=sql_table["remove_text"], parameters=(text_id,))
+        self._forget("text", (text_id,))
+        self._did_change((MapChange("removed", "text", text_id),))
@@ -0,0 +1,150 @@
+from contextlib import contextmanager
+from types import FunctionType
+from typing import Callable, Iterable, Iterator, List
+from map.types import MapChange
+
+
+class TransactionsMixin:  # MARK: TransactionsMixin
+    """Transactions of a map and the delivery of their changes to the listeners.
+
+    Attributes:
+        _listeners (List[Callable[[List[MapChange]], None]]): Methods called with the changes
+            when the map is modified.
+        _transaction_depth (int): How many transactions are currently open (0 when none).
+        _pending_changes (List[MapChange]): The changes made inside the currently open transaction.
+    """
+    _listeners: List[Callable[[List[MapChange]], None]]
+    _transaction_depth: int
+    _pending_changes: List[MapChange]
+
+    # Start without listeners and transactions
+    def _init_transactions(self):
+        """Set up the listeners and the transaction state, called by the constructor of the map.
+        """
+        self._listeners = []
+        self._transaction_depth = 0
+        self._pending_changes = []
+
+    def register_on_change(self, listener: FunctionType):
+        """Register a method called without arguments when changes happen. Can be called many times.
+
+        Args:
+            listener (FunctionType): Method called when changes happen.
+        """
+        self.subscribe(lambda changes: listener())
+
+    def subscribe(self, listener: Callable[[List[MapChange]], None]):
+        """Register a method called with the list of changes when changes happen.
+        The changes of a transaction are delivered once, when it is committed.
+
+        Args:
+            listener (Callable[[List[MapChange]], None]): Method called with the changes.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[List[MapChange]], None]):
+        """Remove a method registered with subscribe. Does nothing if it is not registered.
+
+        Args:
+            listener (Callable[[List[MapChange]], None]): The registered method.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # Call on_change listener
+    def _did_change(self, changes: Iterable[MapChange]):
+        """Called internally to deliver changes to the listeners.
+        Inside a transaction the changes are collected until the transaction is committed.
+
+        Args:
+            changes (Iterable[MapChange]): The changes made.
+        """
+        changes = list(changes)
+        self._track_bounds(changes)
+        self._pending_changes.extend(changes)
+        if self._transaction_depth or not self._pending_changes:
+            return
+        changes, self._pending_changes = self._pending_changes, []
+        for listener in list(self._listeners):
+            listener(changes)
+
+    # Group many modifications into a single commit
+    @contextmanager
+    def transaction(self) -> Iterator["Map"]:
+        """Context manager to run many modifications as a single transaction.
+        Commits and the on_change call are deferred until the outermost transaction exits.
+        Transactions can be nested, in which case the inner ones are savepoints.
+        On an exception, the modifications of the transaction are rolled back.
+
+        Raises:
+            ValueError: Map is not yet open.
+
+        Yields:
+            Map: This map.
+        """
+        with self._lock:
+            savepoint = self._begin()
+            pending_changes_count = len(self._pending_changes)
+
+            try:
+                yield self
+            except BaseException:
+                self._rollback(savepoint, pending_changes_count)
+                raise
+
+            self._transaction_depth -= 1
+            if self._transaction_depth:
+                self._connection.execute(f"RELEASE {savepoint}")
+                return
+            self._connection.commit()
+
+            # Notify about the changes of the whole transaction at once
+            self._did_change(())
+
+    # Alias, reads better for bulk operations
+    batch = transaction
+
+    # Open a transaction, or a savepoint inside the open one
+    def _begin(self) -> str:
+        """Begin a transaction, or a savepoint when one is already open.
+        Must be called with the lock held.
+
+        Raises:
+            ValueError: Map is not yet open.
+
+        Returns:
+            str: The name of the savepoint, used to roll back or release it.
+        """
+        if not self._connection:
+            raise ValueError("Map not open!")
+
+        # Outermost transaction is a real transaction, the rest are savepoints
+        savepoint = f"map_transaction_{self._transaction_depth}"
+        if self._transaction_depth:
+            self._connection.execute(f"SAVEPOINT {savepoint}")
+        elif not self._connection.in_transaction:
+            self._connection.execute("BEGIN")
+        self._transaction_depth += 1
+        return savepoint
+
+    # Undo the innermost open transaction
+    def _rollback(self, savepoint: str, pending_changes_count: int):
+        """Roll back the innermost open transaction, or savepoint, after an exception.
+        Must be called with the lock held.
+
+        Args:
+            savepoint (str): The name of the savepoint, returned by _begin.
+            pending_changes_count (int): How many changes were pending when it began.
+        """
+        self._transaction_depth -= 1
+        # Loaded objects may hold rolled back values
+        self._clear_objects()
+        # Changes of the rolled back part are not delivered
+        del self._pending_changes[pending_changes_count:]
+        if self._transaction_depth:
+            self._connection.execute(f"ROLLBACK TO {savepoint}")
+            self._connection.execute(f"RELEASE {savepoint}")
+        else:
+            self._connection.rollback()
+            # Ids of rolled back assets can be reused for different data
+            self.asset_cache.clear()
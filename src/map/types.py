@@ -1,4 +1,10 @@
-from typing import List, TypedDict
+from copy import deepcopy
+from pathlib import Path
+from typing import Callable, Iterable, List, Literal, Tuple, TypedDict
+
+
+# Raw bytes of an asset, or the file to read them from. Lists of ints are still accepted.
+AssetData = bytes | bytearray | memoryview | Path | List[int]
 
 
 class AssetEditable(TypedDict):
@@ -6,7 +12,7 @@ class AssetEditable(TypedDict):
     """
     id: int | None
     name: str
-    data: List[int]
+    data: AssetData
 
 
 class Asset:  # MARK: Asset
@@ -15,23 +21,55 @@ class Asset:  # MARK: Asset
     Attributes:
         id (int): The ID of the asset.
         name (str): The name of the asset.
-        data (bytes): The raw bytes of the asset.
+        hash (str | None): The SHA-256 hex digest of the raw bytes, when known.
+        data (bytes): The raw bytes of the asset. Loaded on access when the asset has a loader.
+        _data (bytes | None): The raw bytes of the asset when given directly.
+        _loader (Callable[[int], bytes] | None): Method to load the raw bytes with the asset id.
     """
     id: int
     name: str
-    data: bytes
+    hash: str | None
+    _data: bytes | None
+    _loader: Callable[[int], bytes] | None
 
-    def __init__(self, asset_id: int, name: str, data: bytes):
+    def __init__(self, asset_id: int, name: str, data: bytes | None = None, *,
+                 loader: Callable[[int], bytes] | None = None, asset_hash: str | None = None):
         """The constructor of the Asset class.
 
         Args:
-            map_id (int): The id of the asset.
+            asset_id (int): The id of the asset.
             name (str): The name of the asset.
-            data (bytes): The raw buts of the asset.
+            data (bytes | None): The raw buts of the asset. Defaults to None.
+            loader (Callable[[int], bytes] | None): Method to load the raw bytes on access.
+                Defaults to None.
+            asset_hash (str | None): The SHA-256 hex digest of the raw bytes. Defaults to None.
         """
         self.id = asset_id
         self.name = name
-        self.data = data
+        self.hash = asset_hash
+        self._data = data
+        self._loader = loader
+
+    @property
+    def data(self) -> bytes:
+        """The raw bytes of the asset. Not kept in the asset when a loader is used,
+        so the loader's cache decides how long they stay in memory.
+
+        Returns:
+            bytes: The raw bytes.
+        """
+        if self._data is None and self._loader:
+            return self._loader(self.id)
+        return self._data
+
+    @data.setter
+    def data(self, data: bytes):
+        self._data = data
+
+    def __deepcopy__(self, memo: dict) -> "Asset":
+        # A copy outlives the asset in the map, such as in the clipboard, so it holds the bytes.
+        # Bytes are immutable, so they are shared.
+        return Asset(self.id, self.name, self.data, asset_hash=self.hash)
 
     def to_dict(self) -> AssetEditable:
         """Convert the asset to dict form.
@@ -42,10 +80,39 @@ class Asset:  # MARK: Asset
         return {
             "id": self.id,
             "name": self.name or "",
-            "data": list(self.data) if self.data else []
+            "data": self.data or b""
         }
 
 
+class AssetInfo:  # MARK: AssetInfo
+    """Metadata of an asset in the map database, without the raw bytes.
+
+    Attributes:
+        id (int): The ID of the asset.
+        name (str): The name of the asset.
+        size (int): The length of the raw bytes.
+        hash (str | None): The SHA-256 hex digest of the raw bytes, when known.
+    """
+    id: int
+    name: str
+    size: int
+    hash: str | None
+
+    def __init__(self, asset_id: int, name: str, size: int, asset_hash: str | None = None):
+        """The constructor of the AssetInfo class.
+
+        Args:
+            asset_id (int): The id of the asset.
+            name (str): The name of the asset.
+            size (int): The length of the raw bytes.
+            asset_hash (str | None): The SHA-256 hex digest of the raw bytes. Defaults to None.
+        """
+        self.id = asset_id
+        self.name = name
+        self.size = size
+        self.hash = asset_hash
+
+
 class AssetNotFoundException(Exception):
     """Exception to be raised when an asset is not found.
     """
@@ -98,9 +165,22 @@ class Element:  # MARK: Element
     rotation: int
     background_image: Asset | None
     background_color: str | None
+    _asset_loader: Callable[[int], bytes] | None
 
-    def __init__(self, *raw):
+    def __init__(self, *raw, asset_loader: Callable[[int], bytes] | None = None):
         """The constructor of the Element class
+
+        Args:
+            asset_loader (Callable[[int], bytes] | None): Loader for the background image bytes.
+                Defaults to None.
+        """
+        self._asset_loader = asset_loader
+        self.background_image = None
+        self.update(*raw)
+
+    def update(self, *raw):
+        """Update the element in place from a database row.
+        The background image instance is kept when the image did not change.
         """
         self.id = raw[0]
         self.name = raw[1]
@@ -108,12 +188,27 @@ class Element:  # MARK: Element
         self.y = raw[3]
         self.width = raw[4]
         self.height = raw[5]
-        self.background_image = Asset(raw[7],
-                                      raw[8],
-                                      raw[9]) if raw[7] else None
-        self.background_color = raw[10]
+        if not raw[7]:
+            self.background_image = None
+        elif not self.background_image or self.background_image.id != raw[7]:
+            self.background_image = Asset(raw[7],
+                                          raw[8],
+                                          loader=self._asset_loader,
+                                          asset_hash=raw[10])
+        else:
+            self.background_image.name = raw[8]
+            self.background_image.hash = raw[10]
+        self.background_color = raw[9]
         self.rotation = raw[6]
 
+    def __deepcopy__(self, memo: dict) -> "Element":
+        # The copy is detached from the map, the background image holds its own bytes
+        copied = Element.__new__(Element)
+        copied.__dict__.update(self.__dict__)
+        copied._asset_loader = None
+        copied.background_image = deepcopy(self.background_image, memo)
+        return copied
+
     def to_dict(self) -> ElementEditable:
         """Transform the element to dict form.
 
@@ -146,6 +241,23 @@ class ElementNotFoundException(Exception):
         super().__init__(f"Element for id '{element_id}' not found.")
 
 
+class ElementCollisionException(Exception):
+    """Exception to be raised when an element would be placed on an occupied cell.
+    """
+
+    def __init__(self, x, y):
+        """The constructor of the ElementCollision exception.
+
+        Args:
+            x (int): The X coordinate of the occupied cell (1/256)
+            y (int): The Y coordinate of the occupied cell (1/256)
+        """
+        super().__init__(f"Cell 'x: {x}, y: {y}' is already occupied.")
+
+
+CollisionPolicy = Literal["stack", "reject", "replace"]
+
+
 class MapMetadataMalformedException(Exception):
     """Exception to be raised when the map metadata is malformed.
     """
@@ -250,6 +362,11 @@ class MapText:  # MARK: Text
             y (int): The Y coordinate of the text (true)
             rotation (int): The rotation of the text object.
         """
+        self.update(*raw)
+
+    def update(self, *raw):
+        """Update the text object in place from a database row.
+        """
         self.id = raw[0]
         self.name = raw[1]
         self.value = raw[2]
@@ -275,3 +392,126 @@ class MapText:  # MARK: Text
             "y": self.y,
             "rotation": self.rotation
         }
+
+
+ChangeKind = Literal["created", "updated", "removed"]
+
+
+class MapChange:  # MARK: MapChange
+    """A single change to an object on the map, delivered to the change listeners of the map.
+
+    Attributes:
+        kind (ChangeKind): If the object was "created", "updated" or "removed".
+        object_type (str): The type of the object, "element" or "text".
+        object_id (int): The id of the object.
+        fields (Tuple[str, ...]): The names of the fields written by an update.
+            Empty for other kinds.
+    """
+    kind: ChangeKind
+    object_type: str
+    object_id: int
+    fields: Tuple[str, ...]
+
+    def __init__(self, kind: ChangeKind, object_type: str, object_id: int,
+                 fields: Iterable[str] = ()):
+        """The constructor of the MapChange class.
+
+        Args:
+            kind (ChangeKind): If the object was "created", "updated" or "removed".
+            object_type (str): The type of the object, "element" or "text".
+            object_id (int): The id of the object.
+            fields (Iterable[str], optional): The names of the fields written by an update.
+                Defaults to ().
+        """
+        self.kind = kind
+        self.object_type = object_type
+        self.object_id = object_id
+        self.fields = tuple(fields)
+
+    def __repr__(self) -> str:
+        return (f"MapChange({self.kind!r}, {self.object_type!r}, "
+                f"{self.object_id!r}, {self.fields!r})")
+
+
+Rect = Tuple[float, float, float, float]  # min x, min y, max x, max y
+
+
+class MapBounds:  # MARK: MapBounds
+    """Bounding box of the objects on the map.
+
+    Attributes:
+        element_rect (Rect | None): The tiles covered by elements, inclusive (1/256).
+            None without elements.
+        text_rect (Rect | None): The positions of the text objects (true).
+            None without text objects.
+    """
+    element_rect: Rect | None
+    text_rect: Rect | None
+
+    def __init__(self, element_rect: Rect | None = None, text_rect: Rect | None = None):
+        """The constructor of the MapBounds class.
+
+        Args:
+            element_rect (Rect | None, optional): The tiles covered by elements (1/256).
+                Defaults to None.
+            text_rect (Rect | None, optional): The positions of the text objects (true).
+                Defaults to None.
+        """
+        self.element_rect = element_rect
+        self.text_rect = text_rect
+
+    @staticmethod
+    def _union(rect: Rect | None, other: Rect) -> Rect:
+        if rect is None:
+            return other
+        return (min(rect[0], other[0]), min(rect[1], other[1]),
+                max(rect[2], other[2]), max(rect[3], other[3]))
+
+    def include(self, map_object: "Element | MapText"):
+        """Grow the bounds to include an object.
+
+        Args:
+            map_object (Element | MapText): The object to include.
+        """
+        if map_object.type == "element":
+            self.element_rect = self._union(self.element_rect, self.rect_of(map_object))
+        else:
+            self.text_rect = self._union(self.text_rect, self.rect_of(map_object))
+
+    @staticmethod
+    def rect_of(map_object: "Element | MapText") -> Rect:
+        """Get the area an object covers in the bounds.
+
+        Args:
+            map_object (Element | MapText): The object.
+
+        Returns:
+            Rect: The tiles covered by an element, or the position of a text object.
+        """
+        if map_object.type == "element":
+            return (map_object.x, map_object.y,
+                    map_object.x + map_object.width - 1, map_object.y + map_object.height - 1)
+        return (map_object.x, map_object.y, map_object.x, map_object.y)
+
+    def would_shrink(self, object_type: str, previous: Rect, current: Rect | None) -> bool:
+        """Check if moving an object, or removing it, can shrink the bounds.
+        That is when it was on an edge of the bounds which it does not reach anymore.
+
+        Args:
+            object_type (str): The type of the object, "element" or "text".
+            previous (Rect): The area the object covered before.
+            current (Rect | None): The area the object covers now, None when removed.
+
+        Returns:
+            bool: True when the bounds must be computed again.
+        """
+        rect = self.element_rect if object_type == "element" else self.text_rect
+        if rect is None:
+            return True
+        for edge in (0, 1):
+            if previous[edge] <= rect[edge] and (current is None or current[edge] > rect[edge]):
+                return True
+        for edge in (2, 3):
+            if previous[edge] >= rect[edge] and (current is None or current[edge] < rect[edge]):
+                return True
+        return False
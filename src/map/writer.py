@@ -0,0 +1,108 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List
+from map.entity import Map
+from map.types import MapChange
+
+
+class MapWriter:  # MARK: MapWriter
+    """Runs the modifications of a map on a dedicated writer thread,
+    in the order they were submitted.
+    Each modification is a single transaction on a connection of its own, so the map can be read
+    while a modification is in progress. Reads only wait while a modification is committed.
+    The changes are delivered to the listeners of the writer, on the writer thread. Pass them to
+    Map.apply_changes of the map, on the thread reading it, to update its loaded objects.
+
+    Attributes:
+        map (Map): The map the modifications are made to. It is only read, the writer modifies it.
+        _writer_map (Map): The same map file opened for the writer thread, sharing the asset cache.
+        _executor (ThreadPoolExecutor): The writer thread.
+    """
+    map: Map
+    _writer_map: Map
+    _executor: ThreadPoolExecutor
+
+    def __init__(self, target_map: Map):
+        """Constructor of the map writer. Opens the map file again for the writer thread.
+
+        Args:
+            target_map (Map): The map the modifications are made to.
+        """
+        self.map = target_map
+        # Assets removed by the writer must not be served from the cache of the map
+        self._writer_map = Map(target_map.map_file,
+                               collision_policy=target_map.collision_policy,
+                               asset_cache=target_map.asset_cache)
+        self._writer_map.open()
+        # A single worker keeps the modifications in order
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix="map-writer")
+
+    def subscribe(self, listener: Callable[[List[MapChange]], None]):
+        """Register a method called on the writer thread
+        with the changes of each committed modification.
+
+        Args:
+            listener (Callable[[List[MapChange]], None]): Method called with the changes.
+        """
+        self._writer_map.subscribe(listener)
+
+    def unsubscribe(self, listener: Callable[[List[MapChange]], None]):
+        """Remove a method registered with subscribe. Does nothing if it is not registered.
+
+        Args:
+            listener (Callable[[List[MapChange]], None]): The registered method.
+        """
+        self._writer_map.unsubscribe(listener)
+
+    def submit(self, operation: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queue a modification of the map,
+        such as submit(Map.patch_element, element_id, name="Hall").
+
+        Args:
+            operation (Callable[..., Any]): Called with the map of the writer thread
+                and the arguments.
+            *args (Any): Positional arguments of the operation.
+            **kwargs (Any): Keyword arguments of the operation.
+
+        Returns:
+            Future: Resolves to the result of the operation, or its exception.
+                Returned objects belong to the writer thread, read the map for its own objects.
+        """
+        return self._executor.submit(self._run, operation, args, kwargs)
+
+    def barrier(self) -> Future:
+        """Get a future that resolves once every modification submitted before it has finished.
+
+        Returns:
+            Future: Resolves to None.
+                Failures of the earlier modifications are only in their own futures.
+        """
+        return self._executor.submit(lambda: None)
+
+    def flush(self, timeout: float | None = None):
+        """Wait until every modification submitted so far has finished.
+
+        Args:
+            timeout (float | None, optional): Seconds to wait at most. Defaults to None, no limit.
+
+        Raises:
+            TimeoutError: The modifications did not finish in time.
+        """
+        self.barrier().result(timeout)
+
+    def close(self):
+        """Finish the queued modifications, stop the writer thread and close its connection.
+        The asset cache of the map is kept. Nothing can be submitted after.
+        """
+        self._executor.shutdown(wait=True)
+        self._writer_map.close()
+
+    def _run(self, operation: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        # Runs on the writer thread, readers of the map only wait for the commit
+        self._writer_map.collision_policy = self.map.collision_policy
+        try:
+            with self._writer_map.transaction():
+                return operation(self._writer_map, *args, **kwargs)
+        finally:
+            # Nothing reads the objects of the writer, so they are not kept between modifications
+            self._writer_map.unload_objects()
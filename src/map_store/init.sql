@@ -1 +1 @@
-INSERT INTO Meta (id, name, version) VALUES (1, "Unnamed Map", 2)
\ No newline at end of file
+INSERT INTO Meta (id, name, version) VALUES (1, "Unnamed Map", 5)
\ No newline at end of file
@@ -9,8 +9,10 @@ CREATE TABLE Meta (
 CREATE TABLE Assets (
     id INTEGER PRIMARY KEY,
     name TEXT NOT NULL,
-    value BLOB NOT NULL
+    value BLOB NOT NULL,
+    hash TEXT -- SHA-256 of value, identical values are stored once
 );
+CREATE UNIQUE INDEX AssetsHash ON Assets(hash);
 
 -- Map elements
 CREATE TABLE Elements (
@@ -24,6 +26,9 @@ CREATE TABLE Elements (
     background_image INTEGER REFERENCES Assets(id) ON DELETE CASCADE DEFAULT NULL,
     background_color TEXT
 );
+CREATE INDEX ElementsBackgroundImage ON Elements(background_image);
+-- Not unique, stacking elements on a cell is allowed by the default collision policy
+CREATE INDEX ElementsCell ON Elements(x, y);
 
 -- Map text
 CREATE TABLE Text (
@@ -36,3 +41,36 @@ CREATE TABLE Text (
     y INTEGER NOT NULL,
     rotation INTEGER NOT NULL DEFAULT 0
 );
+
+-- Spatial indexes, kept up to date by triggers
+-- Elements cover the tiles from (x, y) to (x + width - 1, y + height - 1)
+CREATE VIRTUAL TABLE ElementsIndex USING rtree(id, min_x, max_x, min_y, max_y);
+
+CREATE TRIGGER ElementsIndexInsert AFTER INSERT ON Elements BEGIN
+    INSERT INTO ElementsIndex VALUES (NEW.id, NEW.x, NEW.x + NEW.width - 1, NEW.y, NEW.y + NEW.height - 1);
+END;
+
+CREATE TRIGGER ElementsIndexUpdate AFTER UPDATE OF x, y, width, height ON Elements BEGIN
+    UPDATE ElementsIndex SET
+        min_x = NEW.x, max_x = NEW.x + NEW.width - 1, min_y = NEW.y, max_y = NEW.y + NEW.height - 1
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER ElementsIndexDelete AFTER DELETE ON Elements BEGIN
+    DELETE FROM ElementsIndex WHERE id = OLD.id;
+END;
+
+-- Text objects are indexed by their position only, their size depends on rendering
+CREATE VIRTUAL TABLE TextIndex USING rtree(id, min_x, max_x, min_y, max_y);
+
+CREATE TRIGGER TextIndexInsert AFTER INSERT ON Text BEGIN
+    INSERT INTO TextIndex VALUES (NEW.id, NEW.x, NEW.x, NEW.y, NEW.y);
+END;
+
+CREATE TRIGGER TextIndexUpdate AFTER UPDATE OF x, y ON Text BEGIN
+    UPDATE TextIndex SET min_x = NEW.x, max_x = NEW.x, min_y = NEW.y, max_y = NEW.y WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER TextIndexDelete AFTER DELETE ON Text BEGIN
+    DELETE FROM TextIndex WHERE id = OLD.id;
+END;
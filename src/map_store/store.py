@@ -205,7 +205,7 @@ class MapStore:  # MARK: MapStore
 
         # Create the file
         schema = self.schema_file.read_text("utf8")
-        connection = connect(new_map_file)
+        connection = connect(new_map_file, check_same_thread=False)
         connection.executescript(schema)
 
         # Do the db init too
@@ -0,0 +1,40 @@
+from map.cache import AssetCache
+import unittest
+
+
+class TestAssetCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = AssetCache(max_bytes=10)
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.cache.get(1))
+        self.cache.put(1, b"12345")
+        self.assertEqual(self.cache.get(1), b"12345")
+        self.assertEqual(self.cache.size, 5)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put(1, b"1234")
+        self.cache.put(2, b"1234")
+        self.cache.get(1)
+        self.cache.put(3, b"1234")
+        self.assertIsNone(self.cache.get(2))
+        self.assertEqual(self.cache.get(1), b"1234")
+        self.assertEqual(self.cache.get(3), b"1234")
+        self.assertEqual(self.cache.size, 8)
+
+    def test_too_large(self):
+        self.cache.put(1, b"12345678901")
+        self.assertIsNone(self.cache.get(1))
+        self.assertEqual(self.cache.size, 0)
+
+    def test_evict_and_clear(self):
+        self.cache.put(1, b"12")
+        self.cache.put(2, b"34")
+        self.cache.evict(1)
+        self.assertIsNone(self.cache.get(1))
+        self.assertEqual(self.cache.size, 2)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(2))
+        self.assertEqual(self.cache.size, 0)
@@ -1,6 +1,10 @@
+from copy import deepcopy
+from hashlib import sha256
 from map_store.store import MapStore
+from map.types import ElementCollisionException, ElementNotFoundException, TextNotFoundException
 from pathlib import Path
 import shutil
+import sqlite3
 import unittest
 from uuid import uuid4
 
@@ -9,6 +13,21 @@ schema_path = "./src/map_store/schema.sql"
 init_path = "./src/map_store/init.sql"
 
 
+def element_dict(**fields) -> dict:
+    """Element in dict form, a plain 1x1 tile at the origin with the given fields changed."""
+    return {
+        "name": "Test tile",
+        "x": 0,
+        "y": 0,
+        "width": 1,
+        "height": 1,
+        "rotation": 0,
+        "background_color": None,
+        "background_image": None,
+        **fields
+    }
+
+
 class TestMap(unittest.TestCase):
     def setUp(self):
         self.test_path = testdata_path_prefix + str(uuid4())
@@ -60,6 +79,8 @@ class TestMap(unittest.TestCase):
         self.assertEqual(len(elements), 1)
         element_dict["id"] = element.id
         element_dict["background_image"]["id"] = element.background_image.id
+        # The dict form has the stored bytes, not the int list given
+        element_dict["background_image"]["data"] = image_data
         self.assertDictEqual(elements[0].to_dict(), element_dict)
 
     def test_remove_element(self):
@@ -111,6 +132,8 @@ class TestMap(unittest.TestCase):
         elements = map.get_elements()
         self.assertEqual(len(elements), 1)
         edited_element_dict["background_image"]["id"] = edited_element.background_image.id
+        # The dict form has the stored bytes, not the int list given
+        edited_element_dict["background_image"]["data"] = image_data
         self.assertDictEqual(elements[0].to_dict(), edited_element_dict)
 
     def test_add_text_properties(self):
@@ -134,3 +157,461 @@ class TestMap(unittest.TestCase):
         map.remove_text(text_obj.id)
         text_list = map.get_text_list()
         self.assertEqual(len(text_list), 0)
+
+    def test_transaction_defers_change(self):
+        map = self.store.create_map("secret-name", "test-map")
+        changes = []
+        map.register_on_change(lambda: changes.append(True))
+        with map.transaction():
+            map.create_text("a", "foo", 1, 1)
+            map.create_text("b", "bar", 2, 2)
+            self.assertEqual(len(changes), 0)
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(len(map.get_text_list()), 2)
+
+    def test_transaction_rollback(self):
+        map = self.store.create_map("secret-name", "test-map")
+        changes = []
+        map.register_on_change(lambda: changes.append(True))
+        with self.assertRaises(RuntimeError):
+            with map.transaction():
+                map.create_text("a", "foo", 1, 1)
+                raise RuntimeError("Abort")
+        self.assertEqual(len(changes), 0)
+        self.assertEqual(len(map.get_text_list()), 0)
+
+    def test_nested_transaction_rollback(self):
+        map = self.store.create_map("secret-name", "test-map")
+        with map.batch():
+            map.create_text("a", "foo", 1, 1)
+            with self.assertRaises(RuntimeError):
+                with map.batch():
+                    map.create_text("b", "bar", 2, 2)
+                    raise RuntimeError("Abort")
+        text_list = map.get_text_list()
+        self.assertEqual(len(text_list), 1)
+        self.assertEqual(text_list[0].name, "a")
+
+    def test_bulk_elements(self):
+        map = self.store.create_map("secret-name", "test-map")
+        image_data = Path("./src/tests/sample_image.jpg").read_bytes()
+        changes = []
+        map.register_on_change(lambda: changes.append(True))
+        element_dicts = [element_dict(
+            name=f"Tile {index}", x=index,
+            background_image={"name": "test", "data": list(image_data)} if index % 2 else None
+        ) for index in range(10)]
+        elements = map.create_elements(element_dicts)
+        self.assertEqual(len(changes), 1)
+        self.assertEqual([element.name for element in elements],
+                         [f"Tile {index}" for index in range(10)])
+        self.assertEqual(elements[1].background_image.data, image_data)
+        self.assertIsNone(elements[0].background_image)
+
+        shared_asset_id = elements[1].background_image.id
+        edited_dicts = [element.to_dict() for element in elements]
+        for edited_dict in edited_dicts:
+            edited_dict["y"] = 5
+        edited_dicts[0]["background_image"] = {
+            "name": "test2", "data": list(image_data)}
+        edited_dicts[1]["background_image"] = None
+        edited = map.edit_elements(edited_dicts)
+        self.assertEqual(len(changes), 2)
+        self.assertTrue(all(element.y == 5 for element in edited))
+        # Identical bytes share the existing asset
+        self.assertEqual(edited[0].background_image.id, shared_asset_id)
+        self.assertEqual(len(map.get_assets()), 1)
+        self.assertIsNone(edited[1].background_image)
+        self.assertEqual(edited[3].background_image.id, shared_asset_id)
+
+        map.remove_elements([element.id for element in elements[:5]])
+        self.assertEqual(len(changes), 3)
+        self.assertEqual(len(map.get_elements()), 5)
+
+    def test_bulk_elements_not_found(self):
+        map = self.store.create_map("secret-name", "test-map")
+        with self.assertRaises(ElementNotFoundException):
+            map.remove_elements([1])
+
+    def test_bulk_text(self):
+        map = self.store.create_map("secret-name", "test-map")
+        text_dicts = [{
+            "name": f"Text {index}",
+            "value": "foo",
+            "color": "#FFF",
+            "font_size": 12,
+            "x": index,
+            "y": index,
+            "rotation": 0
+        } for index in range(10)]
+        texts = map.create_texts(text_dicts)
+        self.assertEqual(len(texts), 10)
+        self.assertEqual(texts[3].color, "#FFF")
+        edited_dicts = [text.to_dict() for text in texts]
+        for edited_dict in edited_dicts:
+            edited_dict["value"] = "bar"
+        edited = map.edit_texts(edited_dicts)
+        self.assertTrue(all(text.value == "bar" for text in edited))
+        map.remove_texts([text.id for text in texts])
+        self.assertEqual(len(map.get_text_list()), 0)
+        with self.assertRaises(TextNotFoundException):
+            map.edit_texts(edited_dicts)
+
+    def test_edit_not_found(self):
+        map = self.store.create_map("secret-name", "test-map")
+        missing = element_dict(
+            id=1, background_image={"id": 1, "name": "test", "data": []})
+        with self.assertRaises(ElementNotFoundException):
+            map.edit_element(1, missing)
+        missing["background_image"] = None
+        with self.assertRaises(ElementNotFoundException):
+            map.edit_element(1, missing)
+        with self.assertRaises(TextNotFoundException):
+            map.edit_text(1, {"id": 1, "name": "", "value": "", "color": "#000",
+                              "font_size": 12, "x": 0, "y": 0, "rotation": 0})
+
+    def test_edit_text(self):
+        map = self.store.create_map("secret-name", "test-map")
+        text_obj = map.create_text("test-text", "foo bar", 1, 1)
+        text_dict = text_obj.to_dict()
+        text_dict["value"] = "edited"
+        text_dict["x"] = 5
+        edited_text = map.edit_text(text_obj.id, text_dict)
+        self.assertEqual(edited_text.value, "edited")
+        self.assertEqual(edited_text.x, 5)
+        self.assertEqual(map.get_text(text_obj.id).value, "edited")
+
+    def test_patch_element(self):
+        map = self.store.create_map("secret-name", "test-map")
+        image_data = Path("./src/tests/sample_image.jpg").read_bytes()
+        element = map.create_element(element_dict(
+            background_image={"name": "test", "data": list(image_data)}))
+        patched = map.patch_element(element.id, x=3, y=4, rotation=90)
+        self.assertEqual((patched.x, patched.y, patched.rotation), (3, 4, 90))
+        self.assertEqual(patched.name, "Test tile")
+        self.assertEqual(patched.background_image.id,
+                         element.background_image.id)
+        self.assertEqual(len(map.get_assets()), 1)
+        with self.assertRaises(ValueError):
+            map.patch_element(element.id, background_image=None)
+        with self.assertRaises(ElementNotFoundException):
+            map.patch_element(element.id + 1, x=1)
+
+    def test_patch_text(self):
+        map = self.store.create_map("secret-name", "test-map")
+        text_obj = map.create_text("test-text", "foo bar", 1, 1)
+        patched = map.patch_text(text_obj.id, value="edited", font_size=12)
+        self.assertEqual(patched.value, "edited")
+        self.assertEqual(patched.font_size, 12)
+        self.assertEqual(patched.name, "test-text")
+        with self.assertRaises(TextNotFoundException):
+            map.patch_text(text_obj.id + 1, x=1)
+
+    def test_lazy_asset_loading(self):
+        map = self.store.create_map("secret-name", "test-map")
+        image_data = Path("./src/tests/sample_image.jpg").read_bytes()
+        element = map.create_element(element_dict(
+            background_image={"name": "test", "data": list(image_data)}))
+        map.asset_cache.clear()
+        [first] = map.get_elements()
+        [second] = map.get_elements()
+        self.assertEqual(first.background_image.name, "test")
+        self.assertEqual(map.asset_cache.size, 0)
+        self.assertEqual(first.background_image.data, image_data)
+        self.assertIs(first.background_image.data,
+                      second.background_image.data)
+        map.remove_asset(element.background_image.id)
+        self.assertEqual(map.asset_cache.size, 0)
+
+        # The content hash is known without loading the bytes
+        image_hash = sha256(image_data).hexdigest()
+        self.assertEqual(element.background_image.hash, image_hash)
+        map.close()
+        map.open()
+        self.assertEqual(map.get_element(element.id).background_image.hash, image_hash)
+        self.assertEqual(map.asset_cache.size, 0)
+
+    def test_asset_data_forms(self):
+        map = self.store.create_map("secret-name", "test-map")
+        image_path = Path("./src/tests/sample_image.jpg")
+        image_data = image_path.read_bytes()
+        for x, data in enumerate((image_data, memoryview(image_data), image_path, list(image_data))):
+            element = map.create_element(element_dict(
+                x=x, background_image={"name": "test", "data": data}))
+            self.assertEqual(element.background_image.data, image_data)
+        self.assertEqual(len(map.list_assets()), 1)
+
+        # The dict form keeps the bytes as they are
+        self.assertIs(type(element.to_dict()["background_image"]["data"]), bytes)
+        [edited] = map.edit_elements([{**element.to_dict(), "background_image": {
+            "name": "test", "data": memoryview(image_data)}}])
+        self.assertEqual(edited.background_image.id, element.background_image.id)
+
+    def test_list_assets(self):
+        map = self.store.create_map("secret-name", "test-map")
+        image_data = Path("./src/tests/sample_image.jpg").read_bytes()
+        element = map.create_element(element_dict(
+            background_image={"name": "test", "data": list(image_data)}))
+        map.asset_cache.clear()
+        [asset] = map.list_assets()
+        self.assertEqual(asset.id, element.background_image.id)
+        self.assertEqual(asset.name, "test")
+        self.assertEqual(asset.size, len(image_data))
+        self.assertEqual(asset.hash, sha256(image_data).hexdigest())
+        self.assertEqual(map.asset_cache.size, 0)
+
+        # Bytes are fetched separately by id
+        self.assertEqual(map.get_asset_data(asset.id), image_data)
+        map.remove_element(element.id)
+        self.assertEqual(map.list_assets(), [])
+
+    def test_asset_deduplication(self):
+        map = self.store.create_map("secret-name", "test-map")
+        image_data = Path("./src/tests/sample_image.jpg").read_bytes()
+        with_image = element_dict(
+            background_image={"name": "test", "data": list(image_data)})
+        first = map.create_element(with_image)
+        second = map.create_element(with_image)
+        self.assertEqual(first.background_image.id, second.background_image.id)
+        self.assertEqual(len(map.get_assets()), 1)
+        self.assertEqual(map.asset_references(first.background_image.id), 2)
+
+        # Still in use by the second element
+        map.remove_element(first.id)
+        self.assertFalse(map.remove_asset(second.background_image.id))
+        self.assertEqual(len(map.get_assets()), 1)
+
+        map.remove_element(second.id)
+        self.assertEqual(len(map.get_assets()), 0)
+
+    def test_migrate_v2(self):
+        map_file = self.testdata_dir / "old-map.dmap"
+        connection = sqlite3.connect(map_file)
+        connection.executescript("""
+            CREATE TABLE Meta (id INTEGER PRIMARY KEY, name TEXT NOT NULL, version INT NOT NULL);
+            CREATE TABLE Assets (id INTEGER PRIMARY KEY, name TEXT NOT NULL, value BLOB NOT NULL);
+            CREATE TABLE Elements (
+                id INTEGER PRIMARY KEY, name TEXT, x INTEGER NOT NULL, y INTEGER NOT NULL,
+                width INTEGER NOT NULL DEFAULT 1, height INTEGER NOT NULL DEFAULT 1,
+                rotation INTEGER NOT NULL DEFAULT 0,
+                background_image INTEGER REFERENCES Assets(id) ON DELETE CASCADE DEFAULT NULL,
+                background_color TEXT
+            );
+            CREATE TABLE Text (
+                id INTEGER PRIMARY KEY, name TEXT, value TEXT, color TEXT NOT NULL DEFAULT '#000',
+                font_size INT NOT NULL DEFAULT 36, x INTEGER NOT NULL, y INTEGER NOT NULL,
+                rotation INTEGER NOT NULL DEFAULT 0
+            );
+            INSERT INTO Meta (id, name, version) VALUES (1, "Old Map", 2);
+            INSERT INTO Assets (name, value) VALUES ("a", x'0102'), ("b", x'0102'), ("c", x'03');
+            INSERT INTO Elements (name, x, y, background_image) VALUES ("1", 0, 0, 1), ("2", 1, 0, 2), ("3", 2, 0, 3);
+        """)
+        connection.close()
+
+        map = self.store.get(map_file.name)
+        self.assertEqual(map.version, 5)
+        self.assertEqual(len(map.get_elements_in_rect(0, 0, 1, 0)), 2)
+        self.assertEqual(map.element_at(1, 0).name, "2")
+        self.assertEqual(len(map.get_assets()), 2)
+        self.assertEqual([element.background_image.id for element in map.get_elements()],
+                         [1, 1, 3])
+
+    def test_get_in_rect(self):
+        map = self.store.create_map("secret-name", "test-map")
+        elements = map.create_elements([element_dict(name=f"Tile {x}, {y}", x=x, y=y)
+                                        for x in range(-5, 5) for y in range(-5, 5)])
+        self.assertEqual(len(map.get_elements_in_rect(0, 0, 1, 1)), 4)
+        self.assertEqual(len(map.get_elements_in_rect(1, 1, -1, -1)), 9)
+        self.assertEqual(len(map.get_elements_in_rect(10, 10, 20, 20)), 0)
+
+        # Index follows moves and removals
+        map.patch_element(elements[0].id, x=15, y=15)
+        self.assertEqual(len(map.get_elements_in_rect(10, 10, 20, 20)), 1)
+        map.remove_element(elements[0].id)
+        self.assertEqual(len(map.get_elements_in_rect(10, 10, 20, 20)), 0)
+
+        text_obj = map.create_text("test-text", "foo bar", 100, 100)
+        map.create_text("test-text", "foo bar", 1000, 1000)
+        self.assertEqual([text.id for text in map.get_text_in_rect(0, 0, 500, 500)],
+                         [text_obj.id])
+        map.patch_text(text_obj.id, x=2000)
+        self.assertEqual(len(map.get_text_in_rect(0, 0, 500, 500)), 0)
+
+    def test_element_at(self):
+        map = self.store.create_map("secret-name", "test-map")
+        elements = map.create_elements([element_dict(name=f"Tile {x}", x=x)
+                                        for x in range(3)])
+        self.assertEqual(map.element_at(1, 0).id, elements[1].id)
+        self.assertIsNone(map.element_at(5, 5))
+
+        # Stacking is allowed by default, the last created element is on top
+        stacked = map.create_element({**elements[1].to_dict(), "name": "Stacked"})
+        self.assertEqual(map.element_at(1, 0).id, stacked.id)
+        cells = map.elements_at([(0, 0), (1, 0), (5, 5)])
+        self.assertEqual(set(cells.keys()), {(0, 0), (1, 0)})
+        self.assertEqual(cells[(1, 0)].id, stacked.id)
+
+    def test_collision_policy(self):
+        map = self.store.create_map("secret-name", "test-map")
+        element = map.create_element(element_dict())
+
+        map.collision_policy = "reject"
+        with self.assertRaises(ElementCollisionException):
+            map.create_element(element.to_dict())
+        other = map.create_element({**element.to_dict(), "x": 1})
+        with self.assertRaises(ElementCollisionException):
+            map.patch_element(other.id, x=0)
+        with self.assertRaises(ElementCollisionException):
+            map.create_elements([{**element.to_dict(), "x": 5}] * 2)
+        self.assertEqual(len(map.get_elements()), 2)
+
+        # Moving an element onto its own cell is not a collision
+        map.patch_element(other.id, x=1, name="Moved")
+
+        map.collision_policy = "replace"
+        map.patch_element(other.id, x=0)
+        self.assertEqual([e.id for e in map.get_elements()], [other.id])
+
+    def test_identity_map(self):
+        map = self.store.create_map("secret-name", "test-map")
+        element = map.create_element(element_dict())
+        text_obj = map.create_text("test-text", "foo bar", 0, 0)
+
+        # The same id always yields the same object, updated in place by writes
+        self.assertIs(map.get_element(element.id), element)
+        self.assertIs(map.get_elements()[0], element)
+        self.assertIs(map.get_elements_in_rect(0, 0, 0, 0)[0], element)
+        self.assertIs(map.patch_element(element.id, x=3), element)
+        self.assertEqual(element.x, 3)
+        self.assertIs(map.get_text_list()[0], text_obj)
+        map.patch_text(text_obj.id, value="bar")
+        self.assertEqual(text_obj.value, "bar")
+
+        # Removed objects are forgotten
+        map.remove_text(text_obj.id)
+        self.assertIsNone(map.get_text(text_obj.id))
+        self.assertEqual(map.get_text_list(), [])
+
+        # Rolled back values are not served from memory
+        with self.assertRaises(RuntimeError):
+            with map.transaction():
+                map.patch_element(element.id, x=10)
+                raise RuntimeError()
+        self.assertEqual(map.get_element(element.id).x, 3)
+
+    def test_copy_element(self):
+        map = self.store.create_map("secret-name", "test-map")
+        image_data = Path("./src/tests/sample_image.jpg").read_bytes()
+        element = map.create_element(element_dict(
+            background_image={"name": "test", "data": list(image_data)}))
+
+        # The copy is detached from the identity map and holds the background bytes
+        map.asset_cache.clear()
+        copied = deepcopy(element)
+        self.assertIsNot(copied, element)
+        copied.x = 5
+        self.assertEqual(map.get_element(element.id).x, 0)
+        self.assertEqual(copied.background_image.data, image_data)
+        self.assertEqual(copied.to_dict()["background_image"]["id"],
+                         element.background_image.id)
+
+    def test_paste_removed_element(self):
+        map = self.store.create_map("secret-name", "test-map")
+        image_data = Path("./src/tests/sample_image.jpg").read_bytes()
+        element = map.create_element(element_dict(
+            background_image={"name": "test", "data": image_data}))
+        map.asset_cache.clear()
+
+        # Copy, remove, then another asset takes the freed id before pasting
+        copied = deepcopy(element)
+        map.remove_element(element.id)
+        other = map.create_element(element_dict(
+            x=1, background_image={"name": "other", "data": b"other"}))
+        self.assertEqual(other.background_image.id, element.background_image.id)
+
+        element_to_insert = copied.to_dict()
+        del element_to_insert["id"]
+        pasted = map.create_element(element_to_insert)
+        self.assertEqual(pasted.background_image.data, image_data)
+        self.assertEqual(other.background_image.data, b"other")
+
+    def test_changes_see_updated_objects(self):
+        map = self.store.create_map("secret-name", "test-map")
+        element = map.create_element(element_dict())
+        text_obj = map.create_text("a", "foo", 1, 1)
+        seen = []
+        map.subscribe(lambda changes: seen.append(
+            (map.get_element(element.id).x, map.get_text(text_obj.id).value)))
+        map.patch_element(element.id, x=3)
+        map.edit_texts([{**text_obj.to_dict(), "value": "bar"}])
+        self.assertEqual(seen, [(3, "foo"), (3, "bar")])
+
+    def test_unload_objects(self):
+        map = self.store.create_map("secret-name", "test-map")
+        element = map.create_element(element_dict())
+        map.unload_objects()
+        reloaded = map.get_element(element.id)
+        self.assertIsNot(reloaded, element)
+        self.assertEqual(reloaded.to_dict(), element.to_dict())
+
+    def test_change_events(self):
+        map = self.store.create_map("secret-name", "test-map")
+        deliveries = []
+        map.subscribe(deliveries.append)
+        other_deliveries = []
+        map.subscribe(other_deliveries.append)
+
+        text_obj = map.create_text("a", "foo", 1, 1)
+        map.patch_text(text_obj.id, value="bar", color="#fff")
+        self.assertEqual([[(change.kind, change.object_type, change.object_id, change.fields)
+                           for change in changes] for changes in deliveries],
+                         [[("created", "text", text_obj.id, ())],
+                          [("updated", "text", text_obj.id, ("value", "color"))]])
+        self.assertEqual(len(other_deliveries), 2)
+
+        # A transaction is delivered once, without the rolled back changes
+        deliveries.clear()
+        with map.batch():
+            map.remove_text(text_obj.id)
+            with self.assertRaises(RuntimeError):
+                with map.batch():
+                    map.create_text("b", "bar", 2, 2)
+                    raise RuntimeError("Abort")
+        self.assertEqual([[(change.kind, change.object_id) for change in changes]
+                          for changes in deliveries],
+                         [[("removed", text_obj.id)]])
+
+        map.unsubscribe(deliveries.append)
+        map.create_text("c", "baz", 3, 3)
+        self.assertEqual(len(deliveries), 1)
+        self.assertEqual(len(other_deliveries), 4)
+
+    def test_bounds(self):
+        map = self.store.create_map("secret-name", "test-map")
+        bounds = map.bounds()
+        self.assertIsNone(bounds.element_rect)
+        self.assertIsNone(bounds.text_rect)
+
+        elements = map.create_elements([element_dict(x=x, y=-x) for x in range(-3, 6)])
+        map.create_text("test-text", "foo bar", 100, 200)
+        self.assertEqual(map.bounds().element_rect, (-3, -5, 5, 3))
+        self.assertEqual(map.bounds().text_rect, (100, 200, 100, 200))
+
+        # Removing or moving an object on the edge shrinks the bounds
+        map.remove_element(elements[-1].id)
+        self.assertEqual(map.bounds().element_rect, (-3, -4, 4, 3))
+        map.patch_element(elements[0].id, x=20)
+        self.assertEqual(map.bounds().element_rect, (-2, -4, 20, 3))
+
+        # Moves and removals off the edges keep the bounds known without a query
+        map.patch_element(elements[4].id, x=30)
+        map.remove_element(elements[5].id)
+        self.assertIsNotNone(map._bounds)
+        self.assertEqual(map.bounds().element_rect, (-2, -4, 30, 3))
+
+        # Rolled back objects are not in the bounds
+        with self.assertRaises(RuntimeError):
+            with map.transaction():
+                map.create_text("test-text", "foo bar", -100, 200)
+                raise RuntimeError()
+        self.assertEqual(map.bounds().text_rect, (100, 200, 100, 200))
@@ -0,0 +1,111 @@
+from map_store.store import MapStore
+from map.entity import Map
+from map.types import ElementNotFoundException
+from map.writer import MapWriter
+from pathlib import Path
+import shutil
+from threading import Event, current_thread, main_thread
+import unittest
+from uuid import uuid4
+
+testdata_path_prefix = "./src/tests/testdata-"
+schema_path = "./src/map_store/schema.sql"
+init_path = "./src/map_store/init.sql"
+
+
+class TestMapWriter(unittest.TestCase):
+    def setUp(self):
+        self.test_path = testdata_path_prefix + str(uuid4())
+        self.testdata_dir = Path(self.test_path)
+        self.store = MapStore(path=self.test_path,
+                              init_path=init_path, schema_path=schema_path)
+        self.map = self.store.create_map("secret-name", "test-map")
+        self.writer = MapWriter(self.map)
+
+    def tearDown(self):
+        self.writer.close()
+        self.store.close()
+        if self.testdata_dir.exists():
+            shutil.rmtree(self.testdata_dir)
+        return super().tearDown()
+
+    def test_writes_in_order(self):
+        created = self.writer.submit(Map.create_text, "Text", "Value", 0, 0)
+        text_id = created.result().id
+        futures = [self.writer.submit(Map.patch_text, text_id, name=f"Name {i}")
+                   for i in range(20)]
+        self.writer.flush()
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(self.map.get_text(text_id).name, "Name 19")
+
+    def test_failure_in_future(self):
+        failed = self.writer.submit(Map.patch_element, 1, name="Missing")
+        created = self.writer.submit(Map.create_text, "Text", "Value", 0, 0)
+        with self.assertRaises(ElementNotFoundException):
+            failed.result()
+        # Later modifications are not affected
+        self.assertEqual(created.result().name, "Text")
+        self.assertEqual(len(self.map.get_text_list()), 1)
+
+    def test_changes_on_writer_thread(self):
+        deliveries = []
+        self.writer.subscribe(lambda changes: deliveries.append(
+            (current_thread(), [change.kind for change in changes])))
+        self.writer.submit(Map.create_texts, [
+            {"name": "A", "value": "A", "x": 0, "y": 0, "color": "#000", "font_size": 24, "rotation": 0},
+            {"name": "B", "value": "B", "x": 1, "y": 0, "color": "#000", "font_size": 24, "rotation": 0}
+        ])
+        self.writer.flush()
+        [(thread, kinds)] = deliveries
+        self.assertIsNot(thread, main_thread())
+        self.assertEqual(kinds, ["created", "created"])
+
+    def test_read_during_write(self):
+        committed = []
+        self.writer.subscribe(committed.append)
+        started, release = Event(), Event()
+
+        def slow_write(map: Map):
+            map.create_text("Text", "Value", 0, 0)
+            started.set()
+            release.wait(5)
+
+        written = self.writer.submit(slow_write)
+        self.assertTrue(started.wait(5))
+        # The map is read without waiting, the text is not committed yet
+        self.assertEqual(self.map.get_text_list(), [])
+        self.assertFalse(written.done())
+        release.set()
+        written.result()
+        [changes] = committed
+        self.map.apply_changes(changes)
+        self.assertEqual(len(self.map.get_text_list()), 1)
+
+    def test_apply_changes(self):
+        committed = []
+        self.writer.subscribe(committed.append)
+        kept = self.map.create_text("Kept", "Value", 0, 0)
+        removed = self.map.create_text("Removed", "Value", 5, 5)
+        self.assertEqual(self.map.bounds().text_rect, (0, 0, 5, 5))
+
+        self.writer.submit(Map.patch_text, kept.id, name="Renamed", x=2)
+        self.writer.submit(Map.remove_text, removed.id)
+        created = self.writer.submit(Map.create_text, "Created", "Value", 1, 1).result()
+        # The writer does not touch the objects of the map
+        self.assertEqual(kept.name, "Kept")
+
+        for changes in committed:
+            self.map.apply_changes(changes)
+        self.assertEqual(kept.name, "Renamed")
+        self.assertIs(self.map.get_text(kept.id), kept)
+        self.assertEqual(sorted(text.id for text in self.map.get_text_list()),
+                         [kept.id, created.id])
+        self.assertEqual(self.map.bounds().text_rect, (1, 0, 2, 1))
+
+    def test_close_keeps_cache(self):
+        asset = self.map.create_asset("test", b"data")
+        self.writer.submit(Map.create_text, "Text", "Value", 0, 0).result()
+        self.writer.close()
+        # Only the connection of the writer is closed
+        self.assertEqual(self.map.asset_cache.get(asset.id), b"data")
+        self.assertEqual(len(self.map.get_text_list()), 1)
@@ -92,6 +92,13 @@ class BaseWindow(QtWidgets.QWidget):  # MARK: Base window
         if self.current_view:
             self.current_view.close()
 
+    def closeEvent(self, event):
+        # Run view teardown when the window is closed, so pending edits are written
+        if self.current_view:
+            self.current_view.close()
+            self.current_view = None
+        super().closeEvent(event)
+
     # MARK: Editor view
     def open_editor_view(self, map: Map):
         """Open the editor view inside the window.
@@ -0,0 +1,127 @@
+from functools import lru_cache
+from hashlib import sha256
+from mmap import mmap, ACCESS_READ
+from os.path import abspath
+from pathlib import Path
+from typing import Dict, List
+from PySide6 import QtCore, QtGui
+from ui.image_decoder import decode_scaled_image
+
+
+BUILTIN_IMAGES = {  # Default images in the image picker
+    "Camp": abspath("./ui/images/Camp.jpg"),
+    "Corner": abspath("./ui/images/Corner.jpg"),
+    "Straight": abspath("./ui/images/Straight.jpg"),
+    "Prize Room": abspath("./ui/images/Prize_room.jpg"),
+    "3 Point Intersection": abspath("./ui/images/3-point-intersection.jpg"),
+    "Straight Infinite Stairs": abspath("./ui/images/Straight_infinite_stairs.jpg")
+}
+THUMBNAIL_SIZE = 24  # Width and height of the thumbnails in the image picker
+
+
+class BuiltinAsset:  # MARK: BuiltinAsset
+    """An image shipped with the application, memory-mapped from its file.
+
+    Attributes:
+        name (str): The name of the image, also its key in the pack.
+        path (Path): The file of the image.
+        hash (str): The SHA-256 hex digest of the raw bytes, same as the hash of an asset in a map.
+        _mapping (mmap): The read-only mapping of the file.
+        _thumbnail (QtGui.QIcon | None): The decoded thumbnail, once created.
+    """
+    name: str
+    path: Path
+    hash: str
+    _mapping: mmap
+    _thumbnail: QtGui.QIcon | None
+
+    def __init__(self, name: str, path: Path):
+        """Constructor of the built-in asset. Maps the file and hashes its bytes.
+
+        Args:
+            name (str): The name of the image.
+            path (Path): The file of the image.
+        """
+        self.name = name
+        self.path = path
+        with open(path, "rb") as file:
+            self._mapping = mmap(file.fileno(), 0, access=ACCESS_READ)
+        self.hash = sha256(self._mapping).hexdigest()
+        self._thumbnail = None
+
+    @property
+    def data(self) -> memoryview:
+        """The raw bytes of the image, read from the mapping without copying.
+
+        Returns:
+            memoryview: The raw bytes.
+        """
+        return memoryview(self._mapping)
+
+    def thumbnail(self) -> QtGui.QIcon:
+        """Get the thumbnail of the image, decoded on first use. Must be called in the GUI thread.
+
+        Returns:
+            QtGui.QIcon: The thumbnail.
+        """
+        if self._thumbnail is None:
+            image = decode_scaled_image(
+                bytes(self.data), QtCore.QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+            self._thumbnail = QtGui.QIcon(QtGui.QPixmap.fromImage(image))
+        return self._thumbnail
+
+
+class BuiltinAssetPack:  # MARK: BuiltinAssetPack
+    """The images shipped with the application, shared by all maps and views.
+
+    Attributes:
+        assets (List[BuiltinAsset]): The images, in picker order.
+        _by_name (Dict[str, BuiltinAsset]): The images by name.
+        _by_hash (Dict[str, BuiltinAsset]): The images by content hash.
+    """
+    assets: List[BuiltinAsset]
+    _by_name: Dict[str, BuiltinAsset]
+    _by_hash: Dict[str, BuiltinAsset]
+
+    def __init__(self, images: Dict[str, str]):
+        """Constructor of the asset pack. Image files that do not exist are left out.
+
+        Args:
+            images (Dict[str, str]): The paths of the image files by name.
+        """
+        self.assets = [BuiltinAsset(name, Path(path))
+                       for name, path in images.items() if Path(path).is_file()]
+        self._by_name = {asset.name: asset for asset in self.assets}
+        self._by_hash = {asset.hash: asset for asset in self.assets}
+
+    def get(self, name: str) -> BuiltinAsset | None:
+        """Get an image by name.
+
+        Args:
+            name (str): The name of the image.
+
+        Returns:
+            BuiltinAsset | None: The image, or None when not in the pack.
+        """
+        return self._by_name.get(name)
+
+    def find(self, asset_hash: str | None) -> BuiltinAsset | None:
+        """Get an image by the content hash of its bytes.
+
+        Args:
+            asset_hash (str | None): The SHA-256 hex digest of the bytes.
+
+        Returns:
+            BuiltinAsset | None: The image, or None when not in the pack.
+        """
+        return self._by_hash.get(asset_hash)
+
+
+@lru_cache(maxsize=None)
+def builtin_asset_pack() -> BuiltinAssetPack:
+    """Get the built-in images, loaded once per process on first use.
+
+    Returns:
+        BuiltinAssetPack: The shared asset pack.
+    """
+    return BuiltinAssetPack(BUILTIN_IMAGES)
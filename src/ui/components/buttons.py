@@ -206,14 +206,17 @@ class StandardButtonWidget(QtWidgets.QPushButton):
 class SelectFileEvent:
     file: Path
     name: str
-    data: bytes
 
     def __init__(self, file_path):
-        # TODO: Handle read issue here?
         self.file = Path(file_path)
-        self.data = self.file.read_bytes()
         self.name = self.file.name
 
+    @property
+    def data(self) -> bytes:
+        # Read on access, receivers that only need the file do not load it
+        # TODO: Handle read issue here?
+        return self.file.read_bytes()
+
 
 class ImportMapButton(StandardButtonWidget):
     """An icon button which allows the user to pick a map file to import. 
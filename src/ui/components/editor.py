@@ -1,12 +1,14 @@
 from dataclasses import dataclass
 from copy import deepcopy
 from PySide6 import QtWidgets, QtGui, QtCore
-from typing import List, Literal, Union
+from typing import Callable, Dict, Hashable, List, Literal, Set, Tuple, Union
 from shiboken6 import isValid
 from map.types import Element
-from map.types import MapText
+from map.types import MapBounds, MapText
 from ui.components.editor_object import EditorObject
-from ui.components.typography import GraphicsLabel
+from ui.components.typography import GraphicsLabel, paint_static_label
+from ui.image_decoder import ImageDecoder
+from ui.pixmap_cache import PixmapCache
 
 
 @dataclass
@@ -52,47 +54,69 @@ class RenderingException(Exception):
 
 class TileWidget(EditorObject):  # MARK: Tile
     """A single tile element on the map.
+
+    Attributes:
+        is_preview (bool): Only render the contents to preview final map
+        signature (tuple): The rendered data of the element, used to skip re-rendering unchanged tiles.
+        name_label (str | None): The name label in the top left corner, painted by the tile.
+        position_label (str | None): The position label in the bottom right corner, painted by the tile.
+        content_rotation (int): The rotation of the background image.
+        background_item (QtWidgets.QGraphicsPixmapItem | None): The background image, once it is available.
     """
     is_preview: bool
+    signature: tuple = ()
+    name_label: str | None
+    position_label: str | None
+    content_rotation: int
+    background_item: QtWidgets.QGraphicsPixmapItem | None
 
-    def __init__(self, *args, tile_id: int, background_image: bytes | None = None, background_color: str | None = None, rotation: int = 0, is_preview: bool):
+    def __init__(self, *args, tile_id: int, background_pixmap: QtGui.QPixmap | None = None, background_scale: float = 1, background_color: str | None = None, rotation: int = 0, is_preview: bool, name_label: str | None = None, position_label: str | None = None):
         """Constructor of the tile element to create a new tile to be rendered.
 
         Args:
             tile_id (int): The id of the element to render.
-            background_image (bytes | None): The raw bytes of the element background. Defaults to None.
+            background_pixmap (QtGui.QPixmap | None): The element background. Defaults to None.
+            background_scale (float): Scale of the background to cover the tile, above 1 for mip levels. Defaults to 1.
             rotation (int): The rotation of the element's contents. Defaults to 0.
+            name_label (str | None): The name label of the tile. Defaults to None.
+            position_label (str | None): The position label of the tile. Defaults to None.
         """
         super().__init__(*args, object_id=tile_id, type="element")
         self.setFlag(QtWidgets.QGraphicsItem.ItemClipsChildrenToShape, True)
         self.is_preview = is_preview
+        self.name_label = name_label
+        self.position_label = position_label
+        self.content_rotation = rotation
+        self.background_item = None
 
-        # Render background or default color
-        if background_image:
-            # Create pixmap for background
-            img = QtGui.QImage.fromData(background_image)
-            pixmap = QtGui.QPixmap.fromImage(img)
-            scaled_pixmap = pixmap.scaled(
-                self.rect().size().toSize(),
-                QtCore.Qt.KeepAspectRatioByExpanding,
-                QtCore.Qt.SmoothTransformation
-            )
+        # Background color, also the placeholder while the background image is decoded
+        self.setBrush(QtGui.QBrush(
+            QtGui.QColor(background_color or "#8F9092")))
+        if background_pixmap:
+            self.setBackground(background_pixmap, background_scale)
 
+    def setBackground(self, background_pixmap: QtGui.QPixmap, background_scale: float = 1):
+        """Show a background image instead of the background color.
+
+        Args:
+            background_pixmap (QtGui.QPixmap): The element background.
+            background_scale (float): Scale of the background to cover the tile, above 1 for mip levels. Defaults to 1.
+        """
+        if self.background_item is None:
             # Create item for pixmap
-            pixmap_child_item = QtWidgets.QGraphicsPixmapItem(
-                scaled_pixmap, parent=self)
-            pixmap_child_item.setFlag(
+            self.background_item = QtWidgets.QGraphicsPixmapItem(parent=self)
+            self.background_item.setFlag(
                 QtWidgets.QGraphicsItem.ItemStacksBehindParent, True)
+        self.background_item.setPixmap(background_pixmap)
+        self.setBrush(QtCore.Qt.BrushStyle.NoBrush)
 
-            # Rotate along tile center
-            tile_center = self.boundingRect().center()
-            pix_center = pixmap_child_item.boundingRect().center()
-            pixmap_child_item.setPos(tile_center - pix_center)
-            pixmap_child_item.setTransformOriginPoint(pix_center)
-            pixmap_child_item.setRotation(rotation)
-        else:
-            self.setBrush(QtGui.QBrush(
-                QtGui.QColor(background_color or "#8F9092")))
+        # Rotate along tile center
+        tile_center = self.boundingRect().center()
+        pix_center = self.background_item.boundingRect().center()
+        self.background_item.setPos(tile_center - pix_center)
+        self.background_item.setTransformOriginPoint(pix_center)
+        self.background_item.setRotation(self.content_rotation)
+        self.background_item.setScale(background_scale)
 
     def paint(self, painter, option, widget):
         # Create tile border
@@ -105,6 +129,15 @@ class TileWidget(EditorObject):  # MARK: Tile
 
         super().paint(painter, option, widget)
 
+        # Labels are painted on top of the tile, with static text shared between tiles
+        rect = self.rect()
+        if self.name_label is not None:
+            paint_static_label(painter, self.name_label,
+                               rect.topLeft() + QtCore.QPointF(10, 10))
+        if self.position_label is not None:
+            paint_static_label(painter, self.position_label,
+                               rect.bottomRight() - QtCore.QPointF(10, 10), from_bottom_right=True)
+
 
 class TextWidget(EditorObject):  # MARK: Text
     """A single text object rendered on the map.
@@ -113,10 +146,12 @@ class TextWidget(EditorObject):  # MARK: Text
         text_label (GraphicsLabel): The graphics item that handles text rendering
         text (MapText): The text form information
         is_preview (bool): Only render the contents to preview final map
+        signature (tuple): The rendered data of the text, used to skip re-rendering unchanged text.
     """
     text_label: GraphicsLabel
     text: MapText
     is_preview: bool
+    signature: tuple = ()
 
     def __init__(self, *args, text: MapText, is_preview: bool):
         super().__init__(*args, object_id=text.id, type="text")
@@ -157,6 +192,21 @@ class TextWidget(EditorObject):  # MARK: Text
 
 
 ObjectsList = List[Union[Element, MapText]]
+ObjectKey = Tuple[str, int]  # (type, id) of an object
+ChunkKey = Tuple[int, int]  # (x, y) of a chunk, in chunks
+BackgroundRequest = Tuple[Hashable, int]  # (image key, size) of a background being decoded
+
+CHUNK_SIZE = 16  # Width and height of a chunk, in tiles
+CHUNK_MARGIN = 1  # Chunks around the viewport that are instantiated too
+
+# Level of detail, by how far the view is zoomed out
+LevelOfDetail = Literal["full", "reduced", "chunk"]
+LOD_REDUCED_SCALE = 0.1  # Below this labels and borders are hidden and backgrounds use mip levels
+LOD_CHUNK_SCALE = 0.03  # Below this each chunk is painted as a single image
+MIP_SIZE = 32  # Size of tile backgrounds with reduced detail, in pixels
+CHUNK_TILE_SIZE = 8  # Size of a tile in the chunk images, in pixels
+GRID_MIN_SPACING = 8  # Minimum distance between grid lines on screen, in pixels
+SCENE_PADDING = 32  # Space around the map content and the viewport in the scene, in tiles
 
 
 # NOTE: We need this here to avoid a circular dependency for now. Move to own file later.
@@ -180,9 +230,25 @@ class EditorGraphicsView(QtWidgets.QGraphicsView):  # MARK: Editor
         moveTextEvent (QSignal): Signal when text is to be moved.
         focusObjectEvent (QSignal): Signal when a specific object gains focus.
         objects (ObjectsList): List of objects to render
-        objectWidgets (List[Union[TileWidget, TextWidget]]): QT constructs used for rendering
+        objectsByKey (Dict[ObjectKey, Union[Element, MapText]]): The objects to render by (type, id)
+        objectWidgets (Dict[ObjectKey, Union[TileWidget, TextWidget]]): QT constructs used for rendering by (type, id)
         focusedObjectWidget (TileWidget | TextWidget | None): The current widget in focus, if something is in focus
         focusedObject (MapText | Element | None): The data of the object in focus, if something is in focus.
+        pixmapCache (PixmapCache): Decoded and scaled tile backgrounds, shared by tiles with the same image.
+        objectsByChunk (Dict[ChunkKey, ObjectsList]): The objects by the chunk they are in.
+        visibleChunks (Set[ChunkKey]): The chunks whose objects currently have widgets.
+        lod (LevelOfDetail): The level of detail of the current zoom.
+        chunkItems (Dict[ChunkKey, Tuple[tuple, QtWidgets.QGraphicsPixmapItem]]): Signatures and pre-rendered
+            images of the chunks when zoomed far out.
+        gridPen (QtGui.QPen): The pen of the background grid.
+        renderSource (Callable[[], ObjectsList] | None): Loads the objects for the scheduled render, if one is scheduled.
+        renderTimer (QtCore.QTimer): Runs the scheduled render on the next event loop iteration.
+        imageDecoder (ImageDecoder): Decodes tile backgrounds outside the GUI thread.
+        pendingBackgrounds (Dict[BackgroundRequest, Set[Hashable]]): Keys of the tiles, and ("chunk", chunk)
+            of the chunk images, waiting for each background being decoded.
+        reconcileScheduled (bool): If a reconcile of the visible chunks is scheduled.
+        reconcileTimer (QtCore.QTimer): Runs the scheduled reconcile on the next event loop iteration.
+        contentRect (QtCore.QRectF): The area of the map content in scene coordinates.
 
     Raises:
         RenderingException: For unexpected issues while rendering. Blocking.
@@ -197,20 +263,53 @@ class EditorGraphicsView(QtWidgets.QGraphicsView):  # MARK: Editor
     removeElementEvent = QtCore.Signal(int)
     removeTextEvent = QtCore.Signal(int)
     objects: ObjectsList = []
-    objectWidgets: List[Union[TileWidget, TextWidget]] = []
+    objectsByKey: Dict[ObjectKey, Union[Element, MapText]]
+    objectWidgets: Dict[ObjectKey, Union[TileWidget, TextWidget]]
     focusedObjectWidget: TileWidget | TextWidget | None = None
     focusedObject: MapText | Element | None = None
     is_preview: bool
     clipboard: MapText | Element | None = None
-
-    def __init__(self, is_preview: bool = False):
+    pixmapCache: PixmapCache
+    objectsByChunk: Dict[ChunkKey, ObjectsList]
+    visibleChunks: Set[ChunkKey]
+    lod: LevelOfDetail
+    chunkItems: Dict[ChunkKey, Tuple[tuple, QtWidgets.QGraphicsPixmapItem]]
+    gridPen: QtGui.QPen
+    renderSource: Callable[[], ObjectsList] | None = None
+    renderTimer: QtCore.QTimer
+    imageDecoder: ImageDecoder
+    pendingBackgrounds: Dict[BackgroundRequest, Set[Hashable]]
+    reconcileScheduled: bool = False
+    reconcileTimer: QtCore.QTimer
+    contentRect: QtCore.QRectF
+
+    def __init__(self, is_preview: bool = False, pixmap_cache: PixmapCache | None = None):
         """Constructor of the editor. Styles the graphics view and scales it.
 
         Args:
             is_preview (bool, optional): If this graphics view should be preview only. Defaults to False.
+            pixmap_cache (PixmapCache | None, optional): Cache for tile backgrounds. Defaults to a new cache.
         """
         super().__init__()
         self.is_preview = is_preview
+        self.objectWidgets = {}
+        self.objectsByKey = {}
+        self.objectsByChunk = {}
+        self.visibleChunks = set()
+        self.chunkItems = {}
+        self.pixmapCache = pixmap_cache if pixmap_cache is not None else PixmapCache()
+        self.pendingBackgrounds = {}
+        self.imageDecoder = ImageDecoder(parent=self)
+        self.imageDecoder.imageDecoded.connect(self._backgroundDecoded)
+        # Timers owned by the view, so they can be stopped when it is closed
+        self.renderTimer = QtCore.QTimer(self)
+        self.renderTimer.setSingleShot(True)
+        self.renderTimer.setInterval(0)
+        self.renderTimer.timeout.connect(self._flushRender)
+        self.reconcileTimer = QtCore.QTimer(self)
+        self.reconcileTimer.setSingleShot(True)
+        self.reconcileTimer.setInterval(0)
+        self.reconcileTimer.timeout.connect(self._flushReconcile)
 
         # Styling & QT configs
         self.setScene(QtWidgets.QGraphicsScene(self))
@@ -218,9 +317,11 @@ class EditorGraphicsView(QtWidgets.QGraphicsView):  # MARK: Editor
         self.setDragMode(QtWidgets.QGraphicsView.DragMode.ScrollHandDrag)
         self.setAcceptDrops(True)
         self.setBackgroundBrush(QtGui.QBrush(QtGui.QColor("#393939")))
+        self.gridPen = QtGui.QPen(QtGui.QColor(80, 80, 80))  # dark gray
+        self.gridPen.setStyle(QtCore.Qt.PenStyle.DashLine)
 
-        # Large space for "infinite" area
-        self.setSceneRect(-10000, -10000, 20000, 20000)
+        # The scene covers the map and grows when panning, for an "infinite" area
+        self.contentRect = QtCore.QRectF()
         if not is_preview:
             self.setHorizontalScrollBarPolicy(
                 QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -235,6 +336,7 @@ class EditorGraphicsView(QtWidgets.QGraphicsView):  # MARK: Editor
         self.min_scale = 0.01
         self.max_scale = 5.0
         self.scale(self.scale_factor, self.scale_factor)
+        self.lod = self._levelOfDetail()
 
         # Coordinate label
         self.coord_label = QtWidgets.QLabel("x: 0, y: 0", self)
@@ -278,6 +380,12 @@ class EditorGraphicsView(QtWidgets.QGraphicsView):  # MARK: Editor
                               self.coord_label.height() - 5)
         self.coord_label.resize(self.viewport().width(), 20)
         super().resizeEvent(event)
+        self._viewChanged()
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        # Instantiate the chunks scrolled into view
+        super().scrollContentsBy(dx, dy)
+        self._viewChanged()
 
     def wheelEvent(self, event: QtGui.QWheelEvent):
         # Handle manipulating the map zoom
@@ -292,6 +400,7 @@ class EditorGraphicsView(QtWidgets.QGraphicsView):  # MARK: Editor
 
         self.scale(factor, factor)
         self.scale_factor = new_scale
+        self._viewChanged()
 
     def keyPressEvent(self, event: QtGui.QKeyEvent):  # MARK: Keyboard
         if event.key() == QtCore.Qt.Key_Escape:
@@ -335,24 +444,25 @@ class EditorGraphicsView(QtWidgets.QGraphicsView):  # MARK: Editor
         if self.is_preview:
             return
 
-        left = int(rect.left()) - (int(rect.left()) % self.element_size)
-        top = int(rect.top()) - (int(rect.top()) % self.element_size)
-
-        pen = QtGui.QPen(QtGui.QColor(80, 80, 80))  # dark gray
-        pen.setStyle(QtCore.Qt.PenStyle.DashLine)
-        painter.setPen(pen)
-
-        x = left
-        while x < rect.right():
-            painter.drawLine(QtCore.QPointF(x, rect.top()),
-                             QtCore.QPointF(x, rect.bottom()))
-            x += self.element_size
-
-        y = top
-        while y < rect.bottom():
-            painter.drawLine(QtCore.QPointF(rect.left(), y),
-                             QtCore.QPointF(rect.right(), y))
-            y += self.element_size
+        # Lines are skipped when zoomed out, so the grid does not get denser on screen
+        step = self._gridStep()
+        left = int(rect.left()) - (int(rect.left()) % step)
+        top = int(rect.top()) - (int(rect.top()) % step)
+
+        # Draw all lines with a single call
+        lines = [QtCore.QLineF(x, rect.top(), x, rect.bottom())
+                 for x in range(left, int(rect.right()) + 1, step)]
+        lines.extend(QtCore.QLineF(rect.left(), y, rect.right(), y)
+                     for y in range(top, int(rect.bottom()) + 1, step))
+        painter.setPen(self.gridPen)
+        painter.drawLines(lines)
+
+    def _gridStep(self) -> int:
+        # Distance between grid lines, doubled until they are far enough apart on screen
+        step = self.element_size
+        while step * self.scale_factor < GRID_MIN_SPACING:
+            step *= 2
+        return step
 
     def _canDrag(self, event: QtGui.QDragEnterEvent | QtGui.QDragMoveEvent):
         # Handle dropped elements
@@ -396,8 +506,8 @@ class EditorGraphicsView(QtWidgets.QGraphicsView):  # MARK: Editor
                 target_text = int(event_mime_text.split(" ")[2])
 
                 # Offset point to text center
-                text_widget: TextWidget | None = list(filter(
-                    lambda obj: obj.id == target_text and obj.type == "text", self.objectWidgets))[0]
+                text_widget: TextWidget | None = self.objectWidgets.get(
+                    ("text", target_text))
                 if not text_widget:
                     raise RenderingException(
                         "ERROR: Unable to resolve widget for text to be moved!")
@@ -440,105 +550,352 @@ class EditorGraphicsView(QtWidgets.QGraphicsView):  # MARK: Editor
 
             self.focusedObjectWidget = object
             self.focusedObjectWidget.setFocusRing(True)  # Make ring visible
-            self.focusedObject = list(filter(
-                lambda obj: obj.id == object.id and obj.type == object.type, self.objects))[0]
+            self.focusedObject = self.objectsByKey.get((object.type, object.id))
             if not self.focusedObject:
                 raise RenderingException(
                     "ERROR: Object to focus is not in objects cache! Cannot focus.")
             self.focusObjectEvent.emit(FocusEvent(object.id, object.type))
 
-    def _render_element_object(self, element: Element) -> bool:  # MARK: Render
+    def _levelOfDetail(self) -> LevelOfDetail:
+        # Level of detail for the current zoom
+        if self.scale_factor < LOD_CHUNK_SCALE:
+            return "chunk"
+        if self.scale_factor < LOD_REDUCED_SCALE:
+            return "reduced"
+        return "full"
+
+    def _hideDetails(self) -> bool:
+        # Labels and borders are not rendered in preview or when zoomed out
+        return self.is_preview or self.lod != "full"
+
+    def _objectSignature(self, object: Element | MapText) -> tuple:
+        # Everything that changes how an object is rendered
+        if object.type == "element":
+            return (object.x, object.y, object.name, object.rotation,
+                    object.background_image.id if object.background_image else None,
+                    object.background_color, self.is_preview, self.lod)
+        return (object.x, object.y, object.value, object.font_size,
+                object.color, object.rotation, self.is_preview, self.lod)
+
+    def _backgroundRequest(self, element: Element, size: int) -> BackgroundRequest | None:
+        # Backgrounds are keyed by content, so tiles with the same image share it
+        background_image = element.background_image
+        if background_image is None:
+            return None
+        return (background_image.hash or f"asset-{background_image.id}", size)
+
+    def _tileBackgroundSize(self) -> int:
+        # Zoomed out tiles use a low resolution mip level of the background
+        return self.element_size if self.lod == "full" else MIP_SIZE
+
+    def _background_pixmap(self, element: Element, size: int, waiter: Hashable) -> QtGui.QPixmap | None:
+        # Get the decoded background from the cache. If it is not decoded yet, it is queued for
+        # the worker threads and the waiter gets it when done.
+        request = self._backgroundRequest(element, size)
+        if request is None:
+            return None
+        pixmap = self.pixmapCache.get(*request)
+        if pixmap is None:
+            self.pendingBackgrounds.setdefault(request, set()).add(waiter)
+            if not self.imageDecoder.pending(request):
+                self.imageDecoder.request(request, element.background_image.data,
+                                          QtCore.QSize(size, size))
+        return pixmap
+
+    def _backgroundDecoded(self, request: BackgroundRequest, image: QtGui.QImage):
+        # Upgrade the placeholders waiting for a decoded background
+        waiters = self.pendingBackgrounds.pop(request, set())
+        if image.isNull():
+            return
+        pixmap = self.pixmapCache.put_image(*request, image)
+        for waiter in waiters:
+            if waiter[0] == "chunk":
+                # Chunk images are painted again on the next reconcile
+                if waiter[1] in self.chunkItems:
+                    self.chunkItems[waiter[1]] = (None, self.chunkItems[waiter[1]][1])
+                    self._scheduleReconcile()
+                continue
+
+            # The tile may have been re-rendered with another background since
+            widget = self.objectWidgets.get(waiter)
+            object = self.objectsByKey.get(waiter)
+            size = self._tileBackgroundSize()
+            if widget is not None and object is not None and self._backgroundRequest(object, size) == request:
+                widget.setBackground(pixmap, self.element_size / size)
+
+    def _releaseBackgroundWaiters(self, waiters: Set[Hashable]):
+        # Cancel the decoding of backgrounds no longer waited for
+        for request in list(self.pendingBackgrounds):
+            self.pendingBackgrounds[request] -= waiters
+            if not self.pendingBackgrounds[request]:
+                del self.pendingBackgrounds[request]
+                self.imageDecoder.cancel(request)
+
+    def _scheduleReconcile(self):
+        # Reconcile the visible chunks on the next event loop iteration
+        if not self.reconcileScheduled:
+            self.reconcileScheduled = True
+            self.reconcileTimer.start()
+
+    def _flushReconcile(self):
+        self.reconcileScheduled = False
+        self._reconcile()
+
+    def shutdownDecoder(self):
+        """Stop decoding backgrounds, called when the editor is closed.
+        The scheduled render and reconcile are dropped first, they would request backgrounds.
+        """
+        self.renderTimer.stop()
+        self.renderSource = None
+        self.reconcileTimer.stop()
+        self.reconcileScheduled = False
+        self.imageDecoder.shutdown()
+        self.pendingBackgrounds = {}
+
+    def _render_chunk_image(self, chunk: ChunkKey, elements: List[Element]) -> QtWidgets.QGraphicsPixmapItem:
+        # Paint the tiles of a chunk into a single image, used when zoomed far out
+        image = QtGui.QImage(CHUNK_SIZE * CHUNK_TILE_SIZE, CHUNK_SIZE * CHUNK_TILE_SIZE,
+                             QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(QtCore.Qt.GlobalColor.transparent)
+        painter = QtGui.QPainter(image)
+        for element in elements:  # Later elements are painted on top, like the tiles
+            tile_rect = QtCore.QRect((element.x - chunk[0] * CHUNK_SIZE) * CHUNK_TILE_SIZE,
+                                     (element.y - chunk[1] * CHUNK_SIZE) * CHUNK_TILE_SIZE,
+                                     CHUNK_TILE_SIZE, CHUNK_TILE_SIZE)
+            background_pixmap = self._background_pixmap(
+                element, CHUNK_TILE_SIZE, ("chunk", chunk))
+            if background_pixmap:
+                painter.drawPixmap(tile_rect, background_pixmap)
+            else:
+                painter.fillRect(tile_rect, QtGui.QColor(
+                    element.background_color or "#8F9092"))
+        painter.end()
+
+        chunk_item = QtWidgets.QGraphicsPixmapItem(QtGui.QPixmap.fromImage(image))
+        chunk_item.setPos(chunk[0] * CHUNK_SIZE * self.element_size,
+                          chunk[1] * CHUNK_SIZE * self.element_size)
+        chunk_item.setScale(self.element_size / CHUNK_TILE_SIZE)
+        chunk_item.setZValue(1)
+        self.scene().addItem(chunk_item)
+        return chunk_item
+
+    def _render_element_object(self, element: Element) -> TileWidget:  # MARK: Render
         # Add grid elements to the map
         # Create tile
+        background_size = self._tileBackgroundSize()
+        show_labels = not self._hideDetails()  # Only when we are editing and zoomed in
         tile = TileWidget(element.x * self.element_size,  # x
                           element.y * self.element_size,  # y
                           self.element_size,  # w
                           self.element_size,  # h
                           tile_id=element.id,
-                          background_image=element.background_image.data if element.background_image != None else None,
+                          background_pixmap=self._background_pixmap(
+                              element, background_size, ("element", element.id)),
+                          background_scale=self.element_size / background_size,
                           background_color=element.background_color,
                           rotation=element.rotation,
-                          is_preview=self.is_preview)
+                          is_preview=self._hideDetails(),
+                          name_label=(element.name or "") if show_labels else None,
+                          position_label=f"x: {element.x}, y: {element.y}" if show_labels else None)
 
         tile.focusEvent.connect(
             lambda give_focus: self._setFocusedObjectWidget(tile if give_focus else None))
         self.scene().addItem(tile)
-        self.objectWidgets.append(tile)
+        self.objectWidgets[("element", element.id)] = tile
 
-        # Update in focus tile
-        gave_focus = False
-        if self.focusedObject != None and element.id == self.focusedObject.id and self.focusedObject.type == "element":
-            gave_focus = True
-            self._setFocusedObjectWidget(tile)
+        return tile
 
-        # Only render labels when we are editing
-        if not self.is_preview:
-            # Create tile name
-            label = GraphicsLabel(
-                text=element.name, backgroundColor="#000", color="white")
-            label.setParentItem(tile)
-            label.setPos(
-                (element.x * self.element_size) + 10,
-                (element.y * self.element_size) + 10
-            )
-
-            # Create tile position
-            label = GraphicsLabel(
-                text=f"x: {element.x}, y: {element.y}", backgroundColor="#000", color="white")
-            label.setParentItem(tile)
-            label_rect = label.boundingRect()
-            label.setPos(
-                (element.x * self.element_size) +
-                self.element_size - label_rect.width() - 10,
-                (element.y * self.element_size) +
-                self.element_size - label_rect.height() - 10
-            )
-
-        return gave_focus
-
-    def _render_text_object(self, text: MapText) -> bool:
+    def _render_text_object(self, text: MapText) -> TextWidget:
         # Create text widget
         text_widget = TextWidget(text.x,  # x
                                  text.y,  # y
                                  1,
                                  1,
                                  text=text,
-                                 is_preview=self.is_preview)
+                                 is_preview=self._hideDetails())
 
         self.scene().addItem(text_widget)
-        self.objectWidgets.append(text_widget)
-
-        # Update in focus text
-        gave_focus = False
-        if self.focusedObject != None and text.id == self.focusedObject.id and self.focusedObject.type == "text":
-            gave_focus = True
-            self._setFocusedObjectWidget(text_widget)
+        self.objectWidgets[("text", text.id)] = text_widget
 
         # Handle focus
         text_widget.focusEvent.connect(
             lambda: self._setFocusedObjectWidget(text_widget))
-        return gave_focus
+        return text_widget
+
+    def _keepFocus(self, widget: TileWidget | TextWidget):
+        # Move focus to the re-rendered widget of the focused object without a focus event,
+        # so the sidebars are not reset
+        if widget is self.focusedObjectWidget:
+            return
+        if self.focusedObjectWidget and isValid(self.focusedObjectWidget):
+            self.focusedObjectWidget.setFocusRing(False)
+        self.focusedObjectWidget = widget
+        widget.setFocusRing(True)
+        widget.setFocus(QtCore.Qt.FocusReason.OtherFocusReason)
+
+    def _objectChunk(self, object: Element | MapText) -> ChunkKey:
+        # Elements are positioned in tiles, text in scene coordinates
+        if object.type == "element":
+            return (int(object.x // CHUNK_SIZE), int(object.y // CHUNK_SIZE))
+        chunk_size = CHUNK_SIZE * self.element_size
+        return (int(object.x // chunk_size), int(object.y // chunk_size))
+
+    def _chunksInView(self) -> Set[ChunkKey]:
+        # Chunks that intersect the viewport, with a margin
+        chunk_size = CHUNK_SIZE * self.element_size
+        view_rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        left = int(view_rect.left() // chunk_size) - CHUNK_MARGIN
+        right = int(view_rect.right() // chunk_size) + CHUNK_MARGIN
+        top = int(view_rect.top() // chunk_size) - CHUNK_MARGIN
+        bottom = int(view_rect.bottom() // chunk_size) + CHUNK_MARGIN
+        return {(x, y) for x in range(left, right + 1) for y in range(top, bottom + 1)}
+
+    def setMapBounds(self, bounds: MapBounds):
+        """Fit the scene to the bounds of the map content, with padding.
+
+        Args:
+            bounds (MapBounds): The bounds of the map.
+        """
+        content_rect = QtCore.QRectF()
+        if bounds.element_rect is not None:
+            min_x, min_y, max_x, max_y = bounds.element_rect
+            content_rect = QtCore.QRectF(min_x * self.element_size, min_y * self.element_size,
+                                         (max_x - min_x + 1) * self.element_size,
+                                         (max_y - min_y + 1) * self.element_size)
+        if bounds.text_rect is not None:
+            # Text extends from its position, roughly a tile is reserved for it
+            min_x, min_y, max_x, max_y = bounds.text_rect
+            content_rect = content_rect.united(QtCore.QRectF(
+                min_x, min_y, max_x - min_x + self.element_size, max_y - min_y + self.element_size))
+        self.contentRect = content_rect
+        self._fitSceneRect()
+
+    def _fitSceneRect(self):
+        # Scene covers the content and the viewport with padding, shrinking when the content does
+        padding = SCENE_PADDING * self.element_size
+        view_rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        scene_rect = self.contentRect.united(view_rect).adjusted(
+            -padding, -padding, padding, padding)
+        if scene_rect != self.scene().sceneRect():
+            self.scene().setSceneRect(scene_rect)
+
+    def _growSceneRect(self):
+        # Grow the scene when the viewport gets close to its edges, so panning never stops
+        padding = SCENE_PADDING * self.element_size
+        view_rect = self.mapToScene(self.viewport().rect()).boundingRect()
+        scene_rect = self.scene().sceneRect()
+        if scene_rect.contains(view_rect.adjusted(-padding / 2, -padding / 2, padding / 2, padding / 2)):
+            return
+        self.scene().setSceneRect(scene_rect.united(
+            view_rect.adjusted(-padding, -padding, padding, padding)))
+
+    def _viewChanged(self):
+        # The visible area changed by scrolling, zooming or resizing
+        self._growSceneRect()
+        self._updateVisibleChunks()
+
+    def _updateVisibleChunks(self):
+        # Instantiate the chunks that came into view and release the ones that left it
+        chunks = self._chunksInView()
+        lod = self._levelOfDetail()
+        if chunks == self.visibleChunks and lod == self.lod:
+            return
+        self.visibleChunks = chunks
+        self.lod = lod
+        self._reconcile()
+
+    def _reconcile(self):
+        # Only objects in visible chunks have widgets, only changed objects are re-rendered
+        rendered_keys = set()
+        rendered_chunks = set()
+        for chunk in self.visibleChunks:
+            objects = self.objectsByChunk.get(chunk, ())
+
+            # Far out, the tiles of a chunk are a single image and only text has widgets
+            if self.lod == "chunk":
+                elements = [object for object in objects if object.type == "element"]
+                objects = [object for object in objects if object.type == "text"]
+                if elements:
+                    rendered_chunks.add(chunk)
+                    signature = tuple(self._objectSignature(element) for element in elements)
+                    rendered_signature, chunk_item = self.chunkItems.get(chunk, (None, None))
+                    if rendered_signature != signature:
+                        if chunk_item is not None:
+                            self.scene().removeItem(chunk_item)
+                        self.chunkItems[chunk] = (
+                            signature, self._render_chunk_image(chunk, elements))
+
+            for object in objects:
+                key = (object.type, object.id)
+                rendered_keys.add(key)
+                signature = self._objectSignature(object)
+                widget = self.objectWidgets.get(key)
+                if widget is not None and widget.signature == signature:
+                    continue
+                if widget is not None:
+                    self.scene().removeItem(widget)
+                widget = self._render_element_object(object) if object.type == "element" \
+                    else self._render_text_object(object)
+                widget.signature = signature
+
+        # Release the widgets of removed or hidden objects
+        released = [key for key in self.objectWidgets if key not in rendered_keys]
+        for key in released:
+            self.scene().removeItem(self.objectWidgets.pop(key))
+        released_chunks = [chunk for chunk in self.chunkItems if chunk not in rendered_chunks]
+        for chunk in released_chunks:
+            self.scene().removeItem(self.chunkItems.pop(chunk)[1])
+        if released or released_chunks:
+            self._releaseBackgroundWaiters(
+                set(released) | {("chunk", chunk) for chunk in released_chunks})
+
+        # A focused object out of view keeps focus, its widget gets it back when in view
+        if self.focusedObject != None:
+            widget = self.objectWidgets.get(
+                (self.focusedObject.type, self.focusedObject.id))
+            if widget is None:
+                self.focusedObjectWidget = None
+            else:
+                self._keepFocus(widget)
+
+    def requestRender(self, load_objects: Callable[[], ObjectsList]):
+        """Schedule a render for the next event loop iteration. Requests made before it runs are
+        merged into one render, with the objects loaded once when it runs.
+
+        Args:
+            load_objects (Callable[[], ObjectsList]): Method to load the objects to render.
+        """
+        scheduled = self.renderSource is not None
+        self.renderSource = load_objects
+        if not scheduled:
+            # The timer belongs to the view, so the render is dropped if the view is destroyed first
+            self.renderTimer.start()
+
+    def _flushRender(self):
+        # Run the scheduled render
+        load_objects, self.renderSource = self.renderSource, None
+        if load_objects is not None:
+            self.render(load_objects())
 
     def render(self, objects: ObjectsList) -> None:
-        # Clear the scene and canvas
-        self.scene().clear()
+        # Group the objects by chunk and reconcile the visible chunks with the scene
         self.objects = objects
-        self.objectWidgets = []
-        gave_focus = False
-
-        # Render all objects
+        self.objectsByKey = {}
+        self.objectsByChunk = {}
         for object in objects:
-            if object.type == "element":
-                did_focus = self._render_element_object(object)
-                if did_focus:
-                    gave_focus = True
-            elif object.type == "text":
-                did_focus = self._render_text_object(object)
-                if did_focus:
-                    gave_focus = True
-            else:
+            if object.type not in ("element", "text"):
                 raise RenderingException(object)
-
-        # If nothing gained focus, clear it
-        if not gave_focus:
+            self.objectsByKey[(object.type, object.id)] = object
+            self.objectsByChunk.setdefault(
+                self._objectChunk(object), []).append(object)
+        focused_object = self.objectsByKey.get(
+            (self.focusedObject.type, self.focusedObject.id)) if self.focusedObject != None else None
+
+        # Clear focus if the focused object is gone
+        if self.focusedObject != None and focused_object is None:
             self._setFocusedObjectWidget(None)
+        elif focused_object is not None:
+            self.focusedObject = focused_object
+
+        self.visibleChunks = self._chunksInView()
+        self._reconcile()
@@ -70,6 +70,7 @@ class EditorObject(QtCore.QObject, QtWidgets.QGraphicsRectItem):
 
     def setFocusRing(self, focused: bool):
         self.focused = focused
+        self.update()  # Widgets are no longer re-created on focus changes
 
     # Handle dragging to other position
     def mousePressEvent(self, event: QtWidgets.QGraphicsSceneMouseEvent):
@@ -1,21 +1,10 @@
 from PySide6 import QtWidgets, QtCore
-from os.path import abspath
-from pathlib import Path
-from typing import List
+from typing import Any, Dict, List
+from ui.asset_pack import builtin_asset_pack
 from ui.components.editor_sidebar import EditorSidebar
 from ui.components.inputs import InputGroupWidget, TextInputWidget, ImageFileInputWidget, DialInputWidget, StandardDropdownWidget, DropdownGroup, SelectedAction, ColorInputWidget
 from ui.components.buttons import DeleteButtonWidget, StandardButtonWidget
-from map.types import Element, ElementEditable, Asset
-
-default_images = {  # Default images in the image picker
-    "Camp": abspath("./ui/images/Camp.jpg"),
-    "Corner": abspath("./ui/images/Corner.jpg"),
-    "Straight": abspath("./ui/images/Straight.jpg"),
-    "Prize Room": abspath("./ui/images/Prize_room.jpg"),
-    "3 Point Intersection": abspath("./ui/images/3-point-intersection.jpg"),
-    "Straight Infinite Stairs": abspath("./ui/images/Straight_infinite_stairs.jpg")
-}
-
+from map.types import Element, ElementEditable, AssetInfo
 
 class EditElementEvent:
     id: int
@@ -26,6 +15,15 @@ class EditElementEvent:
         self.element_editable = element_editable
 
 
+class PatchElementEvent:
+    id: int
+    fields: dict
+
+    def __init__(self, element_id: int, fields: dict):
+        self.id = element_id
+        self.fields = fields
+
+
 class RemoveElementEvent:
     id: int
 
@@ -35,20 +33,24 @@ class RemoveElementEvent:
 
 class ElementPropertiesWidget(EditorSidebar):
     editElementEvent = QtCore.Signal(EditElementEvent)
+    patchElementEvent = QtCore.Signal(PatchElementEvent)
     removeElementEvent = QtCore.Signal(RemoveElementEvent)
     target_element: Element | None = None
+    edited_fields: Dict[str, Any]
     name_input: TextInputWidget
     background_input: ImageFileInputWidget
     delete_background_button: DeleteButtonWidget
     delete_button: StandardButtonWidget
     rotation_dial: DialInputWidget
     image_library_picker: StandardDropdownWidget
-    available_assets: List[Asset] = []
+    available_assets: List[AssetInfo] = []
+    assets_by_id: Dict[int, AssetInfo] = {}
     color_input: ColorInputWidget
 
     def setElement(self, element: Element | None):
         # Disable fields
         self.target_element = None
+        self.edited_fields = {}
 
         # Set values
         self.name_input.setDisabled(element is None)
@@ -80,48 +82,69 @@ class ElementPropertiesWidget(EditorSidebar):
         else:
             self.show()
 
-    def setAssets(self, assets: List[Asset]):
+    def setAssets(self, assets: List[AssetInfo]):
+        # Only the metadata is listed, picked assets are referenced by id
         self.available_assets = assets
+        self.assets_by_id = {asset.id: asset for asset in assets}
 
-    def _get_cached_asset(self, id: int) -> Asset | None:
-        for asset in self.available_assets:
-            if asset.id == id:
-                return asset
+    def _get_cached_asset(self, id: int) -> AssetInfo | None:
+        return self.assets_by_id.get(id)
 
-        return None
+    def _patch(self, fields: dict):
+        # The element is shared with the map, it is updated once the edit has been written
+        self.edited_fields.update(fields)
+        self.patchElementEvent.emit(PatchElementEvent(
+            self.target_element.id, fields))
+
+    def _element_editable(self) -> ElementEditable:
+        # The edits of this sidebar may not be written yet
+        return {**self.target_element.to_dict(), **self.edited_fields}
 
     def _edit_name(self):
         if not self.target_element:
             return
-        self.target_element.name = self.name_input.text()
-        element_editable = self.target_element.to_dict()
-        self.editElementEvent.emit(EditElementEvent(
-            self.target_element.id, element_editable))
+        self._patch({"name": self.name_input.text()})
 
     def _edit_background_image(self, event):
         if not self.target_element:
             return
-        element_editable = self.target_element.to_dict()
+        element_editable = self._element_editable()
         if not event:
             # Delete background
             element_editable["background_image"] = None
         else:
+            # The map reads the file when storing the asset
             element_editable["background_image"] = {
                 "name": event.name,
-                "data": list(event.data)
+                "data": event.file
             }
         self.editElementEvent.emit(EditElementEvent(
             self.target_element.id, element_editable))
 
     def _pick_background_from_library(self, event: SelectedAction):
         # Triggered when default is selected
-        element_editable = self.target_element.to_dict()
-        element_editable["background_image"] = {
-            "name": event["text"],
-            "data": self._get_cached_asset(int(event["id"].removeprefix("a-"))).data
-            if event["id"].startswith("a-") else
-            list(Path(event["id"]).read_bytes())
-        }
+        if not self.target_element:
+            return
+        if event["id"].startswith("a-"):
+            asset = self._get_cached_asset(int(event["id"].removeprefix("a-")))
+            if asset is None:
+                return
+            # The asset is already in the map, its bytes are not needed
+            background_image = {"id": asset.id, "name": event["text"]}
+        else:
+            # Built-in images are mapped once, the map stores a single copy by hash
+            builtin_asset = builtin_asset_pack().get(event["id"].removeprefix("b-"))
+            if builtin_asset is None:
+                return
+            background_image = {"name": event["text"],
+                                "data": builtin_asset.data}
+            existing = next((asset for asset in self.available_assets
+                             if asset.hash == builtin_asset.hash), None)
+            if existing is not None:
+                # Reference the copy in the map instead of passing the bytes again
+                background_image["id"] = existing.id
+        element_editable = self._element_editable()
+        element_editable["background_image"] = background_image
         self.editElementEvent.emit(EditElementEvent(
             self.target_element.id, element_editable))
 
@@ -133,25 +156,26 @@ class ElementPropertiesWidget(EditorSidebar):
     def _edit_rotation(self):
         if not self.target_element:
             return
-        element_editable = self.target_element.to_dict()
-        element_editable["rotation"] = self.rotation_dial.value() - 180
-        self.editElementEvent.emit(EditElementEvent(
-            self.target_element.id, element_editable))
+        self._patch({"rotation": self.rotation_dial.value() - 180})
 
     def _build_pick_background_menu(self):
         # Builds the dropdown menu
         # We need to re-run this to rebuild the list
+        asset_pack = builtin_asset_pack()
         self.image_library_picker.setOptions([
             DropdownGroup(name="Defaults", options=(
                 [
-                    {"text": image_name, "id": default_images[image_name]}
-                    for image_name in default_images.keys()]
+                    {"text": builtin_asset.name, "id": f"b-{builtin_asset.name}",
+                     "icon": builtin_asset.thumbnail()}
+                    for builtin_asset in asset_pack.assets]
 
             )),
             DropdownGroup(name="Copy", options=(
                 [
                     {"text": asset.name, "id": f"a-{asset.id}"}
                     for asset in self.available_assets
+                    # Built-in images used in the map are listed as defaults
+                    if asset_pack.find(asset.hash) is None
                 ]
             ))
         ])
@@ -159,14 +183,12 @@ class ElementPropertiesWidget(EditorSidebar):
     def _edit_color(self):
         if not self.target_element:
             return
-        self.target_element.background_color = self.color_input.get_color()
-        element_editable = self.target_element.to_dict()
-        self.editElementEvent.emit(EditElementEvent(
-            self.target_element.id, element_editable))
+        self._patch({"background_color": self.color_input.get_color()})
 
     def __init__(self, parent=None):
         super().__init__(parent=parent)
         self.hide()
+        self.edited_fields = {}
 
         # Element name
         element_name_label = QtWidgets.QLabel("Tile Name:")
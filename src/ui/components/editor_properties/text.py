@@ -1,17 +1,17 @@
 from PySide6 import QtWidgets, QtCore
-from map.types import MapText, TextEditable
+from map.types import MapText
 from ui.components.editor_sidebar import EditorSidebar
 from ui.components.inputs import ColorInputWidget, DragNumberInputWidget, TextAreaInputWidget, TextInputWidget, DialInputWidget
 from ui.components.buttons import StandardButtonWidget
 
 
-class EditTextEvent:
+class PatchTextEvent:
     id: int
-    text_editable: TextEditable
+    fields: dict
 
-    def __init__(self, text_id: int, text_editable: TextEditable):
+    def __init__(self, text_id: int, fields: dict):
         self.id = text_id
-        self.text_editable = text_editable
+        self.fields = fields
 
 
 class RemoveTextEvent:
@@ -22,7 +22,7 @@ class RemoveTextEvent:
 
 
 class TextPropertiesWidget(EditorSidebar):
-    editTextEvent = QtCore.Signal(EditTextEvent)
+    patchTextEvent = QtCore.Signal(PatchTextEvent)
     removeTextEvent = QtCore.Signal(RemoveTextEvent)
     target_text: MapText | None = None
     name_input: TextInputWidget
@@ -65,41 +65,34 @@ class TextPropertiesWidget(EditorSidebar):
         else:
             self.show()
 
+    def _patch(self, fields: dict):
+        # The text object is shared with the map, it is updated once the edit has been written
+        self.patchTextEvent.emit(PatchTextEvent(self.target_text.id, fields))
+
     def _edit_name(self):
         if not self.target_text:
             return
-        self.target_text.name = self.name_input.text()
-        text_editable = self.target_text.to_dict()
-        self.editTextEvent.emit(EditTextEvent(
-            self.target_text.id, text_editable))
+        self._patch({"name": self.name_input.text()})
 
     def _edit_value(self):
         if not self.target_text:
             return
-        self.target_text.value = self.value_input.toPlainText()
-        text_editable = self.target_text.to_dict()
-        self.editTextEvent.emit(EditTextEvent(
-            self.target_text.id, text_editable))
+        self._patch({"value": self.value_input.toPlainText()})
 
     def _edit_font_size(self):
         if not self.target_text:
             return
         try:
-            self.target_text.font_size = int(self.font_size_input.text())
+            font_size = int(self.font_size_input.text())
         except ValueError:
             # Ignore value errors, field is empty or NaN
             return
-        text_editable = self.target_text.to_dict()
-        self.editTextEvent.emit(EditTextEvent(
-            self.target_text.id, text_editable))
+        self._patch({"font_size": font_size})
 
     def _edit_color(self):
         if not self.target_text:
             return
-        self.target_text.color = self.color_input.get_color()
-        text_editable = self.target_text.to_dict()
-        self.editTextEvent.emit(EditTextEvent(
-            self.target_text.id, text_editable))
+        self._patch({"color": self.color_input.get_color()})
 
     def _delete(self):
         self.removeTextEvent.emit(
@@ -109,10 +102,7 @@ class TextPropertiesWidget(EditorSidebar):
     def _edit_rotation(self):
         if not self.target_text:
             return
-        text_editable = self.target_text.to_dict()
-        text_editable["rotation"] = self.rotation_dial.value() - 180
-        self.editTextEvent.emit(EditTextEvent(
-            self.target_text.id, text_editable))
+        self._patch({"rotation": self.rotation_dial.value() - 180})
 
     def __init__(self, parent=None):
         super().__init__(parent=parent)
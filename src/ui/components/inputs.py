@@ -54,14 +54,17 @@ class TextAreaInputWidget(QtWidgets.QTextEdit):
 class SelectFileEvent:
     file: Path
     name: str
-    data: bytes
 
     def __init__(self, file_path):
-        # TODO: Handle read issue here?
         self.file = Path(file_path)
-        self.data = self.file.read_bytes()
         self.name = self.file.name
 
+    @property
+    def data(self) -> bytes:
+        # Read on access, receivers that only need the file do not load it
+        # TODO: Handle read issue here?
+        return self.file.read_bytes()
+
 
 class ImageFileInputWidget(StandardButtonWidget):
     """A styled image file input.
@@ -356,7 +359,11 @@ class ColorInputWidget(InputGroupWidget):
             f"background-color: {self.color.name()}; border: 1px solid #393939;")
 
 
-class ComplexOption(TypedDict):
+class _OptionIcon(TypedDict, total=False):
+    icon: QtGui.QIcon
+
+
+class ComplexOption(_OptionIcon):
     id: str | int | None
     text: str
 
@@ -507,6 +514,8 @@ class StandardDropdownWidget(QtWidgets.QWidget):
                 for j, opt in enumerate(group.options):
                     txt = opt["text"] if isinstance(opt, dict) else opt
                     action_button = QtWidgets.QPushButton(txt)
+                    if isinstance(opt, dict) and opt.get("icon"):
+                        action_button.setIcon(opt["icon"])
                     action_button.setFlat(True)
                     action_button.setCursor(QtCore.Qt.PointingHandCursor)
                     action_button.setStyleSheet(action_button_style)
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from PySide6 import QtWidgets, QtGui, QtCore
 
 
@@ -24,3 +25,49 @@ class GraphicsLabel(QtWidgets.QGraphicsTextItem):
         painter.setPen(QtCore.Qt.NoPen)
         painter.drawRect(self.boundingRect())
         super().paint(painter, option, widget)
+
+
+LABEL_PADDING = 4  # Space between the text and edges of a static label
+
+
+@lru_cache(maxsize=4096)
+def static_label_text(text: str) -> QtGui.QStaticText:
+    """Get the prepared static text of a label. Shared by all the labels with the same text.
+
+    Args:
+        text (str): The text of the label.
+
+    Returns:
+        QtGui.QStaticText: The static text, laid out with the default font.
+    """
+    static_text = QtGui.QStaticText(text)
+    static_text.setTextFormat(QtCore.Qt.TextFormat.PlainText)
+    static_text.prepare(QtGui.QTransform(), QtGui.QFont())
+    return static_text
+
+
+def paint_static_label(painter: QtGui.QPainter, text: str, position: QtCore.QPointF,
+                       from_bottom_right: bool = False):
+    """Paint a white label on a black background without creating graphics items.
+
+    Args:
+        painter (QtGui.QPainter): The painter to paint with.
+        text (str): The text of the label.
+        position (QtCore.QPointF): The top left corner of the label.
+        from_bottom_right (bool, optional): The position is the bottom right corner instead. Defaults to False.
+    """
+    static_text = static_label_text(text)
+    text_size = static_text.size()
+    label_rect = QtCore.QRectF(position.x(), position.y(),
+                               text_size.width() + 2 * LABEL_PADDING,
+                               text_size.height() + 2 * LABEL_PADDING)
+    if from_bottom_right:
+        label_rect.moveBottomRight(position)
+
+    painter.setPen(QtCore.Qt.NoPen)
+    painter.setBrush(QtGui.QBrush(QtGui.QColor("#000")))
+    painter.drawRect(label_rect)
+    painter.setPen(QtGui.QColor("white"))
+    painter.setFont(QtGui.QFont())
+    painter.drawStaticText(label_rect.topLeft() + QtCore.QPointF(LABEL_PADDING, LABEL_PADDING),
+                           static_text)
@@ -0,0 +1,94 @@
+from typing import Any, Dict, Literal, Tuple
+from PySide6 import QtCore
+from map.entity import Map
+from map.types import ElementNotFoundException, TextNotFoundException
+from ui.map_bridge import MapBridge
+
+
+DEFAULT_COALESCE_DELAY = 400  # Milliseconds of quiet before pending edits are written
+
+EditTarget = Tuple[Literal["element", "text"], int]
+
+
+class EditCoalescer(QtCore.QObject):  # MARK: EditCoalescer
+    """Merges bursts of field edits to the same objects into single map writes.
+    The edits are written once no new edits have arrived for a while, or when flushed.
+
+    Attributes:
+        map_bridge (MapBridge): Writes the edits to the map.
+        _pending (Dict[EditTarget, Dict[str, Any]]): The fields not yet written, by object.
+        _timer (QtCore.QTimer): Writes the pending edits after the delay.
+    """
+    map_bridge: MapBridge
+    _pending: Dict[EditTarget, Dict[str, Any]]
+    _timer: QtCore.QTimer
+
+    def __init__(self, map_bridge: MapBridge, delay: int = DEFAULT_COALESCE_DELAY,
+                 parent: QtCore.QObject | None = None):
+        """Constructor of the edit coalescer.
+
+        Args:
+            map_bridge (MapBridge): Writes the edits to the map.
+            delay (int, optional): Milliseconds of quiet before pending edits are written. Defaults to 400.
+            parent (QtCore.QObject | None, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.map_bridge = map_bridge
+        self._pending = {}
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self.flush)
+
+    def patch_element(self, element_id: int, **fields: Any):
+        """Queue a patch of an element, merged with its earlier pending fields.
+
+        Args:
+            element_id (int): The id of the element.
+            **fields (Any): New values by field name, see ELEMENT_PATCH_FIELDS.
+        """
+        self._queue(("element", element_id), fields)
+
+    def patch_text(self, text_id: int, **fields: Any):
+        """Queue a patch of a text object, merged with its earlier pending fields.
+
+        Args:
+            text_id (int): The id of the text object.
+            **fields (Any): New values by field name, see TEXT_PATCH_FIELDS.
+        """
+        self._queue(("text", text_id), fields)
+
+    def has_pending(self) -> bool:
+        """Check if there are edits not yet written to the map.
+
+        Returns:
+            bool: True when edits are pending.
+        """
+        return bool(self._pending)
+
+    def flush(self):
+        """Queue all the pending edits to be written to the map in one transaction, before any later write.
+        Edits of objects removed in the meantime are dropped.
+        """
+        self._timer.stop()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        self.map_bridge.write(self._write, pending)
+
+    @staticmethod
+    def _write(map: Map, pending: Dict[EditTarget, Dict[str, Any]]):
+        # Runs on the writer thread, inside the transaction of the write
+        for (object_type, object_id), fields in pending.items():
+            try:
+                if object_type == "element":
+                    map.patch_element(object_id, **fields)
+                else:
+                    map.patch_text(object_id, **fields)
+            except (ElementNotFoundException, TextNotFoundException):
+                pass
+
+    def _queue(self, target: EditTarget, fields: Dict[str, Any]):
+        # Later values of a field replace earlier ones, restarting the delay
+        self._pending.setdefault(target, {}).update(fields)
+        self._timer.start()
@@ -0,0 +1,100 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Hashable
+from PySide6 import QtCore, QtGui
+
+
+def decode_scaled_image(data: bytes, size: QtCore.QSize) -> QtGui.QImage:
+    """Decode an image and scale it to cover a size. Safe to call outside the GUI thread.
+
+    Args:
+        data (bytes): The raw bytes of the image.
+        size (QtCore.QSize): The size the image is scaled to cover.
+
+    Returns:
+        QtGui.QImage: The scaled image, or a null image if the bytes could not be decoded.
+    """
+    image = QtGui.QImage.fromData(data)
+    if image.isNull():
+        return image
+    return image.scaled(size,
+                        QtCore.Qt.KeepAspectRatioByExpanding,
+                        QtCore.Qt.SmoothTransformation)
+
+
+class ImageDecoder(QtCore.QObject):  # MARK: ImageDecoder
+    """Decodes and scales images on a pool of worker threads.
+
+    Attributes:
+        imageDecoded (QSignal): Emitted in the GUI thread with the request key and the decoded image.
+            The image is null when decoding failed.
+        _executor (ThreadPoolExecutor): The worker threads.
+        _futures (Dict[Hashable, Future]): The requests that have not finished, by key.
+        _shutdown (bool): If the worker threads were stopped, requests are then ignored.
+    """
+    imageDecoded = QtCore.Signal(object, QtGui.QImage)
+    _executor: ThreadPoolExecutor
+    _futures: Dict[Hashable, Future]
+    _shutdown: bool = False
+
+    def __init__(self, max_workers: int | None = None, parent: QtCore.QObject | None = None):
+        """Constructor of the image decoder.
+
+        Args:
+            max_workers (int | None, optional): Number of worker threads. Defaults to the executor default.
+            parent (QtCore.QObject | None, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="image-decoder")
+        self._futures = {}
+        # Connected first, so the request is finished before other receivers run
+        self.imageDecoded.connect(self._finish)
+
+    def pending(self, key: Hashable) -> bool:
+        """Check if a request has not finished yet.
+
+        Args:
+            key (Hashable): The key of the request.
+
+        Returns:
+            bool: True when the request is queued or being decoded.
+        """
+        return key in self._futures
+
+    def request(self, key: Hashable, data: bytes, size: QtCore.QSize):
+        """Queue an image to be decoded. Does nothing if a request with the key has not finished,
+        or once the decoder is shut down.
+
+        Args:
+            key (Hashable): The key of the request, passed back with the decoded image.
+            data (bytes): The raw bytes of the image.
+            size (QtCore.QSize): The size the image is scaled to cover.
+        """
+        if self._shutdown or key in self._futures:
+            return
+        self._futures[key] = self._executor.submit(self._decode, key, data, size)
+
+    def cancel(self, key: Hashable):
+        """Cancel a request that has not started decoding yet.
+
+        Args:
+            key (Hashable): The key of the request.
+        """
+        future = self._futures.get(key)
+        if future is not None and future.cancel():
+            del self._futures[key]
+
+    def shutdown(self):
+        """Cancel all queued requests and stop the worker threads once they are idle.
+        Later requests are ignored.
+        """
+        self._shutdown = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._futures.clear()
+
+    def _decode(self, key: Hashable, data: bytes, size: QtCore.QSize):
+        # Runs in a worker thread, the signal is delivered to the GUI thread
+        self.imageDecoded.emit(key, decode_scaled_image(data, size))
+
+    def _finish(self, key: Hashable, image: QtGui.QImage):
+        self._futures.pop(key, None)
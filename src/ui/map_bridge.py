@@ -0,0 +1,90 @@
+from concurrent.futures import Future
+from queue import Empty, SimpleQueue
+from typing import Any, Callable, List
+from PySide6 import QtCore
+from map.entity import Map
+from map.types import MapChange
+from map.writer import MapWriter
+
+
+class MapBridge(QtCore.QObject):  # MARK: MapBridge
+    """Writes to a map on a MapWriter thread and delivers the results to the GUI thread as signals.
+    The map is only read and updated in the GUI thread, so reading it never waits for a write to finish.
+
+    Attributes:
+        mapChanged (QSignal): Emitted in the GUI thread with the list of changes of a committed write,
+            once the loaded objects of the map have been updated.
+        writeFailed (QSignal): Emitted in the GUI thread with the exception of a failed write.
+        _changesCommitted (QSignal): Emitted in the writer thread when committed changes are queued.
+        map (Map): The map written to.
+        writer (MapWriter): The writer thread of the map.
+        _committed (SimpleQueue): The committed changes not yet applied to the map.
+    """
+    mapChanged = QtCore.Signal(object)
+    writeFailed = QtCore.Signal(object)
+    _changesCommitted = QtCore.Signal()
+    map: Map
+    writer: MapWriter
+    _committed: SimpleQueue
+
+    def __init__(self, map: Map, parent: QtCore.QObject | None = None):
+        """Constructor of the map bridge. Starts the writer thread and listens to it.
+
+        Args:
+            map (Map): The map to write to.
+            parent (QtCore.QObject | None, optional): The parent object. Defaults to None.
+        """
+        super().__init__(parent)
+        self.map = map
+        self.writer = MapWriter(map)
+        self._committed = SimpleQueue()
+        # Emitted in the writer thread, so the slot is queued to the GUI thread
+        self._changesCommitted.connect(self._apply)
+        self.writer.subscribe(self._deliver)
+
+    def write(self, operation: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queue a modification of the map without waiting for it, see MapWriter.submit.
+
+        Args:
+            operation (Callable[..., Any]): Called with the map and the arguments on the writer thread.
+            *args (Any): Positional arguments of the operation.
+            **kwargs (Any): Keyword arguments of the operation.
+
+        Returns:
+            Future: Resolves to the result of the operation, or its exception.
+        """
+        future = self.writer.submit(operation, *args, **kwargs)
+        future.add_done_callback(self._report)
+        return future
+
+    def flush(self):
+        """Wait until every queued modification has been written, and apply the changes to the map.
+        """
+        self.writer.flush()
+        self._apply()
+
+    def close(self):
+        """Write the queued modifications, stop the writer thread and apply the last changes to the map.
+        """
+        self.writer.close()
+        self.writer.unsubscribe(self._deliver)
+        self._apply()
+
+    def _deliver(self, changes: List[MapChange]):
+        # Called on the writer thread, the changes are applied in the GUI thread
+        self._committed.put(changes)
+        self._changesCommitted.emit()
+
+    def _apply(self):
+        # Applies every change committed so far, in order. Also called directly when flushing.
+        while True:
+            try:
+                changes = self._committed.get_nowait()
+            except Empty:
+                return
+            self.map.apply_changes(changes)
+            self.mapChanged.emit(changes)
+
+    def _report(self, future: Future):
+        if not future.cancelled() and future.exception() is not None:
+            self.writeFailed.emit(future.exception())
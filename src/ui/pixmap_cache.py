@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from typing import Hashable
+from PySide6 import QtGui
+
+
+DEFAULT_PIXMAP_CACHE_SIZE = 128 * 1024 * 1024  # 128 MiB
+
+
+class PixmapCache:  # MARK: PixmapCache
+    """Size-bounded least recently used cache of decoded and scaled pixmaps.
+
+    Attributes:
+        max_bytes (int): The maximum total size of the cached pixmaps.
+        size (int): The current total size of the cached pixmaps.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups not found in the cache.
+        _entries (OrderedDict[Hashable, QtGui.QPixmap]): The cached pixmaps, least recently used first.
+    """
+    max_bytes: int
+    size: int
+    hits: int
+    misses: int
+    _entries: OrderedDict
+
+    def __init__(self, max_bytes: int = DEFAULT_PIXMAP_CACHE_SIZE):
+        """Constructor of the pixmap cache.
+
+        Args:
+            max_bytes (int, optional): The maximum total size of the cached pixmaps. Defaults to 128 MiB.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _pixmap_size(pixmap: QtGui.QPixmap) -> int:
+        # Decoded pixmaps take width * height * depth bits of memory
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def get(self, image_key: Hashable, size: int) -> QtGui.QPixmap | None:
+        """Get a decoded image scaled to a size from the cache.
+
+        Args:
+            image_key (Hashable): Identifies the image bytes, such as the content hash of an asset.
+            size (int): The width and height the image was scaled to cover.
+
+        Returns:
+            QtGui.QPixmap | None: The scaled pixmap, shared so it must not be modified, or None when not cached.
+        """
+        key = (image_key, size)
+        pixmap = self._entries.get(key)
+        if pixmap is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return pixmap
+
+    def put_image(self, image_key: Hashable, size: int, image: QtGui.QImage) -> QtGui.QPixmap:
+        """Add a decoded image to the cache, evicting the least recently used pixmaps when full.
+        Must be called in the GUI thread. Pixmaps larger than the whole cache are not cached.
+
+        Args:
+            image_key (Hashable): Identifies the image bytes, such as the content hash of an asset.
+            size (int): The width and height the image was scaled to cover.
+            image (QtGui.QImage): The decoded and scaled image.
+
+        Returns:
+            QtGui.QPixmap: The pixmap of the image.
+        """
+        key = (image_key, size)
+        pixmap = QtGui.QPixmap.fromImage(image)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= self._pixmap_size(previous)
+        pixmap_size = self._pixmap_size(pixmap)
+        if pixmap_size > self.max_bytes:
+            return pixmap
+        self._entries[key] = pixmap
+        self.size += pixmap_size
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= self._pixmap_size(evicted)
+        return pixmap
+
+    def clear(self):
+        """Remove all the pixmaps from the cache.
+        """
+        self._entries.clear()
+        self.size = 0
@@ -1,28 +1,40 @@
 from operator import concat
 from PySide6 import QtWidgets, QtCore, QtGui
 from os.path import abspath
+from typing import List
 from map.entity import Map, Element, MapText
+from map.types import ElementEditable, MapChange
 from ui.components.buttons import AddElementButtonWidget, AddTextButtonWidget, StandardButtonWidget
 from ui.components.editor import EditorGraphicsView
 from ui.components.editor_properties.element import ElementPropertiesWidget
 from ui.components.editor_properties.text import TextPropertiesWidget
 from ui.components.inputs import StandardDropdownWidget
+from ui.edit_coalescer import EditCoalescer
+from ui.map_bridge import MapBridge
 from ui.view import View
 
 
 class EditorView(View):
     """The editor view, in which the user can edit and view a specific map.
+
+    Attributes:
+        _map_bridge (MapBridge | None): Writes to the map on a writer thread and signals the changes.
+        _editor_area (EditorGraphicsView | None): The editor of the open map.
+        _edit_coalescer (EditCoalescer | None): Merges the sidebar edits into fewer map writes.
     """
+    _map_bridge = None
+    _editor_area = None
+    _edit_coalescer = None
 
-    def _create_element(self, map: Map, x: int, y: int):
+    def _create_element(self, map_bridge: MapBridge, x: int, y: int):
         """Private method called when a new element is to be created in a specific location.
 
         Args:
-            map (Map): The map to create the element in.
+            map_bridge (MapBridge): Writes to the map to create the element in.
             x (int): The X coordinate of the element to be created (1/256)
             y (int): The Y coordinate of the element to be created (1/256)
         """
-        map.create_element({
+        map_bridge.write(Map.create_element, {
             "name": "Unnamed Tile",
             "x": x,
             "y": y,
@@ -33,72 +45,100 @@ class EditorView(View):
             "background_color": None
         })
 
-    def _create_text(self, map: Map, x: int, y: int):
+    def _create_text(self, map_bridge: MapBridge, x: int, y: int):
         """Private method called when a new text object is to be created on a specific map.
 
         Args:
-            map (Map): The map to create the text object in.
+            map_bridge (MapBridge): Writes to the map to create the text object in.
             x (int): The X coordinate of the text to be created (true)
             y (int): The Y coordinate of the text to be created (true)
         """
-        map.create_text("Unnamed Text", "Text", x, y)
+        map_bridge.write(Map.create_text, "Unnamed Text", "Text", x, y)
 
-    def _move_element(self, map: Map, id: int, x: int, y: int):
+    def _move_element(self, map_bridge: MapBridge, edit_coalescer: EditCoalescer, id: int, x: int, y: int):
         """Private method called when a specific element is to be moved to a new location in a specific map.
 
         Args:
-            map (Map): The map in which to move a specific element.
+            map_bridge (MapBridge): Writes to the map in which to move a specific element.
+            edit_coalescer (EditCoalescer): Holds the sidebar edits, written before the move.
             id (int): The id of the element to move.
             x (int): The new X coordinate of the element (1/256)
             y (int): The new Y coordinate of the element (1/256)
         """
-        edited_element = map.get_element(id).to_dict()
-        edited_element["x"] = x
-        edited_element["y"] = y
-        map.edit_element(id, edited_element)
+        edit_coalescer.flush()
+        map_bridge.write(Map.patch_element, id, x=x, y=y)
 
-    def _move_text(self, map: Map, id: int, x: int, y: int):
+    def _move_text(self, map_bridge: MapBridge, edit_coalescer: EditCoalescer, id: int, x: int, y: int):
         """Private method called when a specific text object is to be moved to a new location in a specific map.
 
         Args:
-            map (Map): The map in which to move the text object.
+            map_bridge (MapBridge): Writes to the map in which to move the text object.
+            edit_coalescer (EditCoalescer): Holds the sidebar edits, written before the move.
             id (int): The id of the text object to move.
             x (int): The new X coordinate of the text object (true)
             y (int): The new Y coordinate of the text object (true)
         """
-        edited_text = map.get_text(id).to_dict()
-        edited_text["x"] = x
-        edited_text["y"] = y
-        map.edit_text(id, edited_text)
+        edit_coalescer.flush()
+        map_bridge.write(Map.patch_text, id, x=x, y=y)
+
+    def _edit_element(self, map_bridge: MapBridge, edit_coalescer: EditCoalescer, id: int,
+                      element_editable: ElementEditable):
+        """Private method called when every field of a specific element is to be written.
+
+        Args:
+            map_bridge (MapBridge): Writes to the map of the element.
+            edit_coalescer (EditCoalescer): Holds the sidebar edits, written before this edit.
+            id (int): The id of the element to edit.
+            element_editable (ElementEditable): The new values of the element.
+        """
+        edit_coalescer.flush()
+        map_bridge.write(Map.edit_element, id, element_editable)
+
+    def _remove_element(self, map_bridge: MapBridge, edit_coalescer: EditCoalescer, id: int):
+        """Private method called when a specific element is to be removed from the map.
+
+        Args:
+            map_bridge (MapBridge): Writes to the map to remove the element from.
+            edit_coalescer (EditCoalescer): Holds the sidebar edits, written before the removal.
+            id (int): The id of the element to remove.
+        """
+        edit_coalescer.flush()
+        map_bridge.write(Map.remove_element, id)
+
+    def _remove_text(self, map_bridge: MapBridge, edit_coalescer: EditCoalescer, id: int):
+        """Private method called when a specific text object is to be removed from the map.
+
+        Args:
+            map_bridge (MapBridge): Writes to the map to remove the text object from.
+            edit_coalescer (EditCoalescer): Holds the sidebar edits, written before the removal.
+            id (int): The id of the text object to remove.
+        """
+        edit_coalescer.flush()
+        map_bridge.write(Map.remove_text, id)
 
-    def _insert_element(self, map: Map, element: Element):
+    def _insert_element(self, map_bridge: MapBridge, element: Element):
         """Private method called when a specific element should be inserted to the map.
 
         Args:
-            map (Map): The map to which insert the element.
+            map_bridge (MapBridge): Writes to the map to which insert the element.
             element (Element): The element to insert.
         """
 
         element_to_insert = element.to_dict()
         del element_to_insert["id"]
-        map.create_element(element_to_insert)
+        map_bridge.write(Map.create_element, element_to_insert)
 
-    def _insert_text(self, map: Map, text: MapText):
+    def _insert_text(self, map_bridge: MapBridge, text: MapText):
         """Private method called when a specific text should be inserted to the map.
 
         Args:
-            map (Map): The map to which insert the text.
+            map_bridge (MapBridge): Writes to the map to which insert the text.
             text (MapText): The text to insert.
         """
 
         text_to_insert = text.to_dict()
-        # FIXME: Refactor of object handling will unify this with insert_element,
-        #        but for now we must create a dummy text object and then edit it
-        #        to add all attributes to it.
-        created_text = map.create_text(
-            "", "", text_to_insert["x"], text_to_insert["y"])
-        text_to_insert["id"] = created_text.id
-        map.edit_text(created_text.id, text_to_insert)
+        del text_to_insert["id"]
+        map_bridge.write(Map.create_texts, [text_to_insert])
 
     def open(self):
         # Change to vertical layout
@@ -191,14 +231,26 @@ class EditorView(View):
 
         # Actual editor area
         editor_area = EditorGraphicsView()
+        self._editor_area = editor_area
         view_mode_dropdown.currentIndexChanged.connect(
             lambda index: editor_area.set_preview(index == 1))
         main_layout.addWidget(editor_area)
 
+        # Writes run on a writer thread with its own connection, so the editor never waits for the disk.
+        # The changes are applied to the map and come back to the GUI thread as signals, with the failures.
+        map_bridge = MapBridge(map, parent=editor_area)
+        self._map_bridge = map_bridge
+
+        # Typing and dragging in the sidebars is written once the burst ends.
+        # Pending edits are queued before focus moves and before other writes.
+        edit_coalescer = EditCoalescer(map_bridge, parent=editor_area)
+        self._edit_coalescer = edit_coalescer
+        editor_area.focusObjectEvent.connect(lambda: edit_coalescer.flush())
+
         # Element Properties side bar
         element_properties_sidebar = ElementPropertiesWidget()
         editor_area.focusObjectEvent.connect(
-            lambda: element_properties_sidebar.setAssets(map.get_assets())
+            lambda: element_properties_sidebar.setAssets(map.list_assets())
         )
         editor_area.focusObjectEvent.connect(
             lambda event: (
@@ -209,10 +261,14 @@ class EditorView(View):
             )
         )
         element_properties_sidebar.editElementEvent.connect(
-            lambda event: map.edit_element(event.id, event.element_editable)
+            lambda event: self._edit_element(
+                map_bridge, edit_coalescer, event.id, event.element_editable)
+        )
+        element_properties_sidebar.patchElementEvent.connect(
+            lambda event: edit_coalescer.patch_element(event.id, **event.fields)
         )
         element_properties_sidebar.removeElementEvent.connect(
-            lambda event: map.remove_element(event.id)
+            lambda event: self._remove_element(map_bridge, edit_coalescer, event.id)
         )
         main_layout.addWidget(element_properties_sidebar)
 
@@ -225,47 +281,81 @@ class EditorView(View):
                 text_properties_sidebar.setText(None)
             )
         )
-        text_properties_sidebar.editTextEvent.connect(
-            lambda event: map.edit_text(event.id, event.text_editable)
+        text_properties_sidebar.patchTextEvent.connect(
+            lambda event: edit_coalescer.patch_text(event.id, **event.fields)
         )
         text_properties_sidebar.removeTextEvent.connect(
-            lambda event: map.remove_text(event.id)
+            lambda event: self._remove_text(map_bridge, edit_coalescer, event.id)
         )
         main_layout.addWidget(text_properties_sidebar)
 
         # MARK: Editor events
         # Handle editor events
         editor_area.addElementEvent.connect(
-            lambda event: self._create_element(map, event.x, event.y))
+            lambda event: self._create_element(map_bridge, event.x, event.y))
         editor_area.moveElementEvent.connect(
-            lambda event: self._move_element(map, event.id, event.x, event.y))
+            lambda event: self._move_element(
+                map_bridge, edit_coalescer, event.id, event.x, event.y))
         editor_area.addTextEvent.connect(
-            lambda event: self._create_text(map, event.x, event.y))
+            lambda event: self._create_text(map_bridge, event.x, event.y))
         editor_area.moveTextEvent.connect(
-            lambda event: self._move_text(map, event.id, event.x, event.y))
+            lambda event: self._move_text(
+                map_bridge, edit_coalescer, event.id, event.x, event.y))
         editor_area.pasteElementEvent.connect(
-            lambda element: self._insert_element(map, element))
+            lambda element: self._insert_element(map_bridge, element))
         editor_area.pasteTextEvent.connect(
-            lambda text: self._insert_text(map, text))
+            lambda text: self._insert_text(map_bridge, text))
         editor_area.removeElementEvent.connect(
-            lambda element_id: map.remove_element(
-                element_id) and element_properties_sidebar.setElement(None)
-        )
+            lambda element_id: self._remove_element(map_bridge, edit_coalescer, element_id))
+        editor_area.removeElementEvent.connect(
+            lambda: element_properties_sidebar.setElement(None))
         editor_area.removeTextEvent.connect(
-            lambda text_id: map.remove_text(
-                text_id) and text_properties_sidebar.setText(None)
-        )
+            lambda text_id: self._remove_text(map_bridge, edit_coalescer, text_id))
+        editor_area.removeTextEvent.connect(
+            lambda: text_properties_sidebar.setText(None))
+
+        def load_objects():
+            editor_area.setMapBounds(map.bounds())
+            return concat(map.get_elements(), map.get_text_list())
+
+        # When elements change, this is ran. Bursts of changes are rendered once.
+        def render_lambda(changes: List[MapChange]):
+            editor_area.requestRender(load_objects)
 
-        # When elements change, this is ran
-        def render_lambda():
-            editor_area.render(concat(map.get_elements(),
-                                      map.get_text_list()))
+        map_bridge.mapChanged.connect(render_lambda)
 
-        map.register_on_change(render_lambda)
+        # A failed write changed nothing in the map. Show the saved state again and tell the user.
+        def write_failed(error: Exception):
+            print("ERROR: Map write failed:", repr(error))
+            if element_properties_sidebar.target_element is not None:
+                element_properties_sidebar.setElement(
+                    map.get_element(element_properties_sidebar.target_element.id))
+            if text_properties_sidebar.target_text is not None:
+                text_properties_sidebar.setText(
+                    map.get_text(text_properties_sidebar.target_text.id))
+            editor_area.requestRender(load_objects)
+            QtWidgets.QMessageBox.warning(
+                editor_area, "Saving failed", f"The change could not be saved:\n{error}")
+
+        map_bridge.writeFailed.connect(write_failed)
 
         # Initial render
-        render_lambda()
+        editor_area.render(load_objects())
 
         self.layout.addWidget(top_bar)
         self.layout.addWidget(toolbar)
         self.layout.addWidget(main)
+
+    def close(self):
+        # Queue the edits still waiting in the coalescer
+        if self._edit_coalescer:
+            self._edit_coalescer.flush()
+        self._edit_coalescer = None
+
+        # Write everything queued and apply it to the map, it outlives the view
+        if self._map_bridge:
+            self._map_bridge.close()
+        self._map_bridge = None
+        if self._editor_area:
+            self._editor_area.shutdownDecoder()
+        self._editor_area = None